@@ -1,6 +1,7 @@
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
 from import_export import resources
+from core.admin import StreamingExportMixin
 from .models import UserProfile
 
 class UserProfileResource(resources.ModelResource):
@@ -9,5 +10,6 @@ class UserProfileResource(resources.ModelResource):
         exclude = ('get_display_name',)
 
 @admin.register(UserProfile)
-class UserProfileAdmin(ImportExportModelAdmin):
+class UserProfileAdmin(StreamingExportMixin, ImportExportModelAdmin):
     resource_class = UserProfileResource
+    export_dataset = 'profiles'
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from auth_app.models import UserProfile
+
+DEFAULT_TOKEN_AUTH_CACHE = {
+    'LOCAL_MAX_SIZE': 10000,
+    'LOCAL_TTL': 30,
+    'SHARED_CACHE': 'default',
+    'SHARED_TTL': 300,
+}
+SHARED_KEY_PREFIX = 'auth:token:'
+
+
+def get_cache_settings():
+    """Returns the `TOKEN_AUTH_CACHE` setting merged over the defaults."""
+    return {**DEFAULT_TOKEN_AUTH_CACHE, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+
+
+class LRUCache:
+    """
+    Thread-safe, bounded least-recently-used cache whose entries expire after `ttl` seconds.
+
+    Values are stored as given; callers that need isolated objects per request store plain data.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache_settings = get_cache_settings()
+token_cache = LRUCache(_cache_settings['LOCAL_MAX_SIZE'], _cache_settings['LOCAL_TTL'])
+
+
+def get_shared_cache():
+    """Returns the configured shared cache tier, or None if it is disabled."""
+    alias = get_cache_settings()['SHARED_CACHE']
+    return caches[alias] if alias else None
+
+
+def evict_token(key):
+    """Removes a token from the in-process LRU and the shared cache tier."""
+    token_cache.delete(key)
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(SHARED_KEY_PREFIX + key)
+
+
+def evict_user_tokens(user_id):
+    """Removes all cached tokens of a user, e.g. after the user or their profile changed."""
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        evict_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's `TokenAuthentication` that caches token lookups.
+
+    A token is loaded once together with its user and the user's profile (one joined query)
+    and then kept in a bounded in-process LRU with TTL, backed by an optional shared Django
+    cache. Authenticated requests therefore need no token query and permission checks on
+    `request.user.userprofile` need no profile query.
+
+    Only what authentication needs is cached: the key, the user id, `is_active` and the profile
+    type, never the password hash or other personal data. Each request gets fresh model
+    instances built from these values; their other fields are loaded on first access.
+
+    Entries are evicted when tokens are deleted or users/profiles change (see `auth_app.signals`).
+    Other processes only see an eviction through the shared tier once their local entry expires,
+    so `LOCAL_TTL` bounds how long a revoked token can still be accepted there.
+
+    Settings (`TOKEN_AUTH_CACHE`):
+        LOCAL_MAX_SIZE (int): Maximum number of tokens in the in-process LRU.
+        LOCAL_TTL (int): Seconds a token stays in the in-process LRU.
+        SHARED_CACHE (str | None): Alias of the shared cache tier, None disables it.
+        SHARED_TTL (int): Seconds a token stays in the shared cache tier.
+    """
+
+    def authenticate_credentials(self, key):
+        token = self.get_cached_token(key)
+        if token is None:
+            try:
+                token = Token.objects.select_related('user__userprofile').get(key=key)
+            except Token.DoesNotExist:
+                raise AuthenticationFailed(_('Invalid token.'))
+            self.cache_token(token)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
+
+    def get_cached_token(self, key):
+        """Returns a token with its user and profile rebuilt from the cached values, or None."""
+        data = token_cache.get(key)
+        if data is None:
+            shared_cache = get_shared_cache()
+            data = shared_cache.get(SHARED_KEY_PREFIX + key) if shared_cache is not None else None
+            if data is None:
+                return None
+            token_cache.set(key, data)
+        return build_token(*data)
+
+    def cache_token(self, token):
+        """Stores the values authentication needs in both cache tiers."""
+        profile = getattr(token.user, 'userprofile', None)
+        data = (token.key, token.user_id, token.user.is_active, profile.type if profile else None)
+        token_cache.set(token.key, data)
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            shared_cache.set(SHARED_KEY_PREFIX + token.key, data, get_cache_settings()['SHARED_TTL'])
+
+
+def build_token(key, user_id, is_active, profile_type):
+    """
+    Builds a token, its user and the user's profile as loaded with only the given fields.
+
+    The instances behave like ones read with `only()`: other fields are queried on first access.
+    A user without profile raises `RelatedObjectDoesNotExist` on `user.userprofile` as usual.
+    """
+    db = router.db_for_read(User)
+    user = User.from_db(db, ['id', 'is_active'], [user_id, is_active])
+    profile = UserProfile.from_db(db, ['user_id', 'type'], [user_id, profile_type]) if profile_type else None
+    UserProfile.user.field.remote_field.set_cached_value(user, profile)
+    if profile is not None:
+        UserProfile.user.field.set_cached_value(profile, user)
+    token = Token.from_db(router.db_for_read(Token), ['key', 'user_id'], [key, user_id])
+    Token.user.field.set_cached_value(token, user)
+    return token
@@ -0,0 +1,47 @@
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Lower
+from rest_framework import filters
+from core.functions import BinaryCollate
+
+# Sorts after every character, so `key < prefix + PREFIX_END` bounds all keys starting with the prefix.
+PREFIX_END = '\U0010ffff'
+
+
+def prefix_filter(key, term):
+    """
+    Builds a case-insensitive "starts with" condition on a lowercased key as a range.
+
+    Unlike `LIKE`/`istartswith`, a range can be answered by the lowercase expression indexes
+    of `UserProfile`. The term is lowercased by the database as well, so both sides are folded
+    the same way. The key must be compared with `BinaryCollate` like in those indexes: under a
+    locale collation the range would not be exactly the keys starting with the term.
+
+    SQLite's `lower()` only folds ASCII letters, so there the match ignores the case of A-Z only:
+    `öster` does not find `Österreich`. PostgreSQL folds all letters.
+    """
+    lowered = Lower(Value(term))
+    return Q(**{f'{key}__gte': lowered, f'{key}__lt': Concat(lowered, Value(PREFIX_END))})
+
+
+class ProfileSearchFilter(filters.BaseFilterBackend):
+    """
+    Prefix search for the profile directories.
+
+    `search` matches the start of the first or the last name, `location` the start of the
+    location, both case-insensitive and served by the expression indexes of `UserProfile`.
+    """
+    search_param = 'search'
+    location_param = 'location'
+
+    def filter_queryset(self, request, queryset, view):
+        name = request.query_params.get(self.search_param, '').strip()
+        location = request.query_params.get(self.location_param, '').strip()
+        if name:
+            queryset = queryset.alias(
+                first_name_key=BinaryCollate(Lower('first_name')), last_name_key=BinaryCollate(Lower('last_name')),
+            ).filter(
+                prefix_filter('first_name_key', name) | prefix_filter('last_name_key', name)
+            )
+        if location:
+            queryset = queryset.alias(location_key=BinaryCollate(Lower('location'))).filter(prefix_filter('location_key', location))
+        return queryset
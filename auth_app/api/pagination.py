@@ -0,0 +1,14 @@
+from core.pagination import KeysetPagination
+
+class ProfilePagination(KeysetPagination):
+    """
+    Keyset pagination for the business and customer directories, newest profiles first.
+
+    Pages are ordered by `created_at` with the user id as tiebreaker (the profile's primary key),
+    which the `profile_directory_idx` index serves per profile type without a count query.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering_fields = ['created_at']
+    default_ordering = '-created_at'
+    tiebreaker = 'user_id'
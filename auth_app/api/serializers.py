@@ -3,6 +3,7 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 from auth_app.models import UserProfile
+from core.serializers import ImageVariantsField
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
@@ -82,10 +83,11 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')
     email = serializers.EmailField(source='user.email')
+    file_variants = ImageVariantsField(source='file')
 
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type', 'email', 'created_at']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel', 'description', 'working_hours', 'type', 'email', 'created_at']
 
     def update(self, instance, validated_data):
         user_data = validated_data.pop("user", {})
@@ -106,17 +108,19 @@ class ProfileTypeBusinessSerializer(serializers.ModelSerializer):
     Serializer for business user profiles.
     """
     username = serializers.CharField(source='user.username', read_only=True)
+    file_variants = ImageVariantsField(source='file')
 
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel', 'description', 'working_hours', 'type']
 
 class ProfileTypeCustomerSerializer(serializers.ModelSerializer):
     """
     Serializer for customer user profiles.
     """
     username = serializers.CharField(source='user.username', read_only=True)
+    file_variants = ImageVariantsField(source='file')
 
     class Meta:
         model = UserProfile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'uploaded_at', 'type']
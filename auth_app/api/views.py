@@ -5,7 +5,11 @@ from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
 from .permissions import IsOwner
+from auth_app.cache import directory_version
 from auth_app.models import UserProfile
+from core.cache import CachedResponseMixin
+from .filters import ProfileSearchFilter
+from .pagination import ProfilePagination
 from .serializers import UserRegistrationSerializer, LoginSerializer, ProfileDetailSerializer, ProfileTypeBusinessSerializer, ProfileTypeCustomerSerializer
 
 class UserProfileCreateView(generics.CreateAPIView):
@@ -72,7 +76,7 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
     View to retrieve or update a user's profile details.
     Supports GET for retrieval and PATCH for updates (only for profile owner).
     """
-    queryset = UserProfile.objects.filter()
+    queryset = UserProfile.objects.select_related('user')
     serializer_class = ProfileDetailSerializer
 
     def get_permissions(self):
@@ -88,33 +92,44 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
         return super().get_permissions()
 
 
-class ProfileBusinessList(generics.ListAPIView):
+class ProfileDirectoryView(CachedResponseMixin, generics.ListAPIView):
     """
-    View to list all user profiles of type 'business'.
-    Only accessible by authenticated users.
+    Base view for the directories of one profile type.
+
+    Pages are keyset-paginated and searchable by name and location prefix (`ProfileSearchFilter`).
+    Responses are cached per URL until a profile or user changes (`invalidate_profile_directories`).
+
+    Attributes:
+        profile_type (str): Profile type listed by the directory.
     """
     permission_classes = [IsAuthenticated]
-    serializer_class = ProfileTypeBusinessSerializer
-    pagination_class = None
+    pagination_class = ProfilePagination
+    filter_backends = [ProfileSearchFilter]
+    profile_type = None
 
     def get_queryset(self):
         """
-        Retrieves the list of 'business' type user profiles.
+        Retrieves the user profiles of the directory's type together with their users.
         """
-        return UserProfile.objects.filter(type__iexact='business')
+        return UserProfile.objects.filter(type=self.profile_type).select_related('user')
+
+    def get_cache_versions(self):
+        return [directory_version(self.profile_type)]
+
+
+class ProfileBusinessList(ProfileDirectoryView):
+    """
+    View to list all user profiles of type 'business'.
+    Only accessible by authenticated users.
+    """
+    serializer_class = ProfileTypeBusinessSerializer
+    profile_type = 'business'
 
 
-class ProfileCustomerList(generics.ListAPIView):
+class ProfileCustomerList(ProfileDirectoryView):
     """
     View to list all user profiles of type 'customer'.
     Only accessible by authenticated users.
     """
-    permission_classes = [IsAuthenticated]
     serializer_class = ProfileTypeCustomerSerializer
-    pagination_class = None
-
-    def get_queryset(self):
-        """
-        Retrieves the list of 'customer' type user profiles.
-        """
-        return UserProfile.objects.filter(type__iexact='customer')
+    profile_type = 'customer'
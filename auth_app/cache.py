@@ -0,0 +1,17 @@
+from auth_app.models import UserProfile
+from core.cache import bump_versions
+
+
+def directory_version(profile_type):
+    """Version key of the cached directory responses of one profile type (see core.cache.CachedResponseMixin)."""
+    return f'profiles:version:{profile_type}'
+
+
+def invalidate_profile_directories():
+    """
+    Invalidates the cached business and customer directories.
+
+    Both are bumped, since a profile may have switched its type. Changes to single profiles
+    are rare compared to directory reads, so the whole directory is rebuilt on demand.
+    """
+    bump_versions([directory_version(profile_type) for profile_type, _ in UserProfile.UserType_CHOICES])
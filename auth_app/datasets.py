@@ -0,0 +1,27 @@
+from django.db import transaction
+from auth_app.api.authentication import evict_user_tokens
+from auth_app.cache import invalidate_profile_directories
+from auth_app.models import UserProfile
+from core.bulk_io import Dataset, register_dataset
+from core.images import schedule_image_processing
+from stats_app.models import BusinessStats
+from stats_app.services import invalidate_base_info, rebuild_business_stats
+
+
+def _after_profiles_import(profiles, previous):
+    user_ids = [profile.user_id for profile in profiles]
+    BusinessStats.objects.filter(pk__in=user_ids).exclude(user__userprofile__type='business').delete()
+    rebuild_business_stats(user_ids)
+    for user_id in user_ids:
+        evict_user_tokens(user_id)
+    schedule_image_processing(profiles, 'file')
+    invalidate_profile_directories()
+    transaction.on_commit(invalidate_base_info)
+
+
+register_dataset('profiles', Dataset(
+    UserProfile,
+    fields=['user_id', 'type', 'first_name', 'last_name', 'location', 'tel', 'description', 'working_hours', 'file', 'created_at', 'uploaded_at'],
+    import_fields=['user_id', 'type', 'first_name', 'last_name', 'location', 'tel', 'description', 'working_hours', 'file'],
+    after_import=_after_profiles_import,
+))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:03
+
+import core.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0010_remove_userprofile_id_alter_userprofile_user'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='file',
+            field=models.ImageField(blank=True, null=True, upload_to='uploads/', validators=[core.images.validate_image_upload]),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:08
+
+import core.functions
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0011_alter_userprofile_file'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['type', 'created_at', 'user'], name='profile_directory_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(models.F('type'), core.functions.BinaryCollate(django.db.models.functions.text.Lower('first_name')), name='profile_first_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(models.F('type'), core.functions.BinaryCollate(django.db.models.functions.text.Lower('last_name')), name='profile_last_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(models.F('type'), core.functions.BinaryCollate(django.db.models.functions.text.Lower('location')), name='profile_location_idx'),
+        ),
+    ]
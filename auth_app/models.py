@@ -1,8 +1,9 @@
 from django.contrib.auth.models import User
 from django.db import models
-
-from django.db import models
-from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.functions import Lower
+from core.functions import BinaryCollate
+from core.images import validate_image_upload
 
 class UserProfile(models.Model):
     """
@@ -13,7 +14,7 @@ class UserProfile(models.Model):
         type: User type, 'customer' or 'business'.
         first_name: Optional first name.
         last_name: Optional last name.
-        file: Optional profile image uploaded to 'uploads/'.
+        file: Optional profile image uploaded to 'uploads/'; replaced by its processed version in 'images/' (see core.images).
         uploaded_at: Timestamp of last file upload.
         location: Required user location (city/region).
         tel: Optional telephone number.
@@ -31,7 +32,7 @@ class UserProfile(models.Model):
     type = models.CharField(max_length=20, choices=UserType_CHOICES)
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
-    file = models.ImageField(upload_to='uploads/', blank=True, null=True)
+    file = models.ImageField(upload_to='uploads/', blank=True, null=True, validators=[validate_image_upload])
     uploaded_at = models.DateTimeField(auto_now=True)
     location = models.CharField(max_length=50)
     tel = models.CharField(max_length=20, blank=True)
@@ -39,6 +40,17 @@ class UserProfile(models.Model):
     working_hours = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # The business and customer directories filter on the exact profile type and page by
+        # (created_at, user); their name and location search matches lowercased prefixes, which
+        # needs a binary collation on the indexed expression (see auth_app.api.filters.prefix_filter).
+        indexes = [
+            models.Index(fields=['type', 'created_at', 'user'], name='profile_directory_idx'),
+            models.Index(F('type'), BinaryCollate(Lower('first_name')), name='profile_first_name_idx'),
+            models.Index(F('type'), BinaryCollate(Lower('last_name')), name='profile_last_name_idx'),
+            models.Index(F('type'), BinaryCollate(Lower('location')), name='profile_location_idx'),
+        ]
+
     def __str__(self):
         full_name = f"{self.first_name} {self.last_name}".strip()
         display_name = full_name if full_name else self.user.username
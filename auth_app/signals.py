@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from auth_app.models import UserProfile
+from auth_app.api.authentication import evict_token, evict_user_tokens
+from auth_app.cache import invalidate_profile_directories
+from core.images import image_processed, schedule_image_processing
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def evict_changed_token(sender, instance, **kwargs):
+    """Drops a created, changed or deleted token from the authentication cache."""
+    evict_token(instance.key)
+
+
+def _auth_state(user):
+    # Read from __dict__, so deferred fields are not loaded just to take the snapshot.
+    return user.__dict__.get('password'), user.__dict__.get('is_active')
+
+
+@receiver(post_init, sender=User)
+def remember_auth_state(sender, instance, **kwargs):
+    """Remembers the password and active flag of a loaded user to detect changes that affect authentication."""
+    instance._auth_snapshot = _auth_state(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=User)
+def evict_tokens_of_changed_user(sender, instance, created, **kwargs):
+    """
+    Drops the cached tokens of a user whose password or active flag changed, so the change applies
+    immediately. Other saves (e.g. `last_login` on login) keep them. Deleting a user deletes its
+    tokens, which evicts them (see `evict_changed_token`).
+    """
+    state = _auth_state(instance)
+    if not created and state != instance._auth_snapshot:
+        evict_user_tokens(instance.pk)
+    instance._auth_snapshot = state
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def evict_tokens_of_changed_profile(sender, instance, **kwargs):
+    """Drops the cached tokens of a user whose profile changed, so permission checks see the new type."""
+    evict_user_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+def process_profile_image(sender, instance, **kwargs):
+    """Generates the variants of a newly uploaded profile image after the commit."""
+    schedule_image_processing([instance], 'file')
+
+
+@receiver(image_processed, sender=UserProfile)
+def evict_tokens_of_processed_profile(sender, pk, **kwargs):
+    """Drops the cached profile of a user whose image was replaced by its processed version."""
+    evict_user_tokens(pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_directories_of_changed_profile(sender, instance, **kwargs):
+    """Invalidates the cached profile directories when a profile is created, changed or deleted."""
+    invalidate_profile_directories()
+
+
+@receiver(post_save, sender=User)
+def invalidate_directories_of_renamed_user(sender, instance, created, update_fields=None, **kwargs):
+    """Invalidates the cached profile directories when a user's username may have changed (not on login)."""
+    if not created and (update_fields is None or 'username' in update_fields):
+        invalidate_profile_directories()
+
+
+@receiver(image_processed, sender=UserProfile)
+def invalidate_directories_of_processed_profile(sender, **kwargs):
+    """Invalidates the cached profile directories once a profile image was replaced by its processed version."""
+    invalidate_profile_directories()
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from rest_framework import status
+from auth_app.models import UserProfile
+from auth_app.api.authentication import SHARED_KEY_PREFIX, get_shared_cache, token_cache
+
+class CachedTokenAuthenticationTest(APITestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='customer', password='secure123')
+        self.profile = UserProfile.objects.create(user=self.user, type='customer')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_token_skips_token_and_profile_queries(self):
+        # The profile detail is not cached, so its own query is the only one left.
+        self.client.get(f'/api/profile/{self.user.pk}/')
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/profile/{self.user.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get('/api/profiles/business/')
+        self.token.delete()
+        response = self.client.get('/api/profiles/business/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_change_is_visible_to_permissions(self):
+        self.assertEqual(self.client.get('/api/offers/').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post('/api/offers/', {}, format='json').status_code, status.HTTP_403_FORBIDDEN)
+        self.profile.type = 'business'
+        self.profile.save()
+        self.assertEqual(self.client.post('/api/offers/', {}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cache_holds_no_password_hash(self):
+        self.client.get('/api/profiles/business/')
+        cached = [token_cache.get(self.token.key), get_shared_cache().get(SHARED_KEY_PREFIX + self.token.key)]
+        for data in cached:
+            self.assertEqual(data, (self.token.key, self.user.pk, True, 'customer'))
+        self.assertNotIn(self.user.password, repr(cached))
+
+    def test_login_keeps_and_deactivation_evicts_the_cached_token(self):
+        self.client.get('/api/profiles/business/')
+        self.client.post('/api/login/', {'username': 'customer', 'password': 'secure123'}, format='json')
+        self.assertIsNotNone(token_cache.get(self.token.key))
+
+        self.user.set_password('changed123')
+        self.user.save()
+        self.assertIsNone(token_cache.get(self.token.key))
+
+        self.client.get('/api/profiles/business/')
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        response = self.client.get('/api/profiles/business/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from rest_framework.test import APITestCase
+from auth_app.models import UserProfile
+
+class ProfileDirectoryTest(APITestCase):
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer', password='secure123')
+        UserProfile.objects.create(user=self.viewer, type='customer')
+        self.profiles = [
+            self.create_profile('anna', 'Anna', 'Schmidt', 'Berlin'),
+            self.create_profile('bernd', 'Bernd', 'Anders', 'Bremen'),
+            self.create_profile('oskar', 'Oskar', 'Ölmann', 'Österreich'),
+        ]
+        self.client.force_authenticate(self.viewer)
+
+    def create_profile(self, username, first_name, last_name, location, profile_type='business'):
+        user = User.objects.create_user(username=username, password='secure123')
+        return UserProfile.objects.create(
+            user=user, type=profile_type, first_name=first_name, last_name=last_name, location=location,
+        )
+
+    def usernames(self, url):
+        return [profile['username'] for profile in self.client.get(url).data['results']]
+
+    def test_directory_is_paginated_newest_first(self):
+        response = self.client.get('/api/profiles/business/?page_size=2')
+        self.assertEqual([profile['username'] for profile in response.data['results']], ['oskar', 'bernd'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([profile['username'] for profile in response.data['results']], ['anna'])
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(self.usernames('/api/profiles/customer/'), ['viewer'])
+
+    def test_search_matches_name_and_location_prefixes_case_insensitively(self):
+        self.assertEqual(self.usernames('/api/profiles/business/?search=an'), ['bernd', 'anna'])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=SCHM'), ['anna'])
+        self.assertEqual(self.usernames('/api/profiles/business/?location=br'), ['bernd'])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=an&location=ber'), ['anna'])
+        self.assertEqual(self.usernames('/api/profiles/business/?location=Öster'), ['oskar'])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=erlin'), [])
+
+    def test_search_prefixes_with_punctuation_and_non_ascii_characters(self):
+        self.create_profile('obrien', "O'Brien", 'Ó Súilleabháin', 'São Paulo')
+        self.create_profile('o_brien', 'O_Brien', 'Ostrowski', 'Saarbrücken')
+        self.create_profile('jose', 'José', 'Müller-Lüdenscheidt', 'Zürich')
+        self.assertEqual(self.usernames("/api/profiles/business/?search=o'"), ['obrien'])
+        # Range matching takes "_" and "%" literally, unlike LIKE.
+        self.assertEqual(self.usernames('/api/profiles/business/?search=o_'), ['o_brien'])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=o%25'), [])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=Ó S'), ['obrien'])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=josé'), ['jose'])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=Müller-'), ['jose'])
+        self.assertEqual(self.usernames('/api/profiles/business/?search=mu'), [])
+        self.assertEqual(self.usernames('/api/profiles/business/?location=sã'), ['obrien'])
+        self.assertEqual(self.usernames('/api/profiles/business/?location=sa'), ['o_brien'])
+        # SQLite's lower() only folds ASCII letters.
+        expected = [] if connection.vendor == 'sqlite' else ['oskar']
+        self.assertEqual(self.usernames('/api/profiles/business/?location=öster'), expected)
+
+    def test_directory_is_cached_until_a_profile_changes(self):
+        self.assertEqual(self.client.get('/api/profiles/business/')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/profiles/business/')['X-Cache'], 'HIT')
+
+        profile = self.profiles[0]
+        profile.location = 'Hamburg'
+        profile.save()
+        response = self.client.get('/api/profiles/business/?location=ham')
+        self.assertEqual([profile['username'] for profile in response.data['results']], ['anna'])
+        self.assertEqual(self.client.get('/api/profiles/business/')['X-Cache'], 'MISS')
+
+    def test_renamed_user_and_switched_type_are_visible(self):
+        self.client.get('/api/profiles/business/')
+        self.client.get('/api/profiles/customer/')
+        user = self.profiles[1].user
+        user.username = 'bernhard'
+        user.save()
+        self.assertIn('bernhard', self.usernames('/api/profiles/business/'))
+
+        self.profiles[2].type = 'customer'
+        self.profiles[2].save()
+        self.assertNotIn('oskar', self.usernames('/api/profiles/business/'))
+        self.assertIn('oskar', self.usernames('/api/profiles/customer/'))
+
+    def test_login_keeps_the_cached_directory(self):
+        self.client.get('/api/profiles/business/')
+        self.client.post('/api/login/', {'username': 'anna', 'password': 'secure123'}, format='json')
+        self.assertEqual(self.client.get('/api/profiles/business/')['X-Cache'], 'HIT')
+
+    def test_directory_requires_authentication(self):
+        self.client.get('/api/profiles/business/')
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/profiles/business/').status_code, 401)
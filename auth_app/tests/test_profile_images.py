@@ -0,0 +1,48 @@
+import io
+import tempfile
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APITestCase
+from auth_app.models import UserProfile
+
+
+def image_upload(name='photo.png', size=(900, 600), image_format='PNG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 40, 40)).save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{image_format.lower()}')
+
+
+class ProfileImageTest(APITestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name, TASKS_MODE='inline')
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.user, type='business', location='Berlin', description='Design')
+        self.client.force_authenticate(self.user)
+
+    def test_uploaded_image_is_processed_and_exposes_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/profile/{self.user.pk}/', {'file': image_upload()}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+
+        profile = UserProfile.objects.get(pk=self.user.pk)
+        self.assertTrue(profile.file.name.startswith('images/'))
+        self.assertFalse(profile.file.storage.exists('uploads/photo.png'))
+        response = self.client.get('/api/profiles/business/')
+        variants = response.data['results'][0]['file_variants']
+        self.assertEqual(set(variants), {'thumbnail', 'card', 'large'})
+        self.assertTrue(variants['thumbnail'].endswith('-thumbnail.webp'))
+        with profile.file.storage.open(profile.file.name.rsplit('.', 1)[0] + '-thumbnail.webp') as file:
+            self.assertEqual(Image.open(file).size, (160, 160))
+
+    def test_non_image_upload_is_rejected(self):
+        upload = SimpleUploadedFile('notes.png', b'not an image', content_type='image/png')
+        response = self.client.patch(f'/api/profile/{self.user.pk}/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.data)
@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from auth_app.models import UserProfile
+from core.testing import QueryPlanMixin
+
+class ProfileQueryPlanTest(QueryPlanMixin, APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='customer', password='secure123')
+        UserProfile.objects.create(user=self.user, type='customer')
+        self.client.force_authenticate(self.user)
+
+    def test_profile_directories_use_the_type_index(self):
+        self.assertUsesIndexes('/api/profiles/business/', ['auth_app_userprofile'], ordered=True)
+        self.assertUsesIndexes('/api/profiles/customer/', ['auth_app_userprofile'], ordered=True)
+
+    def test_profile_search_uses_the_lowercase_indexes(self):
+        self.assertUsesIndexes('/api/profiles/business/', ['auth_app_userprofile'], {'search': 'An'})
+        self.assertUsesIndexes('/api/profiles/business/', ['auth_app_userprofile'], {'location': 'Ber'})
+
+    def test_profile_detail_uses_the_primary_key(self):
+        self.assertUsesIndexes(f'/api/profile/{self.user.pk}/', ['auth_app_userprofile'])
@@ -4,8 +4,11 @@
 # Config
 # ===============================
 SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
-DB_FILE="$SCRIPT_DIR/db.sqlite3"
-BACKUP_NAME="db-backup__$(date '+%F__%H-%M').db"
+PYTHON="${PYTHON:-python3}"
+BACKUP_DIR="${DJANGO_BACKUP_DIR:-$SCRIPT_DIR/backups}"
+# "--incremental" stores only the pages changed since the previous backup; set BACKUP_MODE="" for full backups only.
+BACKUP_MODE="${BACKUP_MODE---incremental}"
+BACKUP_KEEP="${BACKUP_KEEP:-7}"
 FTP_SERVER="backup.henrik-petersen.de"
 FTP_USER="backup-admin"
 FTP_PASS="O172?3zeu"
@@ -18,17 +21,13 @@ LOG_FILE="$SCRIPT_DIR/backup_$(date '+%F__%H-%M').log"
 # ===============================
 echo "===== Database Backup started =====" | tee "$LOG_FILE"
 
-# Prüfen, ob Datenbank existiert
-if [ ! -f "$DB_FILE" ]; then
-    echo "Error: Database file $DB_FILE not found!" | tee -a "$LOG_FILE"
-    exit 1
-fi
-
-# Backup erstellen
-if cp "$DB_FILE" "$SCRIPT_DIR/$BACKUP_NAME"; then
-    echo "Database copied successfully: $BACKUP_NAME" | tee -a "$LOG_FILE"
+# Konsistenten Snapshot über die SQLite-Online-Backup-API erstellen (prüft, komprimiert und rotiert)
+if BACKUP_FILE=$("$PYTHON" "$SCRIPT_DIR/manage.py" backup_db --dir "$BACKUP_DIR" $BACKUP_MODE --keep "$BACKUP_KEEP" 2>> "$LOG_FILE" | tee -a "$LOG_FILE" | tail -n 1) && [ -f "$BACKUP_FILE" ]; then
+    BACKUP_NAME=$(basename "$BACKUP_FILE")
+    MANIFEST_NAME="${BACKUP_NAME%%.*}.json"
+    echo "Database backup created successfully: $BACKUP_NAME" | tee -a "$LOG_FILE"
 else
-    echo "Error: Failed to copy database!" | tee -a "$LOG_FILE"
+    echo "Error: Failed to back up the database!" | tee -a "$LOG_FILE"
     exit 1
 fi
 
@@ -40,7 +39,9 @@ echo "Uploading $BACKUP_NAME to FTP server..." | tee -a "$LOG_FILE"
 ftp -inv "$FTP_SERVER" <<EOF >> "$LOG_FILE" 2>&1
 user $FTP_USER $FTP_PASS
 binary
+lcd $BACKUP_DIR
 put $BACKUP_NAME
+put $MANIFEST_NAME
 bye
 EOF
 
@@ -50,12 +51,6 @@ else
     echo "Error: FTP upload failed!" | tee -a "$LOG_FILE"
 fi
 
-# ===============================
-# Cleanup
-# ===============================
-rm -f "$BACKUP_NAME"
-echo "Local backup file removed." | tee -a "$LOG_FILE"
-
 # ===============================
 # Send Email
 # ===============================
@@ -0,0 +1,396 @@
+"""
+Query-count, latency and memory benchmark for the API endpoints.
+
+Seeds a database with realistic volumes (by default 10k offers, 100k orders and 50k reviews),
+then requests every route of `core/api_urls.py` through the full Django stack and records per
+scenario the number of SQL queries, p50/p95 latency and the peak memory allocated while
+handling a request. Writes run inside a transaction that is rolled back, so the seeded data
+stays the same between runs and commits.
+
+Every scenario has a query budget. The run fails (exit code 1) when a budget is exceeded or
+when a route of `core/api_urls.py` has no scenario, which catches N+1 regressions in
+serializers. The JSON report (`--report`) can be compared with the one of another commit
+(`--compare`).
+
+By default the benchmark uses its own SQLite database `benchmarks/benchmark.sqlite3`
+(override with DB_NAME / DB_ENGINE) and runs with DEBUG off. Seeding only happens once,
+the data is reused by later runs (`--reseed` starts over).
+
+Usage:
+    python benchmarks/api.py --report report.json
+    python benchmarks/api.py --report new.json --compare report.json
+    python benchmarks/api.py --offers 1000 --orders 10000 --reviews 5000 --iterations 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+if __name__ == '__main__':
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    os.environ.setdefault('DJANGO_DEBUG', 'False')
+    if os.environ.get('DB_ENGINE', 'sqlite').lower() == 'sqlite':
+        os.environ.setdefault('DB_NAME', str(BASE_DIR / 'benchmarks' / 'benchmark.sqlite3'))
+
+    import django
+
+    django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.urls import URLPattern, URLResolver, get_resolver  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from core.testdata import TestDataConfig, delete_generated, generate  # noqa: E402
+from auth_app.cache import invalidate_profile_directories  # noqa: E402
+from auth_app.models import UserProfile  # noqa: E402
+from offers_app.cache import invalidate_all_offer_caches  # noqa: E402
+from offers_app.models import Offer, OfferDetail  # noqa: E402
+from orders_app.models import Order  # noqa: E402
+from reviews_app.cache import invalidate_all_review_caches  # noqa: E402
+from reviews_app.models import Review  # noqa: E402
+from stats_app.services import invalidate_base_info  # noqa: E402
+
+USER_PREFIX = 'bench-'
+PASSWORD = 'benchmark123'
+OFFER_TYPES = ['basic', 'standard', 'premium']
+
+
+@dataclass
+class Volumes:
+    offers: int = 10_000
+    orders: int = 100_000
+    reviews: int = 50_000
+    businesses: int = 200
+    customers: int = 2_000
+
+
+@dataclass
+class Scenario:
+    """
+    One request of the benchmark.
+
+    `path` and `data` may be callables receiving the `Fixtures`, so they can reference seeded rows.
+    `actor` is 'business', 'customer' or None (anonymous). `max_queries` is the query budget.
+    """
+    name: str
+    method: str
+    route: str
+    path: object
+    actor: object
+    max_queries: int
+    data: object = None
+
+    def resolve(self, value, fixtures):
+        return value(fixtures) if callable(value) else value
+
+
+@dataclass
+class Fixtures:
+    business: User
+    customer: User
+    offer: Offer
+    offer_detail: OfferDetail
+    order: Order
+    review: Review
+    unreviewed_business: User
+    tokens: dict = field(default_factory=dict)
+
+
+def offer_payload(title):
+    return {
+        'title': title,
+        'description': 'Created by the API benchmark.',
+        'details': [
+            {
+                'title': f'{offer_type.capitalize()} {title}', 'revisions': index + 1,
+                'delivery_time_in_days': 10 - index * 3, 'price': 100 * (index + 1),
+                'features': ['Design', 'Support'], 'offer_type': offer_type,
+            }
+            for index, offer_type in enumerate(OFFER_TYPES)
+        ],
+    }
+
+
+SCENARIOS = [
+    Scenario('registration', 'post', 'registration/', '/api/registration/', None, 11, {
+        'username': f'{USER_PREFIX}new', 'email': 'new@example.com',
+        'password': PASSWORD, 'repeated_password': PASSWORD, 'type': 'customer',
+    }),
+    Scenario('login', 'post', 'login/', '/api/login/', None, 5, lambda f: {'username': f.customer.username, 'password': PASSWORD}),
+    Scenario('profile detail', 'get', 'profile/<int:pk>/', lambda f: f'/api/profile/{f.business.pk}/', 'customer', 1),
+    Scenario('profile update', 'patch', 'profile/<int:pk>/', lambda f: f'/api/profile/{f.business.pk}/', 'business', 8, {'location': 'Berlin'}),
+    Scenario('business profiles', 'get', 'profiles/business/', '/api/profiles/business/', 'customer', 1),
+    Scenario('customer profiles', 'get', 'profiles/customer/', '/api/profiles/customer/', 'customer', 1),
+    Scenario('business profile search', 'get', 'profiles/business/', '/api/profiles/business/?search=business&location=b', 'customer', 1),
+    Scenario('offer list', 'get', 'offers/', '/api/offers/', None, 3),
+    Scenario('offer list cursor', 'get', 'offers/', '/api/offers/?pagination=cursor&ordering=min_price', None, 2),
+    Scenario('offer search', 'get', 'offers/', '/api/offers/?search=website', None, 3),
+    Scenario('offer list by creator', 'get', 'offers/', lambda f: f'/api/offers/?creator_id={f.business.pk}', None, 3),
+    Scenario('offer create', 'post', 'offers/', '/api/offers/', 'business', 10, offer_payload('Benchmark')),
+    Scenario('offer bulk create', 'post', 'offers/bulk/', '/api/offers/bulk/', 'business', 9,
+             [offer_payload(f'Benchmark {index}') for index in range(20)]),
+    Scenario('offer detail', 'get', 'offers/<int:pk>/', lambda f: f'/api/offers/{f.offer.pk}/', 'customer', 2),
+    Scenario('offer update', 'patch', 'offers/<int:pk>/', lambda f: f'/api/offers/{f.offer.pk}/', 'business', 12,
+             {'title': 'Updated', 'details': [{'offer_type': 'basic', 'price': 99}]}),
+    Scenario('offerdetail', 'get', 'offerdetails/<int:pk>/', lambda f: f'/api/offerdetails/{f.offer_detail.pk}/', 'customer', 1),
+    Scenario('customer orders', 'get', 'orders/', '/api/orders/', 'customer', 1),
+    Scenario('customer orders archived', 'get', 'orders/', '/api/orders/?include_archived=true', 'customer', 2),
+    Scenario('business orders', 'get', 'orders/', '/api/orders/?status=completed', 'business', 1),
+    Scenario('order create', 'post', 'orders/', '/api/orders/', 'customer', 6, lambda f: {'offer_detail_id': f.offer_detail.pk}),
+    Scenario('order batch', 'post', 'orders/batch/', '/api/orders/batch/', 'customer', 6, lambda f: {'orders': [{'offer_detail_id': f.offer_detail.pk}] * 10}),
+    Scenario('order update', 'patch', 'orders/<int:pk>/', lambda f: f'/api/orders/{f.order.pk}/', 'business', 5, {'status': 'completed'}),
+    Scenario('order count', 'get', 'order-count/<int:business_user_id>/', lambda f: f'/api/order-count/{f.business.pk}/', 'customer', 1),
+    Scenario('completed order count', 'get', 'completed-order-count/<int:business_user_id>/',
+             lambda f: f'/api/completed-order-count/{f.business.pk}/', 'customer', 1),
+    Scenario('reviews by business', 'get', 'reviews/', lambda f: f'/api/reviews/?business_user_id={f.business.pk}&ordering=-updated_at', 'customer', 1),
+    Scenario('review create', 'post', 'reviews/', '/api/reviews/', 'customer', 5,
+             lambda f: {'business_user': f.unreviewed_business.pk, 'rating': 4, 'description': 'Good work.'}),
+    Scenario('review upsert', 'post', 'reviews/', '/api/reviews/?upsert=true', 'customer', 5,
+             lambda f: {'business_user': f.review.business_user_id, 'rating': 2, 'description': 'Re-rated.'}),
+    Scenario('review update', 'patch', 'reviews/<int:pk>/', lambda f: f'/api/reviews/{f.review.pk}/', 'customer', 4, {'rating': 5}),
+    Scenario('base info', 'get', 'base-info/', '/api/base-info/', None, 4),
+    Scenario('business stats', 'get', 'business-stats/<int:business_user_id>/', lambda f: f'/api/business-stats/{f.business.pk}/', 'customer', 1),
+]
+
+
+def api_routes(resolver=None, prefix=''):
+    """Returns the route strings of every URL pattern below `core/api_urls.py`."""
+    if resolver is None:
+        resolver = get_resolver('core.api_urls')
+    routes = []
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            routes.extend(api_routes(pattern, prefix + str(pattern.pattern)))
+        elif isinstance(pattern, URLPattern):
+            routes.append(prefix + str(pattern.pattern))
+    return routes
+
+
+def seed(volumes, seed=42, stdout=None):
+    """Generates the benchmark data with `core.testdata` (chunked `bulk_create`)."""
+    generate(TestDataConfig(
+        businesses=volumes.businesses, customers=volumes.customers, offers=volumes.offers,
+        orders=volumes.orders, reviews=volumes.reviews, seed=seed, prefix=USER_PREFIX, password=PASSWORD,
+    ), stdout=stdout)
+
+
+def is_seeded():
+    return User.objects.filter(username=f'{USER_PREFIX}business-0').exists()
+
+
+def unseed():
+    delete_generated(USER_PREFIX)
+
+
+def load_fixtures():
+    """Picks the rows the scenarios act on: the busiest business, one of its open orders and its customer."""
+    business = User.objects.get(username=f'{USER_PREFIX}business-0')
+    order = Order.objects.filter(business_user=business, status='in_progress').order_by('pk').first()
+    customer = order.customer_user
+    offer = Offer.objects.filter(user=business).order_by('pk').first()
+    review = Review.objects.filter(reviewer=customer).order_by('pk').first()
+    if review is None:
+        review = Review.objects.create(business_user=business, reviewer=customer, rating=3, description='Benchmark review')
+    reviewed = Review.objects.filter(reviewer=customer).values('business_user')
+    unreviewed_business = User.objects.filter(userprofile__type='business').exclude(pk__in=reviewed).order_by('pk').first()
+    if unreviewed_business is None:
+        unreviewed_business = User.objects.create_user(username=f'{USER_PREFIX}business-unreviewed')
+        UserProfile.objects.create(user=unreviewed_business, type='business', location='Berlin', description='Benchmark business')
+    tokens = {kind: Token.objects.get_or_create(user=user)[0].key for kind, user in [('business', business), ('customer', customer)]}
+    return Fixtures(
+        business=business, customer=customer, offer=offer, offer_detail=offer.details.order_by('pk').first(),
+        order=order, review=review, unreviewed_business=unreviewed_business, tokens=tokens,
+    )
+
+
+class QueryCounter:
+    """
+    Counts executed statements without keeping them (the debug query log is capped).
+
+    Savepoints are skipped: they only appear because writes run inside the rollback transaction.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')):
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Rollback(Exception):
+    pass
+
+
+def perform(client, scenario, fixtures):
+    """Sends the request of a scenario; writes are rolled back afterwards. Returns the response."""
+    path = scenario.resolve(scenario.path, fixtures)
+    data = scenario.resolve(scenario.data, fixtures)
+    kwargs = {'format': 'json'} if scenario.method != 'get' else {}
+    if scenario.method == 'get':
+        # Measure the uncached responses; a cache hit would hide query regressions.
+        invalidate_all_offer_caches()
+        invalidate_profile_directories()
+        invalidate_all_review_caches()
+        invalidate_base_info()
+        return getattr(client, scenario.method)(path, data, **kwargs)
+    response = None
+    try:
+        with transaction.atomic():
+            response = getattr(client, scenario.method)(path, data, **kwargs)
+            raise Rollback
+    except Rollback:
+        pass
+    return response
+
+
+def run_scenario(scenario, fixtures, iterations, warmup=1):
+    client = APIClient(SERVER_NAME='localhost')
+    if scenario.actor:
+        client.credentials(HTTP_AUTHORIZATION=f'Token {fixtures.tokens[scenario.actor]}')
+    for _ in range(warmup):
+        perform(client, scenario, fixtures)
+
+    latencies, query_counts, status_codes = [], [], set()
+    for _ in range(iterations):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            response = perform(client, scenario, fixtures)
+            latencies.append(time.perf_counter() - started)
+        query_counts.append(counter.count)
+        status_codes.add(response.status_code)
+
+    tracemalloc.start()
+    try:
+        perform(client, scenario, fixtures)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'name': scenario.name,
+        'method': scenario.method.upper(),
+        'route': scenario.route,
+        'status_codes': sorted(status_codes),
+        'queries': max(query_counts),
+        'max_queries': scenario.max_queries,
+        'latency_ms': {
+            'p50': round(statistics.median(latencies) * 1000, 2),
+            'p95': round(latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))] * 1000, 2),
+        },
+        'peak_memory_kib': round(peak / 1024, 1),
+    }
+
+
+def run_suite(iterations=20, scenarios=SCENARIOS):
+    """
+    Runs all scenarios against the seeded data.
+
+    Returns:
+        tuple: (results, failures), where failures lists every exceeded budget,
+        unexpected status code and uncovered route as a message.
+    """
+    fixtures = load_fixtures()
+    results, failures = [], []
+    for scenario in scenarios:
+        result = run_scenario(scenario, fixtures, iterations)
+        results.append(result)
+        if result['queries'] > scenario.max_queries:
+            failures.append(f"{scenario.name}: {result['queries']} queries, budget {scenario.max_queries}")
+        if any(code >= 400 for code in result['status_codes']):
+            failures.append(f"{scenario.name}: unexpected status {result['status_codes']}")
+    covered = {scenario.route for scenario in scenarios}
+    failures.extend(f'{route}: no benchmark scenario' for route in api_routes() if route not in covered)
+    return results, failures
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    previous = {result['name']: result for result in (baseline or {}).get('results', [])}
+    print(f"{'scenario':<24} {'queries':>12} {'p50 ms':>9} {'p95 ms':>9} {'peak KiB':>9}")
+    for result in results:
+        queries = f"{result['queries']}/{result['max_queries']}"
+        line = (
+            f"{result['name']:<24} {queries:>12} {result['latency_ms']['p50']:>9} "
+            f"{result['latency_ms']['p95']:>9} {result['peak_memory_kib']:>9}"
+        )
+        before = previous.get(result['name'])
+        if before:
+            line += (
+                f"   queries {result['queries'] - before['queries']:+d}, "
+                f"p95 {result['latency_ms']['p95'] - before['latency_ms']['p95']:+.2f} ms"
+            )
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--offers', type=int, default=Volumes.offers)
+    parser.add_argument('--orders', type=int, default=Volumes.orders)
+    parser.add_argument('--reviews', type=int, default=Volumes.reviews)
+    parser.add_argument('--businesses', type=int, default=Volumes.businesses)
+    parser.add_argument('--customers', type=int, default=Volumes.customers)
+    parser.add_argument('--seed', type=int, default=42, help='Random seed of the generated data.')
+    parser.add_argument('--reseed', action='store_true', help='Delete previously seeded data and seed again.')
+    parser.add_argument('--iterations', type=int, default=20, help='Measured requests per scenario.')
+    parser.add_argument('--report', help='Write the JSON report to this file.')
+    parser.add_argument('--compare', help='JSON report of an earlier run to compare against.')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    if args.reseed:
+        unseed()
+    if not is_seeded():
+        volumes = Volumes(args.offers, args.orders, args.reviews, args.businesses, args.customers)
+        seed(volumes, args.seed)
+
+    results, failures = run_suite(args.iterations)
+    report = {
+        'commit': git_commit(),
+        'database': connection.vendor,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'volumes': {
+            'offers': Offer.objects.count(), 'orders': Order.objects.count(), 'reviews': Review.objects.count(),
+        },
+        'iterations': args.iterations,
+        'results': results,
+        'failures': failures,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_results(results, baseline)
+    if args.report:
+        with open(args.report, 'w') as file:
+            json.dump(report, file, indent=2)
+    for failure in failures:
+        print(f'FAIL {failure}')
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Compares the write throughput of the offer creation paths.
+
+Creates the same offers (three details each) three times against the configured database:
+
+    per-row   The former serializer path: `Offer.objects.create` plus one
+              `OfferDetail.objects.create` per detail, every row firing its signals.
+    per-offer `create_offers` for one offer at a time (what `POST /offers/` does now).
+    bulk      `create_offers` in chunks (what `POST /offers/bulk/` does).
+
+Each path runs under a dedicated business user that is deleted afterwards.
+
+Usage:
+    python benchmarks/offer_writes.py --offers 500 --chunk-size 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from auth_app.models import UserProfile  # noqa: E402
+from offers_app.models import Offer, OfferDetail  # noqa: E402
+from offers_app.services import create_offers  # noqa: E402
+
+USERNAME = 'benchmark-offer-writes'
+
+
+def offer_data(user, index):
+    return {
+        'user': user,
+        'title': f'Benchmark offer {index}',
+        'description': 'Generated by benchmarks/offer_writes.py.',
+        'details': [
+            {
+                'title': f'{offer_type.capitalize()} package',
+                'revisions': position + 1,
+                'delivery_time_in_days': 10 - position * 3,
+                'price': 100 * (position + 1) + index % 50,
+                'features': ['Design', 'Support'],
+                'offer_type': offer_type,
+            }
+            for position, offer_type in enumerate(['basic', 'standard', 'premium'])
+        ],
+    }
+
+
+def per_row(offers, chunk_size):
+    for data in offers:
+        details = data.pop('details')
+        offer = Offer.objects.create(**data)
+        for detail in details:
+            OfferDetail.objects.create(offer=offer, **detail)
+
+
+def per_offer(offers, chunk_size):
+    for data in offers:
+        create_offers([data])
+
+
+def bulk(offers, chunk_size):
+    for start in range(0, len(offers), chunk_size):
+        create_offers(offers[start:start + chunk_size])
+
+
+class QueryCounter:
+    """Counts executed statements without keeping them (the debug query log is capped)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(name, path, count, chunk_size):
+    User.objects.filter(username=USERNAME).delete()
+    user = User.objects.create_user(username=USERNAME)
+    UserProfile.objects.create(user=user, type='business')
+    offers = [offer_data(user, index) for index in range(count)]
+    counter = QueryCounter()
+    try:
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            path(offers, chunk_size)
+            elapsed = time.perf_counter() - started
+        assert OfferDetail.objects.filter(offer__user=user).count() == count * 3
+    finally:
+        user.delete()
+    return {
+        'path': name,
+        'offers': count,
+        'seconds': round(elapsed, 3),
+        'offers_per_s': round(count / elapsed, 1),
+        'queries': counter.count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--offers', type=int, default=500, help='Offers created per path.')
+    parser.add_argument('--chunk-size', type=int, default=100, help='Offers per transaction on the bulk path.')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+    args = parser.parse_args()
+
+    results = [
+        measure(name, path, args.offers, args.chunk_size)
+        for name, path in [('per-row', per_row), ('per-offer', per_offer), ('bulk', bulk)]
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(
+            f"{result['path']:>9}: {result['offers']} offers in {result['seconds']}s "
+            f"({result['offers_per_s']} offers/s, {result['queries']} queries)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+import io
+from django.test import TestCase
+from benchmarks.api import Volumes, api_routes, run_suite, seed, SCENARIOS
+
+
+class ApiBenchmarkTest(TestCase):
+
+    def test_every_route_has_a_scenario(self):
+        self.assertCountEqual(set(api_routes()), {scenario.route for scenario in SCENARIOS})
+
+    def test_every_scenario_stays_within_its_query_budget(self):
+        volumes = Volumes(offers=30, orders=90, reviews=40, businesses=3, customers=20)
+        seed(volumes, seed=1, stdout=io.StringIO())
+        results, failures = run_suite(iterations=1)
+        self.assertEqual(failures, [])
+        self.assertEqual(len(results), len(SCENARIOS))
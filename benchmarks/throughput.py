@@ -0,0 +1,103 @@
+"""
+Measures the HTTP throughput and latency of a running Coderr backend.
+
+Sends GET requests from a number of concurrent client threads for a fixed duration and
+prints requests per second, error count and latency percentiles, optionally as JSON.
+Uses only the standard library, so it can run against any deployment.
+
+Usage:
+    python benchmarks/throughput.py --url http://127.0.0.1:8000 --path /api/base-info/ --path /api/offers/
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def worker(urls, deadline, headers, latencies, errors, lock):
+    local_latencies, local_errors, position = [], 0, 0
+    while time.perf_counter() < deadline:
+        url = urls[position % len(urls)]
+        position += 1
+        request = urllib.request.Request(url, headers=headers)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            local_errors += 1
+            continue
+        local_latencies.append(time.perf_counter() - started)
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def run(base_url, paths, concurrency, duration, token=None):
+    """Runs the load test and returns a result dict."""
+    urls = [base_url.rstrip('/') + path for path in paths]
+    headers = {'Authorization': f'Token {token}'} if token else {}
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(urls, deadline, headers, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        'url': base_url,
+        'paths': paths,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 2),
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+            'p50': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99': round(percentile(latencies, 0.99) * 1000, 2),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the server.')
+    parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable).')
+    parser.add_argument('--concurrency', type=int, default=16, help='Number of concurrent clients.')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds to run.')
+    parser.add_argument('--token', help='Optional API token for authenticated endpoints.')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON.')
+    args = parser.parse_args()
+
+    result = run(args.url, args.paths or ['/api/base-info/'], args.concurrency, args.duration, args.token)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    latency = result['latency_ms']
+    print(
+        f"{result['requests']} requests in {result['duration_s']}s with {result['concurrency']} clients: "
+        f"{result['requests_per_s']} req/s, {result['errors']} errors, "
+        f"latency p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import struct
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Header of an incremental backup: magic, page size, page count of the database after applying it.
+DELTA_HEADER = struct.Struct('>4sIQ')
+DELTA_MAGIC = b'SQLD'
+# Each changed page is stored as its page number followed by the page content.
+PAGE_NUMBER = struct.Struct('>Q')
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Raised when a snapshot fails verification or a backup chain cannot be restored."""
+
+
+@dataclass
+class BackupManifest:
+    """
+    Describes one backup file; stored next to it as `<name>.json`.
+
+    Attributes:
+        name: File name of the backup without suffix (`db-<timestamp>-full` / `-incr`).
+        kind: `full` (compressed database) or `incremental` (compressed changed pages).
+        base: Name of the full backup the chain starts with (the own name for full backups).
+        sequence: Position in the chain; 0 for the full backup.
+        created_at: ISO timestamp of the snapshot.
+        page_size: Page size of the database.
+        page_count: Number of pages of the database at the time of the snapshot.
+        changed_pages: Number of pages stored in the file.
+        sha256: Checksum of the database at the time of the snapshot, checked on restore.
+        size: Size of the compressed backup file in bytes.
+    """
+    name: str
+    kind: str
+    base: str
+    sequence: int
+    created_at: str
+    page_size: int
+    page_count: int
+    changed_pages: int
+    sha256: str
+    size: int = 0
+
+    @property
+    def suffix(self):
+        return '.db.gz' if self.kind == 'full' else '.delta.gz'
+
+    def path(self, directory):
+        return Path(directory) / f'{self.name}{self.suffix}'
+
+
+def load_manifests(directory):
+    """Returns the manifests of all backups in `directory`, oldest first."""
+    manifests = []
+    for path in sorted(Path(directory).glob('db-*.json')):
+        with open(path) as file:
+            manifests.append(BackupManifest(**json.load(file)))
+    return manifests
+
+
+def _write_manifest(directory, manifest):
+    path = Path(directory) / f'{manifest.name}.json'
+    with open(f'{path}.part', 'w') as file:
+        json.dump(asdict(manifest), file, indent=2)
+    os.replace(f'{path}.part', path)
+
+
+def snapshot(source, target, pages=-1, sleep=0, progress=None):
+    """
+    Copies a live SQLite database into `target` with the online backup API.
+
+    By default the whole database is copied in one step. In WAL mode that step only holds a
+    read transaction, so writers are not blocked and cannot disturb the copy. A stepped copy
+    (`pages` > 0) is consistent too, but restarts whenever another connection writes between
+    two steps, so under steady write traffic it may never finish; it is only meant for
+    databases in rollback journal mode, where a single step would block writers throughout.
+    The snapshot is switched to rollback journal mode, which keeps it a single self-contained file.
+
+    Args:
+        source: Path of the live database.
+        target: Path of the snapshot file; overwritten if it exists.
+        pages: Pages copied per step (`-1` copies everything in one step).
+        sleep: Seconds to wait between the steps of a stepped copy.
+        progress: Optional callable receiving `(remaining, total)` pages after every step.
+    """
+    Path(target).unlink(missing_ok=True)
+    source_connection = sqlite3.connect(source, timeout=60)
+    target_connection = sqlite3.connect(target)
+    try:
+        source_connection.backup(
+            target_connection, pages=pages, sleep=sleep,
+            progress=(lambda status, remaining, total: progress(remaining, total)) if progress else None,
+        )
+        target_connection.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target_connection.close()
+        source_connection.close()
+
+
+def verify_database(path):
+    """Runs `PRAGMA integrity_check` on a database file and raises `BackupError` if it reports problems."""
+    connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        result = [row[0] for row in connection.execute('PRAGMA integrity_check')]
+    finally:
+        connection.close()
+    if result != ['ok']:
+        raise BackupError(f'Integrity check of {path} failed: {"; ".join(result[:10])}')
+
+
+def read_pages(path):
+    """Yields the pages of a database file together with its page size."""
+    with open(path, 'rb') as file:
+        header = file.read(100)
+        page_size = struct.unpack('>H', header[16:18])[0]
+        # The value 1 stands for 65536 bytes (the size does not fit into two bytes).
+        page_size = 65536 if page_size == 1 else page_size
+        file.seek(0)
+        while page := file.read(page_size):
+            yield page_size, page
+
+
+def page_hashes(path):
+    """Returns the page size and a short digest of every page of a database file."""
+    page_size, digests = 0, []
+    for page_size, page in read_pages(path):
+        digests.append(hashlib.blake2b(page, digest_size=8).digest())
+    return page_size, digests
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(COPY_BUFFER_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _save_hashes(directory, name, digests):
+    path = Path(directory) / f'{name}.pages'
+    with open(f'{path}.part', 'wb') as file:
+        file.write(b''.join(digests))
+    os.replace(f'{path}.part', path)
+
+
+def _load_hashes(directory, name):
+    path = Path(directory) / f'{name}.pages'
+    if not path.exists():
+        return None
+    data = path.read_bytes()
+    return [data[offset:offset + 8] for offset in range(0, len(data), 8)]
+
+
+def _write_full(snapshot_path, destination, compresslevel):
+    with open(snapshot_path, 'rb') as source, gzip.open(f'{destination}.part', 'wb', compresslevel=compresslevel) as target:
+        shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+    os.replace(f'{destination}.part', destination)
+
+
+def _write_delta(snapshot_path, destination, page_size, previous, compresslevel):
+    changed = 0
+    page_count = os.path.getsize(snapshot_path) // page_size
+    with gzip.open(f'{destination}.part', 'wb', compresslevel=compresslevel) as target:
+        target.write(DELTA_HEADER.pack(DELTA_MAGIC, page_size, page_count))
+        for number, (_, page) in enumerate(read_pages(snapshot_path)):
+            if number >= len(previous) or hashlib.blake2b(page, digest_size=8).digest() != previous[number]:
+                target.write(PAGE_NUMBER.pack(number))
+                target.write(page)
+                changed += 1
+    os.replace(f'{destination}.part', destination)
+    return changed
+
+
+def create_backup(source, directory, incremental=False, max_chain=24, pages=-1, sleep=0,
+                  compresslevel=6, progress=None):
+    """
+    Takes a consistent snapshot of `source` and stores it compressed in `directory`.
+
+    The database is copied with `snapshot`, checked with `PRAGMA integrity_check` and then
+    streamed through gzip into the backup file, which only gets its final name once it is
+    complete. With `incremental`, only the pages that changed since the previous backup of
+    the chain are stored; a full backup is taken instead if there is no chain yet or it
+    already has `max_chain` incremental backups. Either way the whole database is copied and
+    hashed page by page, so an incremental backup saves storage, not time.
+
+    Returns:
+        BackupManifest: The manifest of the written backup.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    snapshot_path = directory / '.snapshot.sqlite3'
+    try:
+        snapshot(source, snapshot_path, pages=pages, sleep=sleep, progress=progress)
+        verify_database(snapshot_path)
+        page_size, digests = page_hashes(snapshot_path)
+
+        manifests = load_manifests(directory)
+        latest = manifests[-1] if manifests else None
+        previous = _load_hashes(directory, latest.name) if latest else None
+        if incremental and latest and previous is not None and latest.sequence < max_chain and latest.page_size == page_size:
+            name = f'db-{now:%Y%m%d-%H%M%S-%f}-incr'
+            manifest = BackupManifest(
+                name=name, kind='incremental', base=latest.base, sequence=latest.sequence + 1,
+                created_at=now.isoformat(), page_size=page_size, page_count=len(digests), changed_pages=0,
+                sha256=_file_sha256(snapshot_path),
+            )
+            manifest.changed_pages = _write_delta(snapshot_path, manifest.path(directory), page_size, previous, compresslevel)
+        else:
+            name = f'db-{now:%Y%m%d-%H%M%S-%f}-full'
+            manifest = BackupManifest(
+                name=name, kind='full', base=name, sequence=0, created_at=now.isoformat(),
+                page_size=page_size, page_count=len(digests), changed_pages=len(digests),
+                sha256=_file_sha256(snapshot_path),
+            )
+            _write_full(snapshot_path, manifest.path(directory), compresslevel)
+        manifest.size = manifest.path(directory).stat().st_size
+        _write_manifest(directory, manifest)
+        _save_hashes(directory, manifest.name, digests)
+        # Only the newest page hashes are needed for the next incremental backup.
+        if latest:
+            (directory / f'{latest.name}.pages').unlink(missing_ok=True)
+        return manifest
+    finally:
+        snapshot_path.unlink(missing_ok=True)
+        Path(f'{snapshot_path}-journal').unlink(missing_ok=True)
+
+
+def apply_delta(path, target):
+    """Writes the pages of an incremental backup into the database file `target` and truncates it to its page count."""
+    with gzip.open(path, 'rb') as source, open(target, 'r+b') as database:
+        magic, page_size, page_count = DELTA_HEADER.unpack(source.read(DELTA_HEADER.size))
+        if magic != DELTA_MAGIC:
+            raise BackupError(f'{path} is not an incremental backup.')
+        while number_bytes := source.read(PAGE_NUMBER.size):
+            database.seek(PAGE_NUMBER.unpack(number_bytes)[0] * page_size)
+            database.write(source.read(page_size))
+        database.truncate(page_count * page_size)
+
+
+def restore_backup(directory, name, target):
+    """
+    Restores the backup `name` (full or incremental) from `directory` into the file `target`.
+
+    Incremental backups are restored by decompressing the full backup of their chain and
+    applying every incremental backup up to `name` in order. The result is checked against
+    the checksum of the manifest and with `PRAGMA integrity_check` before it replaces `target`.
+
+    Returns:
+        BackupManifest: The manifest of the restored backup.
+    """
+    manifests = {manifest.name: manifest for manifest in load_manifests(directory)}
+    if name not in manifests:
+        raise BackupError(f'Backup "{name}" not found in {directory}.')
+    wanted = manifests[name]
+    chain = sorted(
+        (manifest for manifest in manifests.values() if manifest.base == wanted.base and manifest.sequence <= wanted.sequence),
+        key=lambda manifest: manifest.sequence,
+    )
+    if [manifest.sequence for manifest in chain] != list(range(wanted.sequence + 1)):
+        raise BackupError(f'The backup chain of "{name}" is incomplete.')
+
+    part = Path(f'{target}.part')
+    try:
+        with gzip.open(chain[0].path(directory), 'rb') as source, open(part, 'wb') as database:
+            shutil.copyfileobj(source, database, COPY_BUFFER_SIZE)
+        for manifest in chain[1:]:
+            apply_delta(manifest.path(directory), part)
+        if _file_sha256(part) != wanted.sha256:
+            raise BackupError(f'The restored database does not match the checksum of "{name}".')
+        verify_database(part)
+        os.replace(part, target)
+    finally:
+        part.unlink(missing_ok=True)
+    return wanted
+
+
+def rotate_backups(directory, keep):
+    """
+    Deletes all but the newest `keep` backup chains (a full backup with its incremental backups).
+
+    Returns:
+        list: Names of the deleted backups.
+    """
+    manifests = load_manifests(directory)
+    bases = sorted({manifest.base for manifest in manifests})
+    expired = set(bases[:-keep]) if keep > 0 else set()
+    deleted = []
+    for manifest in manifests:
+        if manifest.base in expired:
+            manifest.path(directory).unlink(missing_ok=True)
+            for suffix in ('.json', '.pages'):
+                (Path(directory) / f'{manifest.name}{suffix}').unlink(missing_ok=True)
+            deleted.append(manifest.name)
+    return deleted
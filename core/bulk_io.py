@@ -0,0 +1,334 @@
+import csv
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from core.streaming import csv_lines, ndjson_lines, streaming_export_response
+
+EXPORT_FORMATS = ['csv', 'ndjson']
+# bulk_update renders one CASE per column over the whole batch; small batches keep the statements cheap.
+UPDATE_BATCH_SIZE = 100
+
+
+@dataclass
+class Dataset:
+    """
+    A model as it is exported and imported in bulk.
+
+    Attributes:
+        model: The model class.
+        fields: Exported columns (attnames, so foreign keys are written as `<name>_id`).
+        import_fields: Columns accepted on import; the primary key decides between create and update.
+        after_import: Called with the created and updated instances of a batch and the previous
+            values of the updated rows (by primary key). Bulk writes send no signals, so this is
+            where derived data (summaries, search index, rollups, caches) is brought up to date.
+    """
+    model: type
+    fields: list
+    import_fields: list
+    after_import: object = None
+
+    @property
+    def pk_name(self):
+        return self.model._meta.pk.attname
+
+
+# Filled by the apps from `AppConfig.ready()` (see e.g. `offers_app.datasets`), so `core` does not import app models.
+DATASETS = {}
+
+
+def register_dataset(name, dataset):
+    """Makes a dataset available to `export_data`, `import_data` and the admin export actions."""
+    DATASETS[name] = dataset
+
+
+def get_dataset(name):
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown dataset '{name}', choose one of: {', '.join(DATASETS)}.")
+
+
+# Export
+
+def export_rows(dataset, queryset=None, chunk_size=2000):
+    """
+    Yields the rows of a dataset as dicts of plain values, in primary key order.
+
+    Uses `values()` with `iterator()`, which reads through a server-side cursor on PostgreSQL
+    and fetches in chunks on SQLite, so memory usage is bounded by `chunk_size`.
+    """
+    if queryset is None:
+        queryset = dataset.model.objects.all()
+    yield from queryset.order_by(dataset.pk_name).values(*dataset.fields).iterator(chunk_size=chunk_size)
+
+
+def export_lines(dataset, export_format, rows):
+    """Renders rows of a dataset as CSV lines (with header) or NDJSON lines."""
+    if export_format == 'csv':
+        return csv_lines(rows, dataset.fields)
+    return ndjson_lines(rows)
+
+
+def write_export(dataset, stream, export_format, queryset=None, chunk_size=2000):
+    """Writes a dataset to a text stream line by line. Returns the number of exported rows."""
+    count = 0
+
+    def counted(rows):
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    for line in export_lines(dataset, export_format, counted(export_rows(dataset, queryset, chunk_size))):
+        stream.write(line)
+    return count
+
+
+def export_response(dataset_name, queryset, export_format):
+    """Streams the given rows of a dataset as a file download (used by the admin actions)."""
+    dataset = get_dataset(dataset_name)
+    return streaming_export_response(
+        export_rows(dataset, queryset), export_format, fieldnames=dataset.fields, filename=dataset_name,
+    )
+
+
+# Import
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_rows(stream, import_format):
+    """Yields `(line_number, row)` pairs from a CSV (with header) or NDJSON text stream."""
+    if import_format == 'csv':
+        for line_number, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_number, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if line.strip():
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f'Line {line_number} is not valid JSON: {error}')
+
+
+def _to_python(model_field, value):
+    """Converts a raw CSV/NDJSON value; empty CSV cells of non-text columns become NULL."""
+    if value == '' and not isinstance(model_field, (models.CharField, models.TextField)):
+        return None
+    if isinstance(model_field, models.JSONField) and isinstance(value, str):
+        return json.loads(value)
+    if isinstance(model_field, models.DecimalField) and isinstance(value, float):
+        # NDJSON exports write decimals as JSON numbers; the shortest repr keeps the exact cents.
+        value = repr(value)
+    if isinstance(model_field, models.FileField):
+        return value or ''
+    return model_field.to_python(value)
+
+
+def build_instances(dataset, rows, errors):
+    """
+    Converts and validates a batch of rows.
+
+    Field values are validated per row with `clean_fields()`, while foreign keys and unique
+    constraints are checked for the whole batch with one query per relation or constraint
+    instead of one per row. Invalid rows are reported in `errors` as `(line_number, message)` and skipped.
+
+    Returns:
+        list: `(line_number, instance)` pairs of the valid rows.
+    """
+    model = dataset.model
+    model_fields = {name: model._meta.get_field(name) for name in dataset.import_fields}
+    relations = [model_field for model_field in model_fields.values() if model_field.is_relation]
+    instances = []
+    for line_number, row in rows:
+        unknown = set(row) - set(dataset.fields)
+        missing = set(dataset.import_fields) - set(row) - {dataset.pk_name}
+        if unknown or missing:
+            errors.append((line_number, f"Unknown columns: {', '.join(sorted(unknown))}" if unknown
+                           else f"Missing columns: {', '.join(sorted(missing))}"))
+            continue
+        try:
+            values = {name: _to_python(model_field, row[name]) for name, model_field in model_fields.items() if name in row}
+            instance = model(**values)
+            # Relations are checked below for the whole batch; other fields not being imported are left alone.
+            instance.clean_fields(exclude=[
+                model_field.name for model_field in model._meta.fields
+                if model_field.is_relation or model_field.attname not in dataset.import_fields
+            ])
+        except (ValidationError, ValueError, TypeError) as error:
+            messages = error.message_dict if hasattr(error, 'message_dict') else str(error)
+            errors.append((line_number, str(messages)))
+            continue
+        instances.append((line_number, instance))
+
+    for relation in relations:
+        ids = {getattr(instance, relation.attname) for _, instance in instances} - {None}
+        existing = set(relation.related_model._default_manager.filter(pk__in=ids).values_list('pk', flat=True))
+        valid = []
+        for line_number, instance in instances:
+            value = getattr(instance, relation.attname)
+            if value is None and not relation.null:
+                errors.append((line_number, f'{relation.attname} is required.'))
+            elif value is not None and value not in existing:
+                errors.append((line_number, f'{relation.attname} {value} does not exist.'))
+            else:
+                valid.append((line_number, instance))
+        instances = valid
+
+    for fields in _unique_field_sets(dataset):
+        instances = _check_unique(model, dataset.pk_name, fields, instances, errors)
+    return instances
+
+
+def _unique_field_sets(dataset):
+    """Returns the attnames of the model's unconditional unique constraints whose columns are all imported."""
+    model = dataset.model
+    field_sets = []
+    for constraint in model._meta.constraints:
+        if not isinstance(constraint, models.UniqueConstraint) or not constraint.fields or constraint.condition is not None:
+            continue
+        attnames = tuple(model._meta.get_field(name).attname for name in constraint.fields)
+        if set(attnames) <= set(dataset.import_fields):
+            field_sets.append(attnames)
+    return field_sets
+
+
+def _check_unique(model, pk_name, fields, instances, errors):
+    # One query finds stored rows that may hold the same values; the exact tuples are compared here.
+    stored = {}
+    if instances:
+        lookups = {f'{name}__in': {getattr(instance, name) for _, instance in instances} for name in fields}
+        for row in model._default_manager.filter(**lookups).values_list(pk_name, *fields):
+            stored[row[1:]] = row[0]
+    seen, valid = set(), []
+    for line_number, instance in instances:
+        values = tuple(getattr(instance, name) for name in fields)
+        pk = getattr(instance, pk_name)
+        if values in seen or values in stored and stored[values] != pk:
+            described = ', '.join(f'{name} {value}' for name, value in zip(fields, values))
+            errors.append((line_number, f'A row with {described} already exists.'))
+            continue
+        seen.add(values)
+        valid.append((line_number, instance))
+    return valid
+
+
+def save_batch(dataset, instances):
+    """
+    Writes a validated batch with one `bulk_create` for new rows and `bulk_update` for changed ones.
+
+    Existing rows are compared with their stored values first: unchanged rows are skipped and
+    only the columns that changed in the batch are written.
+
+    Returns:
+        tuple: The created and the updated instances, and the previous values of the updated rows.
+    """
+    model, pk_name = dataset.model, dataset.pk_name
+    pks = {getattr(instance, pk_name) for instance in instances} - {None}
+    existing = {row[pk_name]: row for row in model.objects.filter(pk__in=pks).values(*dataset.import_fields)}
+    created, updated, previous, changed_fields = [], [], {}, set()
+    for instance in instances:
+        stored = existing.get(getattr(instance, pk_name))
+        if stored is None:
+            created.append(instance)
+            continue
+        changed = [name for name in dataset.import_fields if getattr(instance, name) != stored[name]]
+        if changed:
+            updated.append(instance)
+            previous[stored[pk_name]] = stored
+            changed_fields.update(changed)
+    if created:
+        model.objects.bulk_create(created)
+    if updated:
+        model.objects.bulk_update(
+            updated, [model._meta.get_field(name).name for name in sorted(changed_fields)], batch_size=UPDATE_BATCH_SIZE,
+        )
+    return created, updated, previous
+
+
+def import_rows(dataset, rows, batch_size=1000, dry_run=False, progress=None):
+    """
+    Imports `(line_number, row)` pairs in batches; every batch is validated and written in its own transaction.
+
+    Existing rows (by primary key) are updated, the others created. Derived data is refreshed per
+    batch by the dataset's `after_import` hook. With `dry_run` the rows are only validated.
+    `progress` is called with the `ImportResult` after every batch.
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+    explicit_pks = False
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        result.rows += len(batch)
+        instances = [instance for _, instance in build_instances(dataset, batch, result.errors)]
+        if instances and not dry_run:
+            explicit_pks = explicit_pks or any(getattr(instance, dataset.pk_name) for instance in instances)
+            with transaction.atomic():
+                created, updated, previous = save_batch(dataset, instances)
+                if dataset.after_import:
+                    dataset.after_import(created + updated, previous)
+            result.created += len(created)
+            result.updated += len(updated)
+            result.unchanged += len(instances) - len(created) - len(updated)
+        result.seconds = time.perf_counter() - started
+        if progress:
+            progress(result)
+    result.errors.sort(key=lambda error: error[0])
+    if explicit_pks and dataset.model._meta.pk.get_internal_type() in ('AutoField', 'BigAutoField'):
+        reset_sequences(dataset.model)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def reset_sequences(model):
+    """Moves the primary key sequence past imported ids (PostgreSQL; SQLite needs nothing)."""
+    statements = connection.ops.sequence_reset_sql(no_style(), [model])
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def delete_rows(model, pks, batch_size=500):
+    """
+    Deletes the rows with the given primary keys with plain `DELETE ... WHERE pk IN (...)` statements.
+
+    Unlike `QuerySet.delete()`, no rows are loaded, no `pre_delete`/`post_delete` signals are sent
+    and no cascades are collected. Callers use it where skipping the signals is correct (the derived
+    data stays valid or goes away as well) and delete dependent rows themselves.
+    `pks` may be any iterable or a `values_list('pk', flat=True)` queryset of `model`; either is
+    consumed `batch_size` keys at a time.
+    Returns the number of deleted rows.
+    """
+    table, column = connection.ops.quote_name(model._meta.db_table), connection.ops.quote_name(model._meta.pk.column)
+    if isinstance(pks, models.QuerySet):
+        # The query runs again for every batch and the deleted rows drop out of it, so neither all
+        # primary keys nor an open cursor on the table being deleted from are held.
+        batches = iter(lambda: list(pks.all()[:batch_size]), [])
+    else:
+        pks = iter(pks)
+        batches = iter(lambda: list(itertools.islice(pks, batch_size)), [])
+    deleted = 0
+    with connection.cursor() as cursor:
+        for batch in batches:
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({", ".join(["%s"] * len(batch))})', batch)
+            deleted += cursor.rowcount
+    return deleted
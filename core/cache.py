@@ -0,0 +1,131 @@
+import hashlib
+import json
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def get_versions(keys, alias='default'):
+    """
+    Returns the current values of the given version keys, creating missing ones.
+
+    A version that was evicted from the cache gets a new random value, so entries built
+    with its previous value can never be served again.
+    """
+    cache = caches[alias]
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        for key, value in missing.items():
+            # add() keeps a value another process created in the meantime.
+            if not cache.add(key, value, None):
+                value = cache.get(key, value)
+            versions[key] = value
+    return [versions[key] for key in keys]
+
+
+def bump_versions(keys, alias='default'):
+    """
+    Gives the version keys new values right away and again once the current transaction commits.
+
+    Every cache entry built with the old values becomes unreachable (and expires on its own).
+    The first bump makes the change visible to the writing connection itself; the second one
+    drops what concurrent requests cached from the not yet committed state in between.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return
+
+    def bump():
+        caches[alias].set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+    bump()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump)
+
+
+class CachedResponseMixin:
+    """
+    Caches the data of successful `list`/`retrieve` responses under versioned keys and answers
+    conditional requests (`If-None-Match`) with 304.
+
+    The key covers the view, the absolute URL (the data contains absolute links), the sorted
+    query parameters and the current values of the version keys: `cache_version_keys`, or for
+    keys that depend on the request, the result of an overridden `get_cache_versions`. A view
+    must provide one of them, which is checked when the class is defined. Writers invalidate
+    entries by bumping those versions (`bump_versions`).
+    Permission checks run before the handler, so cached data is only served to permitted users;
+    it must therefore not depend on the requesting user.
+
+    Attributes:
+        cache_version_keys (list): Version keys every response of the view depends on.
+        cache_alias (str): Cache used for entries and versions.
+        cache_timeout (int): Seconds an entry lives at most (default: `RESPONSE_CACHE_TIMEOUT`).
+        cache_control (dict): Arguments for `patch_cache_control` of the response.
+    """
+    cache_version_keys = None
+    cache_alias = 'default'
+    cache_timeout = None
+    cache_control = {'private': True, 'no_cache': True}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        keys = cls.cache_version_keys
+        if keys is None:
+            if cls.get_cache_versions is CachedResponseMixin.get_cache_versions:
+                raise ImproperlyConfigured(f'{cls.__name__} must set cache_version_keys or override get_cache_versions().')
+        elif isinstance(keys, str) or not all(isinstance(key, str) for key in keys):
+            raise ImproperlyConfigured(f'{cls.__name__}.cache_version_keys must be a list of strings.')
+
+    def get_cache_versions(self):
+        """Returns the version keys the response depends on (by default `cache_version_keys`)."""
+        return list(self.cache_version_keys)
+
+    def is_cacheable(self, request):
+        """Returns False for requests whose responses should be built without the cache."""
+        return True
+
+    def get_cache_key(self, request, versions):
+        query = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+        source = json.dumps([type(self).__name__, request.build_absolute_uri(request.path), query, versions])
+        return f'response:{type(self).__name__}:{hashlib.md5(source.encode()).hexdigest()}'
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+        cache = caches[self.cache_alias]
+        # Read the versions before the data, so data read concurrently with a change is stored under the old version.
+        key = self.get_cache_key(request, get_versions(self.get_cache_versions(), self.cache_alias))
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            content = json.dumps(response.data, cls=JSONEncoder, sort_keys=True)
+            entry = {'data': response.data, 'etag': hashlib.md5(content.encode()).hexdigest()}
+            timeout = self.cache_timeout if self.cache_timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+            cache.set(key, entry, timeout)
+            response['X-Cache'] = 'MISS'
+        else:
+            response = Response(entry['data'])
+            response['X-Cache'] = 'HIT'
+        etag = quote_etag(entry['etag'])
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['X-Cache'] = response['X-Cache']
+            response = not_modified
+        response['ETag'] = etag
+        patch_cache_control(response, **self.cache_control)
+        return response
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.urls import URLResolver, get_resolver
+from core.cache import CachedResponseMixin
+
+PROCESS_LOCAL_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+def cached_views(patterns=None):
+    """Yields the routed view classes that use `CachedResponseMixin`, in URL order."""
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            yield from cached_views(pattern.url_patterns)
+            continue
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if view_class is not None and issubclass(view_class, CachedResponseMixin):
+            yield view_class
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_response_cache(app_configs, **kwargs):
+    """
+    Warns when cached API views run on the per-process local-memory cache without DEBUG.
+
+    Version bumps then only reach the worker that handled the write, so the other Gunicorn
+    workers keep serving stale offers, profile directories and review pages until the entries expire.
+    """
+    if settings.DEBUG:
+        return []
+    views = {}
+    for view_class in cached_views():
+        if settings.CACHES[view_class.cache_alias]['BACKEND'] == PROCESS_LOCAL_CACHE:
+            views.setdefault(view_class.cache_alias, []).append(view_class.__name__)
+    return [
+        Warning(
+            f"{', '.join(dict.fromkeys(names))} cache responses in the local-memory cache '{alias}' with DEBUG off.",
+            hint='Each worker process keeps its own copy, so invalidations miss the other workers. '
+                 'Use a shared backend, e.g. DJANGO_CACHE_BACKEND=file.',
+            id='core.W001',
+        )
+        for alias, names in views.items()
+    ]
@@ -0,0 +1,21 @@
+from django.db.models import Func
+
+
+class BinaryCollate(Func):
+    """
+    Compares a text expression by its code points instead of the locale's collation rules.
+
+    Range conditions such as the prefix search of the profile directories are only exact under
+    such a collation, and an index can only serve them if it is declared on the same expression.
+    PostgreSQL uses the "C" collation; SQLite compares with BINARY by default, which is the same
+    order, so no clause is added there and existing expression indexes keep matching.
+    """
+    arity = 1
+    collation = 'C'
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        return f'{sql} COLLATE {connection.ops.quote_name(self.collation)}', params
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return compiler.compile(self.get_source_expressions()[0])
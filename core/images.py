@@ -0,0 +1,149 @@
+import hashlib
+import io
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.dispatch import Signal
+from PIL import Image, ImageOps, UnidentifiedImageError
+from tasks_app.services import enqueue
+
+# Processed images are stored under their content hash: images/<2 hex chars>/<sha256>.<ext>.
+IMAGE_PREFIX = 'images/'
+# File extension of the stored original per Pillow format; GIFs are stored as (still) PNGs.
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'png'}
+
+# Sent after an image field was switched to its processed version; receives `pk`, `field_name` and `name`.
+image_processed = Signal()
+
+
+def validate_image_upload(file):
+    """
+    Model field validator for uploaded images.
+
+    Checks the file size, that Pillow recognizes the file as one of `IMAGE_ALLOWED_FORMATS`
+    and that it stays below `IMAGE_MAX_PIXELS` (decompression bombs). Only the header is read;
+    already stored files are not checked again.
+    """
+    if getattr(file, '_committed', False):
+        return
+    if file.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+        raise ValidationError(f'The image must not be larger than {settings.IMAGE_MAX_UPLOAD_SIZE // (1024 * 1024)} MB.')
+    position = file.tell()
+    try:
+        with Image.open(file) as image:
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise ValidationError('Upload a valid image.')
+    finally:
+        file.seek(position)
+    if image_format not in settings.IMAGE_ALLOWED_FORMATS:
+        raise ValidationError(f'Unsupported image format. Allowed: {", ".join(settings.IMAGE_ALLOWED_FORMATS)}.')
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError('The image has too many pixels.')
+
+
+def is_processed(name):
+    """Returns True if the stored file is a processed, content-addressed image."""
+    return bool(name) and name.startswith(IMAGE_PREFIX)
+
+
+def variant_name(name, variant):
+    """Returns the storage name of a WebP variant of a processed image."""
+    return f"{name.rsplit('.', 1)[0]}-{variant}.webp"
+
+
+def _encode(image, image_format, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def _render_variant(image, size, crop):
+    if crop:
+        return ImageOps.fit(image, size, method=Image.Resampling.LANCZOS)
+    variant = image.copy()
+    variant.thumbnail(size, Image.Resampling.LANCZOS)
+    return variant
+
+
+def store_image(content):
+    """
+    Stores an uploaded image content-addressed together with its WebP variants.
+
+    The name is derived from the SHA-256 of the uploaded bytes, so identical uploads share
+    their files and are processed only once. The original is rotated according to its EXIF
+    orientation, stripped of metadata and downscaled to `IMAGE_MAX_DIMENSION`; the variants
+    of `IMAGE_VARIANTS` are generated from it. The original is written last, so its existence
+    marks a complete set.
+
+    Returns:
+        str: The storage name of the processed original.
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    with Image.open(io.BytesIO(content)) as image:
+        image_format = image.format
+        name = f'{IMAGE_PREFIX}{digest[:2]}/{digest}.{EXTENSIONS[image_format]}'
+        if default_storage.exists(name):
+            return name
+        image.seek(0)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA', 'P') else 'RGB')
+        image.thumbnail((settings.IMAGE_MAX_DIMENSION, settings.IMAGE_MAX_DIMENSION), Image.Resampling.LANCZOS)
+
+        for variant, options in settings.IMAGE_VARIANTS.items():
+            rendered = _render_variant(image, tuple(options['size']), options.get('crop', False))
+            data = _encode(rendered, 'WEBP', quality=settings.IMAGE_WEBP_QUALITY, method=4)
+            _save(variant_name(name, variant), data)
+
+        if image_format == 'JPEG':
+            data = _encode(image.convert('RGB'), 'JPEG', quality=85, optimize=True, progressive=True)
+        elif image_format == 'WEBP':
+            data = _encode(image, 'WEBP', quality=90)
+        else:
+            data = _encode(image, 'PNG', optimize=True)
+        _save(name, data)
+    return name
+
+
+def _save(name, data):
+    # Storage.save would pick another name for an existing file; a concurrent worker wrote the same content.
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(data))
+
+
+def process_image(model, pk, field_name, name):
+    """
+    Replaces the uploaded file `name` of a model instance by its processed version.
+
+    The field is only switched if it still holds `name`, so a newer upload that arrived in
+    the meantime is not overwritten. The uploaded file is deleted once no row refers to it.
+    """
+    if is_processed(name) or not default_storage.exists(name):
+        return
+    with default_storage.open(name, 'rb') as file:
+        processed = store_image(file.read())
+    manager = model._default_manager
+    if manager.filter(pk=pk, **{field_name: name}).update(**{field_name: processed}):
+        image_processed.send(sender=model, pk=pk, field_name=field_name, name=processed)
+    if not manager.filter(**{field_name: name}).exists():
+        default_storage.delete(name)
+
+
+def schedule_image_processing(instances, field_name):
+    """
+    Queues the processing of the newly uploaded images of `instances` as background tasks.
+
+    The tasks are written in the current transaction, so they run once the upload is
+    committed. The idempotency key makes saving the same upload again a no-op.
+    """
+    for instance in instances:
+        name = getattr(instance, field_name).name
+        if not name or is_processed(name):
+            continue
+        label = instance._meta.label
+        enqueue(
+            'images.process', args=[label, instance.pk, field_name, name],
+            idempotency_key=f'images.process:{label}:{instance.pk}:{field_name}:{name}',
+        )
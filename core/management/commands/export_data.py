@@ -0,0 +1,35 @@
+import sys
+import time
+from django.core.management.base import BaseCommand
+from core.bulk_io import DATASETS, EXPORT_FORMATS, get_dataset, write_export
+
+
+class Command(BaseCommand):
+    """
+    Streams a dataset (offers, offer_details, profiles, orders, reviews) to a CSV or NDJSON file.
+
+    Rows are read in primary key order through `QuerySet.iterator()` and written line by line,
+    so memory usage does not grow with the size of the table.
+    """
+    help = 'Exports offers, offer details, profiles, orders or reviews to CSV/NDJSON with bounded memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=list(DATASETS), help='Dataset to export.')
+        parser.add_argument('output', help='Target file, "-" for stdout.')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, help='File format (default: from the file extension, else ndjson).')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database at a time.')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        export_format = options['format'] or ('csv' if output.endswith('.csv') else 'ndjson')
+        dataset = get_dataset(options['dataset'])
+        started = time.perf_counter()
+        if output == '-':
+            write_export(dataset, sys.stdout, export_format, chunk_size=options['chunk_size'])
+            return
+        with open(output, 'w', newline='', encoding='utf-8') as stream:
+            count = write_export(dataset, stream, export_format, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {count} {options['dataset']} to {output} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)."
+        ))
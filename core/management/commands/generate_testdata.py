@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from core.testdata import TestDataConfig, delete_generated, generate
+
+
+class Command(BaseCommand):
+    """
+    Generates synthetic users, profiles, tokens, offers, orders and reviews for development and load tests.
+
+    Writes directly through the ORM with chunked `bulk_create`, so millions of rows take minutes
+    instead of hours. The data is deterministic for a given `--seed`. Popularity (which businesses
+    own the offers, which offers get ordered and reviewed) follows a Zipf distribution.
+    All generated users share the password given with `--password`.
+    """
+    help = 'Generates synthetic test data with chunked bulk inserts.'
+
+    def add_arguments(self, parser):
+        defaults = TestDataConfig()
+        parser.add_argument('--businesses', type=int, default=defaults.businesses, help='Number of business users.')
+        parser.add_argument('--customers', type=int, default=defaults.customers, help='Number of customer users.')
+        parser.add_argument('--offers', type=int, default=defaults.offers, help='Number of offers (three details each).')
+        parser.add_argument('--orders', type=int, default=defaults.orders, help='Number of orders.')
+        parser.add_argument('--reviews', type=int, default=defaults.reviews, help='Number of reviews (at most one per customer and business).')
+        parser.add_argument('--seed', type=int, default=defaults.seed, help='Random seed.')
+        parser.add_argument('--popularity-skew', type=float, default=defaults.popularity_skew, help='Zipf exponent of the popularity; 0 distributes evenly.')
+        parser.add_argument('--status-weights', default=','.join(map(str, defaults.status_weights)), help='Weights of the order statuses in_progress,completed,cancelled.')
+        parser.add_argument('--rating-mean', type=float, default=defaults.rating_mean, help='Average review rating.')
+        parser.add_argument('--rating-spread', type=float, default=defaults.rating_spread, help='Standard deviation of the ratings.')
+        parser.add_argument('--batch-size', type=int, default=defaults.batch_size, help='Rows per bulk insert.')
+        parser.add_argument('--workers', type=int, default=defaults.workers, help='Processes inserting orders and reviews in parallel.')
+        parser.add_argument('--prefix', default=defaults.prefix, help='Prefix of the generated usernames.')
+        parser.add_argument('--password', default=defaults.password, help='Password of all generated users.')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data with the same prefix first.')
+
+    def handle(self, *args, **options):
+        try:
+            status_weights = tuple(float(weight) for weight in options['status_weights'].split(','))
+        except ValueError:
+            raise CommandError('--status-weights must be three comma-separated numbers.')
+        if len(status_weights) != 3:
+            raise CommandError('--status-weights must be three comma-separated numbers.')
+
+        prefix = options['prefix']
+        if options['clear']:
+            deleted = delete_generated(prefix)
+            self.stdout.write(f'Deleted {deleted} rows of previously generated data.')
+        elif User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'Users with the prefix "{prefix}" already exist. Use --clear or another --prefix.')
+
+        config = TestDataConfig(
+            businesses=options['businesses'], customers=options['customers'], offers=options['offers'],
+            orders=options['orders'], reviews=options['reviews'], seed=options['seed'],
+            popularity_skew=options['popularity_skew'], status_weights=status_weights,
+            rating_mean=options['rating_mean'], rating_spread=options['rating_spread'],
+            batch_size=options['batch_size'], workers=options['workers'], prefix=prefix, password=options['password'],
+        )
+        created = generate(config, stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{count} {name.replace("_", " ")}' for name, count in created.items())
+        ))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.bulk_io import DATASETS, EXPORT_FORMATS, get_dataset, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    """
+    Imports a CSV or NDJSON file (as written by `export_data`) into a dataset.
+
+    Rows are validated and written in batches: one `bulk_create` for new rows and one
+    `bulk_update` for rows whose primary key already exists, each batch in its own transaction.
+    Invalid rows are reported with their line number and skipped. Offer summaries, the search
+    index, business rollups and caches are refreshed per batch.
+    """
+    help = 'Imports offers, offer details, profiles, orders or reviews from CSV/NDJSON with bulk writes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=list(DATASETS), help='Dataset to import.')
+        parser.add_argument('input', help='Source file.')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, help='File format (default: from the file extension, else ndjson).')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows validated and written per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the rows.')
+
+    def handle(self, *args, **options):
+        path = options['input']
+        import_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+
+        def progress(result):
+            self.stdout.write(f'\r{result.rows} rows ({result.rows_per_second:,.0f} rows/s)', ending='')
+            self.stdout.flush()
+
+        try:
+            with open(path, newline='', encoding='utf-8') as stream:
+                result = import_rows(
+                    get_dataset(options['dataset']), read_rows(stream, import_format),
+                    batch_size=options['batch_size'], dry_run=options['dry_run'], progress=progress,
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error))
+        self.stdout.write('')
+
+        for line_number, message in result.errors[:50]:
+            self.stderr.write(f'Line {line_number}: {message}')
+        if len(result.errors) > 50:
+            self.stderr.write(f'... and {len(result.errors) - 50} more invalid rows.')
+        summary = (
+            f'{result.rows} rows in {result.seconds:.1f}s ({result.rows_per_second:,.0f} rows/s): '
+            f'{result.created} created, {result.updated} updated, {result.unchanged} unchanged, {len(result.errors)} invalid'
+            + (' (dry run, nothing written)' if options['dry_run'] else '')
+        )
+        if result.errors:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from auth_app.models import UserProfile
+from core.images import IMAGE_PREFIX, process_image
+from offers_app.models import Offer
+
+IMAGE_FIELDS = [(Offer, 'image'), (UserProfile, 'file')]
+
+
+class Command(BaseCommand):
+    """
+    Processes offer and profile images that were uploaded before the image pipeline existed
+    or whose processing failed.
+
+    Every image is stored content-addressed with its WebP variants, exactly like a new upload.
+    """
+    help = 'Generates the processed originals and WebP variants of all unprocessed offer and profile images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Images processed in parallel.')
+
+    def handle(self, *args, **options):
+        jobs = [
+            (model, pk, field_name, name)
+            for model, field_name in IMAGE_FIELDS
+            for pk, name in model.objects.exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+            .exclude(**{f'{field_name}__startswith': IMAGE_PREFIX}).values_list('pk', field_name).iterator()
+        ]
+        started, failed = time.perf_counter(), 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = [executor.submit(self.process, *job) for job in jobs]
+            for done, (job, future) in enumerate(zip(jobs, futures), start=1):
+                if error := future.exception():
+                    failed += 1
+                    self.stderr.write(f'{job[0].__name__} {job[1]} ({job[3]}): {error}')
+                self.stdout.write(f'\r{done}/{len(jobs)} images', ending='')
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {len(jobs) - failed} images in {time.perf_counter() - started:.1f}s ({failed} failed).'
+        ))
+
+    def process(self, model, pk, field_name, name):
+        try:
+            process_image(model, pk, field_name, name)
+        finally:
+            connections.close_all()
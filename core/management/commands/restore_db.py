@@ -0,0 +1,48 @@
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.backup import BackupError, load_manifests, restore_backup
+
+
+class Command(BaseCommand):
+    """
+    Restores a backup written by `backup_db` into a database file.
+
+    Incremental backups are restored by replaying their chain on top of its full backup.
+    The result is compared with the checksum taken at backup time and checked with
+    `PRAGMA integrity_check` before it replaces the target. Stop the application before
+    restoring over the live database.
+    """
+    help = 'Restores a (full or incremental) backup written by backup_db.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', nargs='?', help='Database file to write.')
+        parser.add_argument('--dir', default=settings.BACKUP_DIR, help='Backup directory.')
+        parser.add_argument('--backup', help='Name of the backup to restore (default: the newest).')
+        parser.add_argument('--list', action='store_true', help='List the available backups instead of restoring.')
+        parser.add_argument('--force', action='store_true', help='Overwrite an existing target file.')
+
+    def handle(self, *args, **options):
+        manifests = load_manifests(options['dir'])
+        if options['list']:
+            for manifest in manifests:
+                self.stdout.write(
+                    f'{manifest.name}  {manifest.kind:<11}  {manifest.changed_pages:>8} pages  {manifest.size / 1024 / 1024:8.1f} MB'
+                )
+            return
+        if not options['target']:
+            raise CommandError('A target file is required.')
+        if not manifests:
+            raise CommandError(f"No backups found in {options['dir']}.")
+        target = Path(options['target'])
+        if target.exists() and not options['force']:
+            raise CommandError(f'{target} exists. Use --force to overwrite it.')
+
+        try:
+            manifest = restore_backup(options['dir'], options['backup'] or manifests[-1].name, target)
+        except BackupError as error:
+            raise CommandError(str(error))
+        # Stale WAL files of a previous database would be replayed over the restored one.
+        for suffix in ('-wal', '-shm'):
+            Path(f'{target}{suffix}').unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(f'Restored {manifest.name} ({manifest.created_at}) to {target}.'))
@@ -0,0 +1,178 @@
+import base64
+import heapq
+import json
+from collections import OrderedDict
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination ordered by one field plus a unique tiebreaker.
+
+    Instead of `OFFSET n` and a `COUNT(*)` per request, every page continues after the
+    (value, tiebreaker) position of the last row of the previous page, which is encoded
+    in an opaque cursor. The cost per page is therefore constant, independent of its depth.
+
+    Attributes:
+        page_size (int): Default number of rows per page.
+        page_size_query_param (str): Query parameter that lets clients pick a smaller or larger page.
+        max_page_size (int): Server-side upper bound for the page size.
+        cursor_query_param (str): Query parameter carrying the cursor of the next page.
+        ordering_param (str): Query parameter selecting the ordering (same as DRF's `OrderingFilter`).
+        ordering_fields (list): Orderable fields; each may be requested ascending or descending.
+        default_ordering (str): Ordering used when none or an unsupported one is requested.
+        tiebreaker (str): Unique field that makes the order total (usually the primary key).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering_param = 'ordering'
+    ordering_fields = ['created_at']
+    default_ordering = '-created_at'
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Returns one page of rows following the position encoded in the request's cursor."""
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Returns one page merged from several querysets sharing the ordering field and tiebreaker,
+        e.g. a table and its archive.
+
+        Every queryset contributes at most one page from the cursor position on, and the pages
+        are merged in order, so the cost per page stays constant. Tiebreakers must be unique
+        across the querysets and the ordering field must not be nullable.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        field_name, descending = self.ordering.lstrip('-'), self.ordering.startswith('-')
+
+        pages = []
+        for queryset in querysets:
+            field = queryset.model._meta.get_field(field_name)
+            queryset = queryset.order_by(*self.get_order_by(field, descending))
+            position = self.decode_cursor(request, field)
+            if position is not None:
+                queryset = queryset.filter(self.get_position_filter(field, descending, *position))
+            pages.append(list(queryset[:self.page_size + 1]))
+
+        if len(pages) == 1:
+            rows = pages[0]
+        else:
+            rows = list(heapq.merge(*pages, key=lambda row: self.get_position(row, field), reverse=descending))
+        rows = rows[:self.page_size + 1]
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = self.get_position(rows[-1], field) if self.has_next else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """Returns the requested page size, capped at `max_page_size`."""
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        """Returns the requested ordering if it is supported, otherwise the default ordering."""
+        for ordering in request.query_params.get(self.ordering_param, '').split(','):
+            ordering = ordering.strip()
+            if ordering.lstrip('-') in self.ordering_fields:
+                return ordering
+        return self.default_ordering
+
+    def get_order_by(self, field, descending):
+        """
+        Orders by the field and the tiebreaker in the same direction; NULLs of nullable fields come last.
+        The NULLS LAST modifier is only added for nullable fields, so other orderings can be served
+        directly by an index on (field, tiebreaker).
+        """
+        nulls_last = True if field.null else None
+        if descending:
+            return [F(field.name).desc(nulls_last=nulls_last), F(self.tiebreaker).desc()]
+        return [F(field.name).asc(nulls_last=nulls_last), F(self.tiebreaker).asc()]
+
+    def get_position_filter(self, field, descending, value, tiebreaker):
+        """
+        Builds the filter selecting all rows after the given (value, tiebreaker) position.
+
+        The redundant range condition on the field lets the database start an index scan
+        at the position instead of walking the index from its beginning.
+        """
+        after, after_or_equal = ('lt', 'lte') if descending else ('gt', 'gte')
+        tiebreaker_after = Q(**{f'{self.tiebreaker}__{after}': tiebreaker})
+        if value is None:
+            return Q(**{f'{field.name}__isnull': True}) & tiebreaker_after
+        condition = Q(**{f'{field.name}__{after_or_equal}': value}) & (
+            Q(**{f'{field.name}__{after}': value}) | (Q(**{field.name: value}) & tiebreaker_after)
+        )
+        if field.null:
+            condition |= Q(**{f'{field.name}__isnull': True})
+        return condition
+
+    def get_position(self, row, field):
+        value = getattr(row, field.attname)
+        return value, getattr(row, self.tiebreaker)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        value, tiebreaker = self.next_position
+        payload = {
+            'o': self.ordering,
+            'v': self.encode_value(value),
+            't': tiebreaker,
+        }
+        cursor = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def encode_value(value):
+        if value is None:
+            return None
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)
+
+    def decode_cursor(self, request, field):
+        """Decodes the cursor of the request into a (value, tiebreaker) position, or None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if payload['o'] != self.ordering:
+                raise ValueError('Cursor belongs to another ordering.')
+            value = None if payload['v'] is None else field.to_python(payload['v'])
+            return value, int(payload['t'])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework import serializers
+from core.images import is_processed, variant_name
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only field returning the URLs of the WebP variants of an image field.
+
+    Example: `{"thumbnail": "http://.../images/ab/ab12...-thumbnail.webp", "card": ..., "large": ...}`.
+    The names are derived from the stored file name, so no storage or database access is needed.
+    Returns None while the image is missing or still being processed.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value or not is_processed(value.name):
+            return None
+        request = self.context.get('request')
+        urls = {}
+        for variant in settings.IMAGE_VARIANTS:
+            url = value.storage.url(variant_name(value.name, variant))
+            urls[variant] = request.build_absolute_uri(url) if request is not None else url
+        return urls
@@ -19,14 +19,35 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Uploaded offer and profile images (see core/images.py): accepted formats and limits, the
+# longest edge of the stored original and the WebP variants generated from it.
+IMAGE_ALLOWED_FORMATS = ['JPEG', 'PNG', 'WEBP', 'GIF']
+IMAGE_MAX_UPLOAD_SIZE = int(os.environ.get('IMAGE_MAX_UPLOAD_SIZE', 10 * 1024 * 1024))
+IMAGE_MAX_PIXELS = int(os.environ.get('IMAGE_MAX_PIXELS', 40_000_000))
+IMAGE_MAX_DIMENSION = int(os.environ.get('IMAGE_MAX_DIMENSION', 2048))
+IMAGE_VARIANTS = {
+    'thumbnail': {'size': (160, 160), 'crop': True},
+    'card': {'size': (480, 360), 'crop': True},
+    'large': {'size': (1280, 1280), 'crop': False},
+}
+IMAGE_WEBP_QUALITY = int(os.environ.get('IMAGE_WEBP_QUALITY', 80))
+
+# Background tasks (tasks_app): 'queue' stores them for the `run_tasks` workers,
+# 'inline' runs them right after the commit in the request (tests, development without a worker).
+TASKS_MODE = os.environ.get('TASKS_MODE', 'queue')
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-41yyt$1i1659cb^acv3tp1=p%do_7!hq)vn_qk#dw+s#*ud@y8'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-41yyt$1i1659cb^acv3tp1=p%do_7!hq)vn_qk#dw+s#*ud@y8')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG also makes Django record every SQL query in memory, so production sets DJANGO_DEBUG=False.
+DEBUG = os.environ.get('DJANGO_DEBUG', 'True').lower() in ('1', 'true', 'yes')
+
+# Serve uploaded media files from the application server (disable when a reverse proxy serves MEDIA_ROOT).
+SERVE_MEDIA = os.environ.get('DJANGO_SERVE_MEDIA', 'True').lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = [
     '127.0.0.1',
@@ -34,7 +55,7 @@ ALLOWED_HOSTS = [
     '127.0.0.1:8000',
     '34.40.109.15',
     'api.coderr.henrik-petersen.de',
-]
+] + [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 # Application definition
 
@@ -54,11 +75,15 @@ INSTALLED_APPS = [
     'offers_app',
     'orders_app',
     'reviews_app',
+    'stats_app',
+    'tasks_app',
+    'core',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -98,15 +123,112 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
+# Clears the caches between tests (see core.testing.TestRunner).
+TEST_RUNNER = 'core.testing.TestRunner'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# DB_ENGINE selects the backend: 'sqlite' (default) or 'postgresql'.
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite').lower()
+
+if DB_ENGINE in ('postgres', 'postgresql'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'coderr'),
+            'USER': os.environ.get('DB_USER', 'coderr'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Check persistent connections before reuse, so a restarted database doesn't cause errors.
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('DB_POOL', 'False').lower() in ('1', 'true', 'yes'):
+        # psycopg connection pool shared by the threads of a worker (requires CONN_MAX_AGE = 0).
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+    else:
+        # Persistent connections: reuse a connection for up to CONN_MAX_AGE seconds instead of reconnecting per request.
+        DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+else:
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Wait for a locked database instead of failing with "database is locked".
+                'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000,
+                # Take the write lock when a transaction starts; deferred transactions that upgrade
+                # from a read to a write lock fail immediately under contention, ignoring the busy timeout.
+                'transaction_mode': 'IMMEDIATE',
+                # Applied on every new connection: WAL lets readers run concurrently with the writer,
+                # synchronous=NORMAL is durable in WAL mode, mmap and a larger page cache cut read syscalls.
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS};'
+                    f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))};"
+                    f"PRAGMA cache_size={int(os.environ.get('SQLITE_CACHE_SIZE', -65536))};"
+                    'PRAGMA temp_store=MEMORY;'
+                ),
+            },
+        }
+    }
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# The local-memory cache is private to each process, so signal-driven invalidations (cached responses,
+# base info, revoked tokens) would only reach one of several Gunicorn workers. Without DEBUG the
+# file-based cache, shared by all workers, is therefore the default; DJANGO_CACHE_BACKEND overrides it.
+if os.environ.get('DJANGO_CACHE_BACKEND', 'locmem' if DEBUG else 'file') == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', os.path.join(BASE_DIR, '.cache')),
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('DJANGO_CACHE_MAX_ENTRIES', 20000))},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'coderr',
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('DJANGO_CACHE_MAX_ENTRIES', 20000))},
+        }
     }
+
+# Seconds a cached API response lives at most (see core.cache.CachedResponseMixin); changes invalidate it earlier.
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+
+# Seconds the platform statistics of /api/base-info/ stay cached (they are also invalidated on every change).
+BASE_INFO_CACHE_TIMEOUT = int(os.environ.get('BASE_INFO_CACHE_TIMEOUT', 300))
+
+# Seconds browsers and CDNs may reuse /api/base-info/ before revalidating it with ETag / Last-Modified.
+BASE_INFO_HTTP_MAX_AGE = int(os.environ.get('BASE_INFO_HTTP_MAX_AGE', 60))
+
+
+# Token authentication cache (see auth_app.api.authentication.CachedTokenAuthentication).
+# LOCAL_TTL also bounds how long other worker processes may accept a revoked token.
+
+TOKEN_AUTH_CACHE = {
+    'LOCAL_MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'LOCAL_TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 30)),
+    'SHARED_CACHE': 'default',
+    'SHARED_TTL': int(os.environ.get('TOKEN_AUTH_SHARED_CACHE_TTL', 300)),
 }
 
 
@@ -145,7 +267,24 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
-STATIC_ROOT = '/home/petermann363/projects/Coderr-Backend/static/'
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', os.path.join(BASE_DIR, 'static'))
+
+# Target directory of `manage.py backup_db`.
+BACKUP_DIR = os.environ.get('DJANGO_BACKUP_DIR', os.path.join(BASE_DIR, 'backups'))
+
+# Finished (completed/cancelled) orders unchanged for this many days are moved to the archive table by `archive_orders`.
+ORDER_ARCHIVE_AFTER_DAYS = int(os.environ.get('ORDER_ARCHIVE_AFTER_DAYS', 180))
+
+# WhiteNoise serves the collected static files with far-future cache headers and pre-compressed variants.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -158,7 +297,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -0,0 +1,50 @@
+import csv
+import json
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class Echo:
+    """File-like object whose `write` returns the value instead of buffering it (used by `csv.writer`)."""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(rows):
+    """Yields one JSON document per row, each terminated by a newline."""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def csv_lines(rows, fieldnames):
+    """Yields a CSV header followed by one line per row; lists and dicts are written as JSON."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(fieldnames)
+    for row in rows:
+        yield writer.writerow([
+            json.dumps(value, cls=JSONEncoder) if isinstance(value, (list, dict)) else value
+            for value in (row.get(name) for name in fieldnames)
+        ])
+
+
+def streaming_export_response(rows, export_format, fieldnames, filename):
+    """
+    Wraps a row generator in a `StreamingHttpResponse` as NDJSON or CSV.
+
+    Rows are rendered lazily while the response is sent, so memory usage does not depend
+    on the number of exported rows as long as `rows` itself is a generator.
+
+    Args:
+        rows: Iterable of dicts.
+        export_format: 'ndjson' or 'csv'.
+        fieldnames: Column order for CSV exports.
+        filename: Download filename without extension.
+    """
+    if export_format == 'csv':
+        response = StreamingHttpResponse(csv_lines(rows, fieldnames), content_type='text/csv; charset=utf-8')
+    else:
+        response = StreamingHttpResponse(ndjson_lines(rows), content_type='application/x-ndjson; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
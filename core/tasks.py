@@ -0,0 +1,9 @@
+from django.apps import apps
+from core.images import process_image
+from tasks_app.services import task
+
+
+@task('images.process', max_attempts=3, retry_delay=30)
+def process_image_task(model_label, pk, field_name, name):
+    """Replaces an uploaded image by its processed version and generates its variants."""
+    process_image(apps.get_model(model_label), pk, field_name, name)
@@ -0,0 +1,353 @@
+import bisect
+import itertools
+import math
+import multiprocessing
+import random
+import sys
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import OutputWrapper
+from django.db import connection, connections, transaction
+from django.db.models import Q
+from rest_framework.authtoken.models import Token
+from auth_app.cache import invalidate_profile_directories
+from auth_app.models import UserProfile
+from core.bulk_io import delete_rows
+from offers_app.cache import invalidate_all_offer_caches
+from offers_app.models import Offer, OfferDetail
+from offers_app.search import index_offers
+from offers_app.services import refresh_offer_summaries
+from orders_app.models import Order
+from reviews_app.cache import invalidate_all_review_caches
+from reviews_app.models import Review
+from stats_app.services import invalidate_base_info, rebuild_business_stats
+
+OFFER_TYPES = ['basic', 'standard', 'premium']
+ORDER_STATUSES = ['in_progress', 'completed', 'cancelled']
+FEATURES = ['Design', 'Responsive layout', 'Source files', 'Support', 'Hosting setup', 'SEO', 'Unit tests', 'Documentation']
+CATEGORIES = [
+    ('Website', 'Design and development of a complete website.'),
+    ('Logo', 'Logo and brand identity design.'),
+    ('REST API', 'Backend API development with Django.'),
+    ('Online shop', 'Shop setup with payment integration.'),
+    ('Mobile app', 'Cross-platform mobile app development.'),
+    ('Data scraping', 'Scraping and data cleaning service.'),
+    ('WordPress', 'WordPress theme and plugin development.'),
+    ('SEO audit', 'Technical SEO audit with recommendations.'),
+]
+CENT = Decimal('0.01')
+CITIES = ['Berlin', 'Hamburg', 'Munich', 'Cologne', 'Frankfurt', 'Stuttgart', 'Leipzig', 'Dresden']
+
+
+@dataclass
+class TestDataConfig:
+    """
+    Volumes and distributions of the generated data.
+
+    Attributes:
+        businesses, customers, offers, orders, reviews: Number of rows to create.
+        seed: Seed of the random generator; the same seed and batch size always yield
+            the same data, however many `workers` insert it. API token keys are always random.
+        popularity_skew: Zipf exponent of the offer and business popularity. 0 spreads offers,
+            orders and reviews evenly, larger values concentrate them on the first businesses/offers.
+        status_weights: Relative weights of the order statuses in_progress, completed, cancelled.
+        rating_mean: Average review rating.
+        rating_spread: Standard deviation of the ratings around each business' own mean
+            (business means themselves vary by half that much).
+        batch_size: Rows per `bulk_create` (and per transaction).
+        workers: Processes that generate and insert orders and reviews in parallel.
+        prefix: Prefix of the generated usernames.
+        password: Password of all generated users.
+    """
+    businesses: int = 100
+    customers: int = 1000
+    offers: int = 1000
+    orders: int = 10000
+    reviews: int = 5000
+    seed: int = 42
+    popularity_skew: float = 1.0
+    status_weights: tuple = (2, 7, 1)
+    rating_mean: float = 4.2
+    rating_spread: float = 0.8
+    batch_size: int = 5000
+    workers: int = 1
+    prefix: str = 'test-'
+    password: str = 'test1234'
+
+
+class Progress:
+    """Prints the number of written rows and the rows per second of a phase, at most a few times per second."""
+
+    def __init__(self, label, total, stdout):
+        self.label, self.total, self.stdout = label, total, stdout
+        self.done, self.started, self.printed = 0, time.perf_counter(), 0.0
+
+    @property
+    def rate(self):
+        return self.done / max(time.perf_counter() - self.started, 1e-9)
+
+    def add(self, rows):
+        self.done += rows
+        now = time.perf_counter()
+        if now - self.printed > 0.5 or self.done >= self.total:
+            self.printed = now
+            self.stdout.write(f'\r{self.label}: {self.done}/{self.total} rows ({self.rate:,.0f} rows/s)', ending='')
+            self.stdout.flush()
+
+    def finish(self):
+        self.stdout.write(f'\r{self.label}: {self.done}/{self.total} rows ({self.rate:,.0f} rows/s)')
+
+
+def zipf_cum_weights(count, skew):
+    """Cumulative weights of a Zipf distribution over `count` ranks, for `random.choices`."""
+    return list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+def chunk_rng(config, phase, index):
+    """Random generator of one chunk; independent of the order in which chunks are processed."""
+    return random.Random(f'{config.seed}:{phase}:{index}')
+
+
+def chunks(total, size):
+    return [(index, start, min(start + size, total)) for index, start in enumerate(range(0, total, size))]
+
+
+def generate_users(config, kind, count, password, progress):
+    """Creates users with profiles and API tokens and returns their ids."""
+    ids = []
+    for index, start, end in chunks(count, config.batch_size):
+        rng = chunk_rng(config, kind, index)
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    username=f'{config.prefix}{kind}-{number}', email=f'{kind}-{number}@example.com',
+                    first_name=f'{kind.capitalize()}', last_name=str(number), password=password,
+                )
+                for number in range(start, end)
+            ])
+            UserProfile.objects.bulk_create([
+                UserProfile(
+                    user=user, type=kind, first_name=user.first_name, last_name=user.last_name,
+                    location=rng.choice(CITIES), tel=f'+49 30 {rng.randint(1000000, 9999999)}',
+                    description=f'Generated {kind} profile.', working_hours='9-17' if kind == 'business' else '',
+                )
+                for user in users
+            ])
+            # Only the data is reproducible from the seed; token keys are random so nobody can derive them.
+            Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users])
+        ids.extend(user.pk for user in users)
+        progress.add(3 * len(users))
+    return ids
+
+
+def generate_offers(config, business_ids, progress):
+    """
+    Creates offers with three detail tiers each and fills their summaries and search index.
+
+    Offers are assigned to businesses with the configured popularity skew.
+
+    Returns:
+        list: `(detail_id, business_id, price)` of every created detail.
+    """
+    business_weights = zipf_cum_weights(len(business_ids), config.popularity_skew)
+    details_info = []
+    for index, start, end in chunks(config.offers, max(1, config.batch_size // 4)):
+        rng = chunk_rng(config, 'offers', index)
+        owners = rng.choices(business_ids, cum_weights=business_weights, k=end - start)
+        with transaction.atomic():
+            offers = []
+            for number, owner in zip(range(start, end), owners):
+                title, description = rng.choice(CATEGORIES)
+                offers.append(Offer(user_id=owner, title=f'{title} #{number}', description=description))
+            offers = Offer.objects.bulk_create(offers)
+            details = []
+            for offer in offers:
+                price = Decimal(round(rng.lognormvariate(4.5, 0.6), 2)).quantize(CENT)
+                delivery_time = rng.randint(3, 21)
+                for position, offer_type in enumerate(OFFER_TYPES):
+                    details.append(OfferDetail(
+                        offer=offer, title=f'{offer_type.capitalize()} {offer.title}', revisions=2 + position * 3,
+                        delivery_time_in_days=delivery_time + position * 3, price=price,
+                        features=rng.sample(FEATURES, 2 + position * 2), offer_type=offer_type,
+                    ))
+                    price = (price * Decimal(rng.uniform(1.5, 2.5))).quantize(CENT)
+            details = OfferDetail.objects.bulk_create(details)
+            offer_ids = [offer.pk for offer in offers]
+            refresh_offer_summaries(offer_ids)
+            index_offers(offer_ids)
+        details_info.extend((detail.pk, detail.offer.user_id, detail.price) for detail in details)
+        progress.add(len(offers) + len(details))
+    return details_info
+
+
+# State shared with forked worker processes (set before the pool is created).
+_shared = {}
+
+
+def _generate_orders_chunk(task):
+    index, start, end = task
+    config, details, weights, customer_ids = (
+        _shared['config'], _shared['details'], _shared['detail_weights'], _shared['customer_ids'],
+    )
+    rng = chunk_rng(config, 'orders', index)
+    picked = rng.choices(details, cum_weights=weights, k=end - start)
+    statuses = rng.choices(ORDER_STATUSES, weights=config.status_weights, k=end - start)
+    with transaction.atomic():
+        Order.objects.bulk_create([
+            Order(
+                customer_user_id=rng.choice(customer_ids), business_user_id=business_id,
+                offer_detail_id=detail_id, price=price, status=order_status,
+            )
+            for (detail_id, business_id, price), order_status in zip(picked, statuses)
+        ])
+    return end - start
+
+
+def _generate_reviews_chunk(task):
+    """Creates the reviews of a range of reviewers; every reviewer rates distinct businesses."""
+    index, start, end = task
+    config, customer_ids, business_ids, weights, business_means = (
+        _shared['config'], _shared['customer_ids'], _shared['business_ids'],
+        _shared['business_weights'], _shared['business_means'],
+    )
+    rng = chunk_rng(config, 'reviews', index)
+    per_reviewer = _shared['reviews_per_reviewer']
+    reviews = []
+    for position in range(start, end):
+        reviewer_id = customer_ids[position]
+        count = min(per_reviewer, _shared['reviews'] - position * per_reviewer)
+        if count > len(business_ids) // 2:
+            # Rejection sampling of a skewed distribution gets slow close to all businesses.
+            rated = rng.sample(range(len(business_ids)), count)
+        else:
+            rated = set()
+            while len(rated) < count:
+                rated.add(bisect.bisect_left(weights, rng.random() * weights[-1]))
+        for business_index in sorted(rated):
+            rating = round(rng.gauss(business_means[business_index], config.rating_spread))
+            reviews.append(Review(
+                business_user_id=business_ids[business_index], reviewer_id=reviewer_id,
+                rating=min(5, max(1, rating)), description=rng.choice(['Great work.', 'Fast delivery.', 'Good value.', 'As described.', 'Could be better.']),
+            ))
+    with transaction.atomic():
+        Review.objects.bulk_create(reviews, batch_size=config.batch_size)
+    return len(reviews)
+
+
+def _init_worker():
+    """Lets SQLite writers queue for the database lock instead of giving up after the default busy timeout."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout = 600000')
+
+
+def _run_chunks(function, tasks, workers, progress):
+    """Runs the chunk tasks in the current process or fans them out to forked workers."""
+    if workers > 1 and len(tasks) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        # Children must open their own database connections.
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers, initializer=_init_worker) as pool:
+            for rows in pool.imap_unordered(function, tasks):
+                progress.add(rows)
+        return
+    for task in tasks:
+        progress.add(function(task))
+
+
+def generate(config, stdout=None):
+    """
+    Generates users, profiles, tokens, offers with details, orders and reviews.
+
+    All rows are written with chunked `bulk_create` calls, bypassing the per-row signals.
+    The derived data (offer summaries, search index, business rollups, /base-info/ cache)
+    is rebuilt explicitly. Returns the number of created rows per model.
+    """
+    stdout = stdout if isinstance(stdout, OutputWrapper) else OutputWrapper(stdout or sys.stdout)
+    password = make_password(config.password)
+    started = time.perf_counter()
+
+    progress = Progress('Users, profiles, tokens', 3 * (config.businesses + config.customers), stdout)
+    business_ids = generate_users(config, 'business', config.businesses, password, progress)
+    customer_ids = generate_users(config, 'customer', config.customers, password, progress)
+    progress.finish()
+
+    progress = Progress('Offers and details', 4 * config.offers, stdout)
+    details = generate_offers(config, business_ids, progress) if business_ids else []
+    progress.finish()
+
+    rng = random.Random(f'{config.seed}:popularity')
+    detail_order = list(range(len(details)))
+    rng.shuffle(detail_order)
+    _shared.update(
+        config=config,
+        business_ids=business_ids,
+        customer_ids=customer_ids,
+        details=[details[position] for position in detail_order],
+        detail_weights=zipf_cum_weights(len(details), config.popularity_skew),
+        business_weights=zipf_cum_weights(len(business_ids), config.popularity_skew),
+        business_means=[
+            min(5.0, max(1.0, rng.gauss(config.rating_mean, config.rating_spread / 2))) for _ in business_ids
+        ],
+    )
+    _shared['reviews'] = min(config.reviews, len(customer_ids) * len(business_ids))
+    _shared['reviews_per_reviewer'] = max(1, math.ceil(_shared['reviews'] / max(1, len(customer_ids))))
+    try:
+        orders = config.orders if details and customer_ids else 0
+        progress = Progress('Orders', orders, stdout)
+        _run_chunks(_generate_orders_chunk, chunks(orders, config.batch_size), config.workers, progress)
+        progress.finish()
+
+        reviews = _shared['reviews']
+        reviewers = math.ceil(reviews / _shared['reviews_per_reviewer']) if reviews else 0
+        reviewers_per_chunk = max(1, config.batch_size // _shared['reviews_per_reviewer'])
+        progress = Progress('Reviews', reviews, stdout)
+        _run_chunks(_generate_reviews_chunk, chunks(reviewers, reviewers_per_chunk), config.workers, progress)
+        progress.finish()
+    finally:
+        _shared.clear()
+
+    rebuild_business_stats(business_ids)
+    invalidate_base_info()
+    invalidate_all_offer_caches()
+    invalidate_profile_directories()
+    invalidate_all_review_caches()
+    created = {
+        'users': len(business_ids) + len(customer_ids),
+        'offers': config.offers if business_ids else 0,
+        'offer_details': len(details),
+        'orders': orders,
+        'reviews': reviews,
+    }
+    # Every user also has a profile and a token.
+    rows = sum(created.values()) + 2 * created['users']
+    elapsed = time.perf_counter() - started
+    stdout.write(f'Generated {rows} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)')
+    return created
+
+
+def delete_generated(prefix):
+    """
+    Deletes the users with the given username prefix and everything that belongs to them.
+
+    Orders, reviews and offer details are deleted with plain DELETE statements
+    (`core.bulk_io.delete_rows`) on purpose: their per-row signals would update rollups and
+    summaries of rows that are deleted anyway.
+    Returns the number of deleted rows.
+    """
+    users = User.objects.filter(username__startswith=prefix)
+    deleted = 0
+    for queryset in [
+        Order.objects.filter(Q(business_user__in=users) | Q(customer_user__in=users)),
+        Review.objects.filter(Q(business_user__in=users) | Q(reviewer__in=users)),
+        OfferDetail.objects.filter(offer__user__in=users),
+    ]:
+        deleted += delete_rows(queryset.model, queryset.values_list('pk', flat=True))
+    deleted += users.delete()[0]
+    invalidate_base_info()
+    invalidate_all_offer_caches()
+    invalidate_profile_directories()
+    invalidate_all_review_caches()
+    return deleted
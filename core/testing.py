@@ -0,0 +1,70 @@
+import re
+import unittest
+from django.core.cache import caches
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+class QueryPlanMixin:
+    """
+    Test mixin asserting that the SELECT statements of an endpoint are served by indexes.
+
+    Captures every query a request runs, asks SQLite for its `EXPLAIN QUERY PLAN` and fails
+    on full table scans (`SCAN <table>` without `USING ... INDEX`) of the given tables.
+    With `ordered=True` it also fails when SQLite needs a temporary B-tree to sort,
+    i.e. when the ORDER BY is not satisfied by an index.
+    """
+
+    def get_query_plans(self, method, *args, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(*args, **kwargs)
+        self.assertLess(response.status_code, 400, response.content)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        return plans
+
+    def assertUsesIndexes(self, url, tables, data=None, ordered=False, method='get'):
+        """Requests `url` and asserts that no captured query scans one of `tables` without an index."""
+        plans = self.get_query_plans(method, url, data)
+        checked = 0
+        for sql, plan in plans:
+            if not any(table in sql for table in tables):
+                continue
+            checked += 1
+            for step in plan:
+                match = FULL_SCAN.match(step)
+                if match and match.group(1) in tables:
+                    self.fail(f'Full table scan of {match.group(1)} for {url} {data or ""}:\n{sql}\n{plan}')
+            if ordered and 'ORDER BY' in sql and any('USE TEMP B-TREE FOR ORDER BY' in step for step in plan):
+                self.fail(f'ORDER BY not served by an index for {url} {data or ""}:\n{sql}\n{plan}')
+        self.assertGreater(checked, 0, f'No query touched {tables} for {url}')
+
+
+class CacheIsolatingResult(unittest.TextTestResult):
+    """Clears all caches before every test, like the database is reset."""
+
+    def startTest(self, test):
+        for cache in caches.all(initialized_only=True):
+            cache.clear()
+        super().startTest(test)
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner isolating tests from each other's cache entries.
+
+    Test transactions are rolled back, so entries cached by one test (responses, version keys,
+    tokens) would otherwise be served to the next one for rows that no longer exist.
+    """
+
+    def get_resultclass(self):
+        return super().get_resultclass() or CacheIsolatingResult
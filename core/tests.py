@@ -0,0 +1,274 @@
+import gzip
+import io
+import sqlite3
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.generics import ListAPIView
+from auth_app.models import UserProfile
+from core.cache import CachedResponseMixin
+from core.checks import check_shared_response_cache
+from core.backup import BackupError, create_backup, load_manifests, restore_backup, rotate_backups
+from core.images import store_image, validate_image_upload, variant_name
+from core.bulk_io import delete_rows, get_dataset, import_rows, read_rows, write_export
+from core.testdata import TestDataConfig, delete_generated, generate
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from reviews_app.models import Review
+from stats_app.models import BusinessStats
+
+
+def snapshot():
+    return (
+        list(Order.objects.order_by('pk').values_list('customer_user__username', 'offer_detail__title', 'price', 'status')),
+        list(Review.objects.order_by('pk').values_list('reviewer__username', 'business_user__username', 'rating')),
+    )
+
+
+class GenerateTestDataTest(TestCase):
+
+    config = TestDataConfig(businesses=4, customers=12, offers=10, orders=50, reviews=40, batch_size=16)
+
+    def test_generates_requested_volumes_with_derived_data(self):
+        created = generate(self.config, stdout=io.StringIO())
+        self.assertEqual(created, {'users': 16, 'offers': 10, 'offer_details': 30, 'orders': 50, 'reviews': 40})
+        self.assertFalse(Offer.objects.filter(min_price__isnull=True).exists())
+        self.assertEqual(Review.objects.values('reviewer', 'business_user').distinct().count(), 40)
+        stats = BusinessStats.objects.all()
+        self.assertEqual(sum(row.review_count for row in stats), 40)
+        self.assertEqual(sum(row.in_progress_count + row.completed_count + row.cancelled_count for row in stats), 50)
+
+    def test_same_seed_generates_the_same_data(self):
+        generate(self.config, stdout=io.StringIO())
+        first = snapshot()
+        first_keys = set(Token.objects.values_list('key', flat=True))
+        delete_generated(self.config.prefix)
+        self.assertFalse(Order.objects.exists())
+        generate(self.config, stdout=io.StringIO())
+        self.assertEqual(snapshot(), first)
+        # Token keys must not be derivable from the seed.
+        self.assertFalse(first_keys & set(Token.objects.values_list('key', flat=True)))
+
+
+class BulkImportExportTest(TestCase):
+
+    def setUp(self):
+        generate(TestDataConfig(businesses=2, customers=5, offers=4, orders=20, reviews=6, batch_size=8), stdout=io.StringIO())
+
+    def export(self, name, export_format):
+        stream = io.StringIO()
+        count = write_export(get_dataset(name), stream, export_format, chunk_size=3)
+        stream.seek(0)
+        return count, stream
+
+    def test_export_and_reimport_restores_rows_and_rollups(self):
+        stats_before = list(BusinessStats.objects.order_by('pk').values_list('completed_count', 'total_revenue', 'review_count'))
+        for export_format in ['csv', 'ndjson']:
+            rows_before = list(Order.objects.order_by('pk').values_list('pk', 'offer_detail_id', 'price', 'status'))
+            count, stream = self.export('orders', export_format)
+            self.assertEqual(count, 20)
+            Order.objects.all().delete()
+            result = import_rows(get_dataset('orders'), read_rows(stream, export_format), batch_size=7)
+            self.assertEqual((result.rows, result.created, result.updated, result.errors), (20, 20, 0, []))
+            self.assertEqual(list(Order.objects.order_by('pk').values_list('pk', 'offer_detail_id', 'price', 'status')), rows_before)
+        self.assertEqual(list(BusinessStats.objects.order_by('pk').values_list('completed_count', 'total_revenue', 'review_count')), stats_before)
+
+    def test_import_updates_existing_rows_and_refreshes_derived_data(self):
+        _, stream = self.export('offer_details', 'csv')
+        lines = stream.getvalue().splitlines()
+        detail = OfferDetail.objects.order_by('pk').first()
+        rows = list(read_rows(io.StringIO('\n'.join(lines)), 'csv'))
+        rows[0][1]['price'] = '1.50'
+        result = import_rows(get_dataset('offer_details'), rows)
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 1, 11))
+        self.assertEqual(Offer.objects.get(pk=detail.offer_id).min_price, Decimal('1.50'))
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        rows = [
+            (1, {'business_user_id': 999999, 'reviewer_id': None, 'rating': 4, 'description': 'Unknown users'}),
+            (2, {'business_user_id': Review.objects.first().business_user_id, 'reviewer_id': Review.objects.first().reviewer_id, 'rating': 9, 'description': 'Out of range'}),
+            (3, {'rating': 4}),
+        ]
+        result = import_rows(get_dataset('reviews'), rows)
+        self.assertEqual([line for line, _ in result.errors], [1, 2, 3])
+        self.assertEqual(Review.objects.count(), 6)
+
+    def test_duplicate_review_pairs_are_reported_and_skipped(self):
+        stored = Review.objects.order_by('pk').first()
+        reviewed = set(Review.objects.values_list('reviewer_id', 'business_user_id'))
+        free = next(
+            (reviewer, business) for reviewer in UserProfile.objects.filter(type='customer').values_list('user_id', flat=True)
+            for business in UserProfile.objects.filter(type='business').values_list('user_id', flat=True)
+            if (reviewer, business) not in reviewed
+        )
+        rows = [
+            (1, {'reviewer_id': free[0], 'business_user_id': free[1], 'rating': 5, 'description': 'First'}),
+            (2, {'reviewer_id': free[0], 'business_user_id': free[1], 'rating': 1, 'description': 'Same pair in the file'}),
+            (3, {'reviewer_id': stored.reviewer_id, 'business_user_id': stored.business_user_id, 'rating': 2, 'description': 'Stored pair'}),
+            (4, {'id': stored.pk, 'reviewer_id': stored.reviewer_id, 'business_user_id': stored.business_user_id, 'rating': 1, 'description': 'Update'}),
+        ]
+        result = import_rows(get_dataset('reviews'), rows)
+        self.assertEqual([line for line, _ in result.errors], [2, 3])
+        self.assertEqual((result.created, result.updated), (1, 1))
+        self.assertEqual(Review.objects.get(reviewer_id=free[0], business_user_id=free[1]).description, 'First')
+        self.assertEqual(Review.objects.get(pk=stored.pk).rating, 1)
+
+
+    def test_delete_rows_deletes_querysets_and_iterables_in_batches(self):
+        # Seven batches of at most three orders: one SELECT and one DELETE each, plus the empty SELECT.
+        with self.assertNumQueries(15):
+            self.assertEqual(delete_rows(Order, Order.objects.values_list('pk', flat=True), batch_size=3), 20)
+        self.assertFalse(Order.objects.exists())
+        pks = (pk for pk in list(Review.objects.values_list('pk', flat=True)))
+        with self.assertNumQueries(2):
+            self.assertEqual(delete_rows(Review, pks, batch_size=4), 6)
+        self.assertFalse(Review.objects.exists())
+
+class CachedResponseMixinTest(SimpleTestCase):
+
+    def test_views_must_declare_their_version_keys(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'must set cache_version_keys'):
+            type('UnversionedView', (CachedResponseMixin, ListAPIView), {})
+        with self.assertRaisesMessage(ImproperlyConfigured, 'must be a list of strings'):
+            type('MisconfiguredView', (CachedResponseMixin, ListAPIView), {'cache_version_keys': 'things:version'})
+
+    def test_static_version_keys_are_used_by_default(self):
+        view = type('ThingsView', (CachedResponseMixin, ListAPIView), {'cache_version_keys': ('things:version',)})()
+        self.assertEqual(view.get_cache_versions(), ['things:version'])
+
+
+    def test_deploy_check_warns_about_process_local_response_caches(self):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/coderr'}}
+        with override_settings(DEBUG=False, CACHES=locmem):
+            warnings = check_shared_response_cache(None)
+        self.assertEqual([warning.id for warning in warnings], ['core.W001'])
+        self.assertIn('OfferListView', warnings[0].msg)
+        self.assertIn('ReviewsView', warnings[0].msg)
+        with override_settings(DEBUG=True, CACHES=locmem):
+            self.assertEqual(check_shared_response_cache(None), [])
+        with override_settings(DEBUG=False, CACHES=shared):
+            self.assertEqual(check_shared_response_cache(None), [])
+
+class BackupTest(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.database = self.directory / 'live.sqlite3'
+        self.backups = self.directory / 'backups'
+        with sqlite3.connect(self.database) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, value TEXT)')
+            connection.executemany('INSERT INTO item (value) VALUES (?)', [(f'value {n}' * 20,) for n in range(2000)])
+
+    def execute(self, sql):
+        with sqlite3.connect(self.database) as connection:
+            connection.execute(sql)
+
+    def rows(self, path):
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute('SELECT * FROM item ORDER BY id').fetchall()
+        finally:
+            connection.close()
+
+    def backup(self, **kwargs):
+        return create_backup(self.database, self.backups, **kwargs)
+
+    def test_incremental_chain_restores_every_state(self):
+        full = self.backup(incremental=True)
+        states = {full.name: self.rows(self.database)}
+        self.execute("UPDATE item SET value = 'changed' WHERE id <= 10")
+        first = self.backup(incremental=True)
+        states[first.name] = self.rows(self.database)
+        self.execute('DELETE FROM item WHERE id > 1000')
+        self.execute('VACUUM')
+        second = self.backup(incremental=True)
+        states[second.name] = self.rows(self.database)
+
+        self.assertEqual([full.kind, first.kind, second.kind], ['full', 'incremental', 'incremental'])
+        self.assertLess(first.changed_pages, full.changed_pages / 10)
+        for name, rows in states.items():
+            restore_backup(self.backups, name, self.directory / 'restored.sqlite3')
+            self.assertEqual(self.rows(self.directory / 'restored.sqlite3'), rows)
+
+    def test_backup_runs_next_to_an_open_write_transaction(self):
+        writer = sqlite3.connect(self.database, isolation_level=None)
+        self.addCleanup(writer.close)
+        writer.execute('BEGIN IMMEDIATE')
+        writer.execute("INSERT INTO item (value) VALUES ('uncommitted')")
+        before = self.rows(self.database)
+        # The copy reads a snapshot; a write committed while it runs neither blocks nor restarts it.
+        manifest = self.backup(progress=lambda remaining, total: writer.execute('COMMIT'))
+        restore_backup(self.backups, manifest.name, self.directory / 'restored.sqlite3')
+        self.assertEqual(self.rows(self.directory / 'restored.sqlite3'), before)
+        self.assertEqual(len(self.rows(self.database)), len(before) + 1)
+
+    def test_damaged_backup_is_not_restored(self):
+        self.backup()
+        self.execute("UPDATE item SET value = 'changed' WHERE id = 1")
+        incremental = self.backup(incremental=True)
+        with gzip.open(incremental.path(self.backups), 'ab') as file:
+            file.write(b'\0' * 16)
+        with self.assertRaises(BackupError):
+            restore_backup(self.backups, incremental.name, self.directory / 'restored.sqlite3')
+        self.assertFalse((self.directory / 'restored.sqlite3').exists())
+
+    def test_rotation_keeps_the_newest_chains(self):
+        chains = []
+        for _ in range(3):
+            chains.append([self.backup().name, self.backup(incremental=True).name])
+        self.assertEqual(rotate_backups(self.backups, keep=2), chains[0])
+        self.assertEqual([manifest.name for manifest in load_manifests(self.backups)], chains[1] + chains[2])
+        self.assertEqual(len(list(self.backups.glob('db-*.gz'))), 4)
+
+
+def image_bytes(size=(3000, 2000), image_format='JPEG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (20, 120, 220)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class ImageProcessingTest(SimpleTestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name, IMAGE_MAX_DIMENSION=1000)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_original_is_downscaled_and_variants_are_generated(self):
+        name = store_image(image_bytes())
+        self.assertRegex(name, r'^images/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+        with default_storage.open(name) as file:
+            self.assertEqual(Image.open(file).size, (1000, 667))
+        for variant, size in [('thumbnail', (160, 160)), ('card', (480, 360)), ('large', (1000, 667))]:
+            with default_storage.open(variant_name(name, variant)) as file:
+                image = Image.open(file)
+                self.assertEqual((image.format, image.size), ('WEBP', size))
+
+    def test_identical_uploads_share_their_files(self):
+        content = image_bytes(size=(400, 300), image_format='PNG')
+        name = store_image(content)
+        modified = default_storage.get_modified_time(name)
+        self.assertEqual(store_image(content), name)
+        self.assertEqual(default_storage.get_modified_time(name), modified)
+        self.assertEqual(len(default_storage.listdir(name.rsplit('/', 1)[0])[1]), 4)
+
+    def test_validation_rejects_invalid_and_oversized_uploads(self):
+        validate_image_upload(SimpleUploadedFile('photo.jpg', image_bytes(size=(100, 100))))
+        with self.assertRaises(ValidationError):
+            validate_image_upload(SimpleUploadedFile('photo.jpg', b'GIF89a broken'))
+        with override_settings(IMAGE_MAX_PIXELS=5000), self.assertRaises(ValidationError):
+            validate_image_upload(SimpleUploadedFile('photo.jpg', image_bytes(size=(100, 100))))
+        with override_settings(IMAGE_MAX_UPLOAD_SIZE=10), self.assertRaises(ValidationError):
+            validate_image_upload(SimpleUploadedFile('photo.jpg', image_bytes(size=(100, 100))))
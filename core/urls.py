@@ -15,8 +15,9 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+from django.views.static import serve
 from core import settings
 
 urlpatterns = [
@@ -30,3 +31,10 @@ urlpatterns = [
     path('api/', include('core.api_urls'))
 ] + staticfiles_urlpatterns()
 
+if settings.SERVE_MEDIA:
+    # Uploaded media files. `serve` returns a FileResponse, which the application server
+    # streams with sendfile; disable SERVE_MEDIA when a reverse proxy serves MEDIA_ROOT.
+    urlpatterns += [
+        re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    ]
+
@@ -0,0 +1,69 @@
+"""
+Gunicorn configuration for running the Coderr backend in production.
+
+Every value can be overridden with an environment variable, so the same file serves
+small VMs and larger containers:
+
+    GUNICORN_BIND           Address to bind (default: 0.0.0.0:8000).
+    GUNICORN_APP            'wsgi' (core.wsgi, default) or 'asgi' (core.asgi with uvicorn workers).
+    WEB_CONCURRENCY         Number of worker processes (default: 2 * CPUs + 1).
+    GUNICORN_THREADS        Threads per worker for the WSGI app (default: 4, uses gthread workers).
+    GUNICORN_TIMEOUT        Seconds before a silent worker is restarted (default: 30).
+    GUNICORN_MAX_REQUESTS   Requests after which a worker is recycled (default: 2000, 0 disables).
+    TASK_WORKERS            Background task worker processes started alongside (default: 1,
+                            0 when `manage.py run_tasks` runs elsewhere).
+
+Start with:
+
+    gunicorn -c gunicorn.conf.py
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+if os.environ.get('GUNICORN_APP', 'wsgi') == 'asgi':
+    wsgi_app = 'core.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'core.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = 5
+
+# Recycle workers periodically (with jitter, so they don't restart at once) to cap memory growth.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+# Load Django once in the master and fork workers from it.
+preload_app = True
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+# Background task workers (tasks_app) run as a separate `manage.py run_tasks` process.
+_task_workers = int(os.environ.get('TASK_WORKERS', 1))
+_task_process = None
+
+
+def when_ready(server):
+    global _task_process
+    if _task_workers > 0:
+        _task_process = subprocess.Popen(
+            [sys.executable, 'manage.py', 'run_tasks', '--processes', str(_task_workers)],
+            cwd=Path(__file__).resolve().parent,
+        )
+
+
+def on_exit(server):
+    if _task_process is not None:
+        # SIGTERM lets the workers finish their current task.
+        _task_process.terminate()
+        _task_process.wait(timeout=graceful_timeout)
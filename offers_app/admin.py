@@ -1,6 +1,7 @@
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
 from import_export import resources
+from core.admin import StreamingExportMixin
 from .models import Offer, OfferDetail
 
 class OfferResource(resources.ModelResource):
@@ -8,13 +9,15 @@ class OfferResource(resources.ModelResource):
         model = Offer
 
 @admin.register(Offer)
-class OfferAdmin(ImportExportModelAdmin):
+class OfferAdmin(StreamingExportMixin, ImportExportModelAdmin):
     resource_class = OfferResource
+    export_dataset = 'offers'
 
 class OfferDetailResource(resources.ModelResource):
     class Meta:
         model = OfferDetail
 
 @admin.register(OfferDetail)
-class OfferDetailAdmin(ImportExportModelAdmin):
-    resource_class = OfferDetailResource
\ No newline at end of file
+class OfferDetailAdmin(StreamingExportMixin, ImportExportModelAdmin):
+    resource_class = OfferDetailResource
+    export_dataset = 'offer_details'
@@ -1,5 +1,7 @@
 import django_filters
+from rest_framework import filters
 from offers_app.models import Offer
+from offers_app.search import search_offers
 
 class OfferFilter(django_filters.FilterSet):
     """
@@ -25,3 +27,20 @@ class OfferFilter(django_filters.FilterSet):
     def filter_max_delivery_time(self, queryset, name, value):
         return queryset.filter(min_delivery_time__lte=value)
 
+
+
+class OfferSearchFilter(filters.BaseFilterBackend):
+    """
+    Full-text search backend for offers, driven by the `search` query parameter.
+
+    Replaces DRF's `SearchFilter`, which turns every search into `icontains` scans.
+    Matching and relevance ranking are delegated to `offers_app.search.search_offers`.
+    An explicit `ordering` parameter still takes precedence over the relevance order.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        return search_offers(queryset, term)
@@ -1,14 +1,40 @@
 from rest_framework.pagination import PageNumberPagination
+from core.pagination import KeysetPagination
 
 class OfferPagination(PageNumberPagination):
     """
     Custom pagination for offers. Extends `PageNumberPagination` to allow pagination with a default page size
     and dynamic page size control via a query parameter.
-    
+
     Attributes:
         page_size (int): Default number of offers per page (set to 6).
         page_size_query_param (str): Query parameter ('page_size') to allow clients to set their own page size.
+        max_page_size (int): Upper bound for the client-controlled page size.
     """
-    
+
     page_size = 6
     page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Opt-in keyset pagination for infinite-scroll clients of the offer list.
+
+    Enabled with `?pagination=cursor` (or by passing a `cursor`). Supports the same orderings as the
+    offer list (`updated_at`, `min_price`, ascending or descending) with the offer id as tiebreaker,
+    skips the count query and caps the page size at `max_page_size`.
+    """
+    page_size = 6
+    max_page_size = 50
+    ordering_fields = ['updated_at', 'min_price']
+    default_ordering = '-updated_at'
+    mode_query_param = 'pagination'
+
+    @classmethod
+    def is_requested(cls, request):
+        """Returns True if the request opts into cursor pagination."""
+        return (
+            request.query_params.get(cls.mode_query_param) == 'cursor'
+            or cls.cursor_query_param in request.query_params
+        )
@@ -1,7 +1,59 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import transaction
 from django.urls import reverse
+from core.serializers import ImageVariantsField
+from offers_app.cache import invalidate_offer_cache
 from offers_app.models import Offer, OfferDetail
+from offers_app.services import create_offers, refresh_offer_summaries
+
+def apply_changes(instance, data):
+    """Sets the given attributes and returns the names of those whose value actually changed."""
+    changed = []
+    for attr, value in data.items():
+        if isinstance(value, File) or getattr(instance, attr) != value:
+            setattr(instance, attr, value)
+            changed.append(attr)
+    return changed
+
+
+def save_detail_changes(offer, changes, details_changed=False):
+    """
+    Applies `(detail, data)` changes in memory and writes all changed details with one `bulk_update`.
+
+    `bulk_update` sends no signals, so the stored min values of the offer are refreshed and the
+    cached responses of the changed details invalidated here. The search index and the cached
+    offer responses are handled by the `post_save` of the offer, see `save_offer_changes`.
+
+    Returns:
+        bool: Whether any detail of the offer changed (including `details_changed`).
+    """
+    changed_details, fields = [], set()
+    for detail, data in changes:
+        changed = apply_changes(detail, data)
+        if changed:
+            changed_details.append(detail)
+            fields.update(changed)
+    if changed_details:
+        OfferDetail.objects.bulk_update(changed_details, sorted(fields))
+        invalidate_offer_cache(detail_ids=[detail.pk for detail in changed_details])
+    if changed_details or details_changed:
+        refresh_offer_summaries([offer.pk])
+        return True
+    return False
+
+
+def save_offer_changes(offer, data, details_changed=False):
+    """
+    Saves only the changed offer fields; changed details count as a change of the offer.
+
+    Bumps `updated_at` and re-indexes the offer through its `post_save` signal.
+    """
+    changed = apply_changes(offer, data)
+    if changed or details_changed:
+        offer.save(update_fields=changed + ['updated_at'])
+
 
 class OfferDetailGetSerializer(serializers.ModelSerializer):
     """
@@ -38,12 +90,13 @@ class OfferGetSerializer(serializers.ModelSerializer):
     """
     details = OfferDetailGetSerializer(many=True)
     user_details = OfferUserSerializer(source='user')
+    image_variants = ImageVariantsField(source='image')
     min_price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
     min_delivery_time = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
 
 
 class OfferDetailSerializer(serializers.ModelSerializer):
@@ -59,6 +112,23 @@ class OfferDetailSerializer(serializers.ModelSerializer):
         }
 
 
+class OfferBulkSerializer(serializers.ListSerializer):
+    """
+    List serializer for creating a batch of offers, see `OfferBulkCreateView`.
+
+    Validates every offer with `OfferPostSerializer` and writes the batch in chunks of
+    `chunk_size` offers, each chunk in its own transaction.
+    """
+    chunk_size = 100
+
+    def create(self, validated_data):
+        """Creates the offers chunk by chunk; `save(user=...)` has already set the owner on every item."""
+        offers = []
+        for start in range(0, len(validated_data), self.chunk_size):
+            offers.extend(create_offers(validated_data[start:start + self.chunk_size]))
+        return offers
+
+
 class OfferPostSerializer(serializers.ModelSerializer):
     """
     Serializer for creating new offers, including validation for a minimum of three details per offer.
@@ -68,6 +138,7 @@ class OfferPostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details']
+        list_serializer_class = OfferBulkSerializer
 
     def validate_details(self, value):
         """Validates that an offer contains at least three details."""
@@ -76,32 +147,29 @@ class OfferPostSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        """Creates a new offer along with its associated details."""
-        details_data = validated_data.pop('details')
-        offer = Offer.objects.create(**validated_data)
-        for detail in details_data:
-            OfferDetail.objects.create(offer=offer, **detail)
-        return offer
+        """Creates a new offer along with its associated details in one transaction (one INSERT per table)."""
+        return create_offers([validated_data])[0]
 
     def update(self, instance, validated_data):
-        """Updates an existing offer and its details, ensuring a minimum of three details remain."""
+        """Updates an existing offer and its details atomically, ensuring a minimum of three details remain."""
         details_data = validated_data.pop('details', None)
-        instance = super().update(instance, validated_data)
-        if details_data:
-            if len(details_data) < 3:
-                raise serializers.ValidationError('An offer must have at least 3 details.')
-            for detail_data in details_data:
-                detail_id = detail_data.get('id')
-                if detail_id:
-                    try:
-                        offer_detail = instance.details.get(id=detail_id)
-                        for attr, value in detail_data.items():
-                            setattr(offer_detail, attr, value)
-                        offer_detail.save()
-                    except OfferDetail.DoesNotExist:
-                        raise serializers.ValidationError(f"OfferDetail with ID {detail_id} does not exist.")
-                else:
-                    OfferDetail.objects.create(offer=instance, **detail_data)
+        if details_data and len(details_data) < 3:
+            raise serializers.ValidationError('An offer must have at least 3 details.')
+        details = {detail.id: detail for detail in instance.details.all()}
+        changes, new_details = [], []
+        for detail_data in details_data or []:
+            detail_id = detail_data.get('id')
+            if not detail_id:
+                new_details.append(OfferDetail(offer=instance, **detail_data))
+            elif detail_id not in details:
+                raise serializers.ValidationError(f"OfferDetail with ID {detail_id} does not exist.")
+            else:
+                changes.append((details[detail_id], detail_data))
+        with transaction.atomic():
+            if new_details:
+                OfferDetail.objects.bulk_create(new_details)
+            save_detail_changes(instance, changes, details_changed=bool(new_details))
+            save_offer_changes(instance, validated_data, details_changed=bool(new_details) or bool(changes))
         return instance
 
 
@@ -116,26 +184,23 @@ class OfferSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'image', 'description', 'details']
 
     def update(self, instance, validated_data):
-        """Updates the offer and its related details, applying partial changes where provided."""
+        """Updates the offer and its related details atomically, applying partial changes where provided."""
         details_data = validated_data.pop('details', [])
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
+        details = {detail.offer_type: detail for detail in instance.details.all()}
+        changes = []
         for detail_data in details_data:
             offer_type = detail_data.get("offer_type")
-            try:
-                detail = instance.details.get(offer_type=offer_type)
-            except OfferDetail.DoesNotExist:
+            if offer_type not in details:
                 raise serializers.ValidationError(
                     {"details": f"No detail found for offer_type '{offer_type}'"}
                 )
+            changes.append((details[offer_type], {
+                attr: value for attr, value in detail_data.items() if attr not in ["offer_type"]
+            }))
 
-            for attr, value in detail_data.items():
-                if attr not in ["offer_type"]:
-                    setattr(detail, attr, value)
-            detail.save()
-
+        with transaction.atomic():
+            details_changed = save_detail_changes(instance, changes)
+            save_offer_changes(instance, validated_data, details_changed)
         return instance
 
 
@@ -144,9 +209,10 @@ class OfferDetailGetSerializer(serializers.ModelSerializer):
     Serializer for retrieving offer details along with the associated offer's basic information.
     """
     details = OfferDetailGetSerializer(read_only=True, many=True)
+    image_variants = ImageVariantsField(source='image')
     min_price = serializers.IntegerField()
     min_delivery_time = serializers.IntegerField()
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time']
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time']
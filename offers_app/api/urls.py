@@ -1,10 +1,13 @@
 from django.urls import path
-from offers_app.api.views import OfferListView, OfferView, OfferDetailView
+from offers_app.api.views import OfferListView, OfferBulkCreateView, OfferView, OfferDetailView
 
 urlpatterns = [
     # Maps 'offers/' to the OfferListView for a list of all available offers.
     path('offers/', OfferListView.as_view()),
 
+    # Maps 'offers/bulk/' to the OfferBulkCreateView for creating a batch of offers at once.
+    path('offers/bulk/', OfferBulkCreateView.as_view()),
+
     # Maps 'offers/<int:pk>/' to the OfferView.
     path('offers/<int:pk>/', OfferView.as_view(), name='offer'),
 
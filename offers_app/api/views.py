@@ -1,44 +1,55 @@
-from django.db.models import Min
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from rest_framework import generics
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.cache import CachedResponseMixin
 from .permissons import IsBusinessUser, IsOwner
-from .pagination import OfferPagination
-from .filters import OfferFilter
+from .pagination import OfferPagination, OfferCursorPagination
+from .filters import OfferFilter, OfferSearchFilter
+from offers_app.cache import ALL_VERSION, detail_version, list_versions, offer_version
 from offers_app.models import Offer, OfferDetail
 from offers_app.api.serializers import OfferGetSerializer, OfferPostSerializer, OfferDetailSerializer, OfferSerializer, OfferDetailGetSerializer
 
-class OfferListView(generics.ListCreateAPIView):
+class OfferListView(CachedResponseMixin, generics.ListCreateAPIView):
     """
     View for listing all offers and creating new ones.
 
+    List responses are cached per normalized URL (filters, ordering, search, page) and
+    revalidated by clients with `ETag`/`If-None-Match` (see `core.cache.CachedResponseMixin`).
+
     Attributes:
         queryset: Retrieves all offers.
-        pagination_class: Sets pagination for offers.
-        filter_backends: Specifies filters (search, ordering, etc.).
+        pagination_class: Sets pagination for offers (cursor pagination is opt-in, see `paginator`).
+        filter_backends: Specifies filters (full-text search ranked by relevance, ordering, etc.).
         filterset_class: Applies filtering to the offer data.
-        search_fields: Allows searching on title and description.
         ordering_fields: Enables ordering by updated_at and min_price.
+        cache_control: The list is public; clients revalidate it on every use.
     """
     queryset = Offer.objects.all()
     pagination_class = OfferPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter, filters.OrderingFilter]
     filterset_class = OfferFilter
-    search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price']
+    cache_control = {'public': True, 'no_cache': True}
+
+    def get_cache_versions(self):
+        """Lists filtered by creator only depend on that creator's offers."""
+        return list_versions(self.request.query_params.get('creator_id'))
 
     def get_queryset(self):
-        """Optimizes and annotates offers with min price and delivery time."""
-        return (
-            super().get_queryset()
-            .select_related('user')
-            .prefetch_related('details')
-            .annotate(
-                min_price=Min('details__price'),
-                min_delivery_time=Min('details__delivery_time_in_days'),
-            )
-        )
+        """Optimizes offers; min price and delivery time are read from their stored columns."""
+        return super().get_queryset().select_related('user').prefetch_related('details')
+
+    @property
+    def paginator(self):
+        """Uses keyset pagination when the client opts in, page number pagination otherwise."""
+        if not hasattr(self, '_paginator'):
+            if OfferCursorPagination.is_requested(self.request):
+                self._paginator = OfferCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def perform_create(self, serializer):
         """Associates the created offer with the current user."""
@@ -57,27 +68,54 @@ class OfferListView(generics.ListCreateAPIView):
         return [IsBusinessUser()]
 
 
-class OfferView(generics.RetrieveUpdateDestroyAPIView):
+class OfferBulkCreateView(generics.CreateAPIView):
+    """
+    View for creating a batch of offers with their details in one request.
+
+    Expects a JSON list of offers in the format of `POST /offers/`. The whole batch is validated
+    first; nothing is written if one offer is invalid. The offers are then inserted with
+    `bulk_create` in chunked transactions (see `OfferBulkSerializer`).
+
+    Attributes:
+        permission_classes: Only business users can create offers.
+        serializer_class: Validates each offer of the batch.
+        max_batch_size: Maximum number of offers per request.
+    """
+    permission_classes = [IsBusinessUser]
+    serializer_class = OfferPostSerializer
+    max_batch_size = 500
+
+    def get_serializer(self, *args, **kwargs):
+        """Validates the request body as a non-empty list of at most `max_batch_size` offers."""
+        kwargs.update(many=True, allow_empty=False, max_length=self.max_batch_size)
+        return super().get_serializer(*args, **kwargs)
+
+    def create(self, request, *args, **kwargs):
+        """Creates the offers and returns their ids instead of serializing every offer again."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        offers = serializer.save(user=request.user)
+        return Response({'count': len(offers), 'ids': [offer.pk for offer in offers]}, status=status.HTTP_201_CREATED)
+
+
+class OfferView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     View for retrieving, updating, and deleting a specific offer.
 
+    GET responses are cached until the offer or one of its details changes.
+
     Attributes:
         queryset: Retrieves all offers.
         serializer_class: The serializer for the offer data.
     """
     queryset = Offer.objects.all()
 
+    def get_cache_versions(self):
+        return [ALL_VERSION, offer_version(self.kwargs['pk'])]
+
     def get_queryset(self):
-        """Optimizes and annotates offers with related details."""
-        return (
-            super().get_queryset()
-            .select_related('user')
-            .prefetch_related('details')
-            .annotate(
-                min_price=Min('details__price'),
-                min_delivery_time=Min('details__delivery_time_in_days'),
-            )
-        )
+        """Optimizes offers with related details."""
+        return super().get_queryset().select_related('user').prefetch_related('details')
     
     def get_permissions(self):
         """Assigns permissions based on the HTTP method."""
@@ -94,10 +132,12 @@ class OfferView(generics.RetrieveUpdateDestroyAPIView):
         return OfferSerializer
 
 
-class OfferDetailView(generics.RetrieveAPIView):
+class OfferDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     """
     View for retrieving detailed information about a specific offer detail.
 
+    Responses are cached until the detail changes.
+
     Attributes:
         queryset: Retrieves all offer details.
         permission_classes: Requires authentication.
@@ -107,3 +147,6 @@ class OfferDetailView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = OfferDetailSerializer
 
+    def get_cache_versions(self):
+        return [ALL_VERSION, detail_version(self.kwargs['pk'])]
+
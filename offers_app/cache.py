@@ -0,0 +1,58 @@
+from decimal import Decimal, InvalidOperation
+from core.cache import bump_versions
+
+# Version keys of the cached offer responses (see core.cache.CachedResponseMixin):
+# every entry depends on ALL_VERSION plus the list, one creator's offers, one offer or one detail.
+ALL_VERSION = 'offers:version:all'
+LIST_VERSION = 'offers:version:list'
+
+
+def creator_version(user_id):
+    return f'offers:version:creator:{user_id}'
+
+
+def offer_version(offer_id):
+    return f'offers:version:offer:{offer_id}'
+
+
+def detail_version(detail_id):
+    return f'offers:version:detail:{detail_id}'
+
+
+def list_versions(creator_id=None):
+    """
+    Returns the version keys of an offer list response.
+
+    A list filtered by an integral `creator_id` only contains (and only depends on) the offers
+    of that creator, so it survives changes of other creators' offers.
+    """
+    try:
+        creator = Decimal(creator_id) if creator_id not in (None, '') else None
+    except (InvalidOperation, TypeError):
+        creator = None
+    if creator is not None and creator.is_finite() and creator == creator.to_integral_value():
+        return [ALL_VERSION, creator_version(int(creator))]
+    return [ALL_VERSION, LIST_VERSION]
+
+
+def invalidate_offer_cache(offer_ids=(), user_ids=(), detail_ids=()):
+    """
+    Invalidates the cached responses affected by changed offers and details after the commit.
+
+    Args:
+        offer_ids: Changed offers (their detail responses).
+        user_ids: Creators of the changed offers (their filtered lists). Any change also
+            invalidates the unfiltered lists.
+        detail_ids: Changed offer details (their `/offerdetails/<id>/` responses).
+    """
+    bump_versions(
+        [LIST_VERSION]
+        + [offer_version(offer_id) for offer_id in set(offer_ids)]
+        + [creator_version(user_id) for user_id in set(user_ids)]
+        + [detail_version(detail_id) for detail_id in set(detail_ids)]
+    )
+
+
+def invalidate_all_offer_caches():
+    """Invalidates every cached offer response, e.g. after mass changes of generated data."""
+    bump_versions([ALL_VERSION])
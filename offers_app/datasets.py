@@ -0,0 +1,45 @@
+from django.db import transaction
+from core.bulk_io import Dataset, register_dataset
+from core.images import schedule_image_processing
+from offers_app.cache import invalidate_offer_cache
+from offers_app.models import Offer, OfferDetail
+from offers_app.search import index_offers
+from offers_app.services import refresh_offer_summaries
+from stats_app.services import invalidate_base_info
+
+
+def _after_offers_import(offers, previous):
+    offer_ids = [offer.pk for offer in offers]
+    refresh_offer_summaries(offer_ids)
+    index_offers(offer_ids)
+    schedule_image_processing(offers, 'image')
+    invalidate_offer_cache(
+        offer_ids=offer_ids,
+        user_ids={offer.user_id for offer in offers} | {values['user_id'] for values in previous.values()},
+    )
+    transaction.on_commit(invalidate_base_info)
+
+
+def _after_offer_details_import(details, previous):
+    offer_ids = {detail.offer_id for detail in details} | {values['offer_id'] for values in previous.values()}
+    refresh_offer_summaries(offer_ids)
+    index_offers(offer_ids)
+    invalidate_offer_cache(
+        offer_ids=offer_ids,
+        user_ids=Offer.objects.filter(pk__in=offer_ids).values_list('user_id', flat=True),
+        detail_ids=[detail.pk for detail in details],
+    )
+
+
+register_dataset('offers', Dataset(
+    Offer,
+    fields=['id', 'user_id', 'title', 'description', 'image', 'min_price', 'min_delivery_time', 'created_at', 'updated_at'],
+    import_fields=['id', 'user_id', 'title', 'description', 'image'],
+    after_import=_after_offers_import,
+))
+register_dataset('offer_details', Dataset(
+    OfferDetail,
+    fields=['id', 'offer_id', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type'],
+    import_fields=['id', 'offer_id', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type'],
+    after_import=_after_offer_details_import,
+))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from offers_app.models import Offer
+from offers_app.services import refresh_offer_summaries
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the denormalized `min_price` and `min_delivery_time` columns of all offers.
+
+    Offers are processed in primary key batches, so every batch is one UPDATE statement
+    and the command can run on a live database.
+    """
+    help = 'Rebuilds the stored min price and min delivery time of all offers in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of offers updated per statement.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        updated = 0
+        while True:
+            offer_ids = list(
+                Offer.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not offer_ids:
+                break
+            updated += refresh_offer_summaries(offer_ids)
+            last_id = offer_ids[-1]
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt summaries for {updated} offers.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from offers_app.models import Offer
+from offers_app.search import clear_index, index_offers
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the full-text search index of all offers.
+
+    Regenerates every stored search document from the offer and its details and,
+    on SQLite, repopulates the FTS5 table in primary key batches.
+    """
+    help = 'Rebuilds the full-text search index of all offers in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of offers indexed per batch.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        clear_index()
+        last_id = 0
+        indexed = 0
+        while True:
+            offer_ids = list(
+                Offer.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not offer_ids:
+                break
+            index_offers(offer_ids)
+            indexed += len(offer_ids)
+            last_id = offer_ids[-1]
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} offers.'))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def populate_min_values(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+
+    def min_detail_value(field):
+        return Subquery(
+            OfferDetail.objects.filter(offer=OuterRef('pk'))
+            .order_by()
+            .values('offer')
+            .annotate(value=Min(field))
+            .values('value')[:1]
+        )
+
+    Offer.objects.update(
+        min_price=min_detail_value('price'),
+        min_delivery_time=min_detail_value('delivery_time_in_days'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0004_alter_offer_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(populate_min_values, migrations.RunPython.noop),
+    ]
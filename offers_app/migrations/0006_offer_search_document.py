@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+FTS_TABLE = 'offers_app_offer_fts'
+PG_INDEX = 'offers_app_offer_search_idx'
+
+
+def create_search_index(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(document, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON offers_app_offer "
+            f"USING GIN (to_tsvector('simple', search_document))"
+        )
+
+    offers = Offer.objects.prefetch_related('details').iterator(chunk_size=1000)
+    for offer in offers:
+        parts = [offer.title, offer.description]
+        for detail in offer.details.all():
+            parts.append(detail.title)
+            parts.extend(str(feature) for feature in detail.features or [])
+        document = '\n'.join(part for part in parts if part)
+        Offer.objects.filter(pk=offer.pk).update(search_document=document)
+        if vendor == 'sqlite':
+            schema_editor.execute(f'INSERT INTO {FTS_TABLE} (rowid, document) VALUES (%s, %s)', [offer.pk, document])
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0005_offer_min_delivery_time_offer_min_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
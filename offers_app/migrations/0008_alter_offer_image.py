@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:03
+
+import core.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0007_offer_offer_updated_idx_offer_offer_user_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='offer',
+            name='image',
+            field=models.FileField(blank=True, null=True, upload_to='media/', validators=[core.images.validate_image_upload]),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from core.images import validate_image_upload
 
 User = get_user_model()
 
@@ -15,17 +16,30 @@ class Offer(models.Model):
     Fields:
         user: ForeignKey to User, linking the offer to its creator.
         title: Title of the offer (max 50 chars).
-        image: Optional image uploaded to 'media/'.
+        image: Optional image uploaded to 'media/'; replaced by its processed version in 'images/' (see core.images).
         description: Brief description (max 255 chars).
         created_at: Timestamp when created (auto-set).
         updated_at: Timestamp when updated (auto-set).
+        min_price: Lowest price of all details (denormalized, indexed).
+        min_delivery_time: Shortest delivery time of all details (denormalized, indexed).
+        search_document: Text of the offer and its details used by the full-text index.
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='offers')
     title = models.CharField(max_length=50)
-    image = models.FileField(upload_to="media/", blank=True, null=True)
+    image = models.FileField(upload_to="media/", blank=True, null=True, validators=[validate_image_upload])
     description = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
+    search_document = models.TextField(blank=True, default='', editable=False)
+
+    class Meta:
+        # The offer list is ordered by updated_at, globally or for one creator (creator_id filter).
+        indexes = [
+            models.Index(fields=['updated_at'], name='offer_updated_idx'),
+            models.Index(fields=['user', 'updated_at'], name='offer_user_updated_idx'),
+        ]
     
     def __str__(self):
         short_desc = (self.description[:50] + '...') if len(self.description) > 50 else self.description
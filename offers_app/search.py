@@ -0,0 +1,121 @@
+import re
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from offers_app.models import Offer
+
+FTS_TABLE = 'offers_app_offer_fts'
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def build_search_document(offer, details):
+    """
+    Builds the text that is indexed for an offer.
+
+    Combines the offer title and description with the titles and features of all its details,
+    so a search for e.g. a feature name also finds the offer.
+    """
+    parts = [offer.title, offer.description]
+    for detail in details:
+        parts.append(detail.title)
+        parts.extend(str(feature) for feature in detail.features or [])
+    return '\n'.join(part for part in parts if part)
+
+
+def search_tokens(term):
+    """Splits a user supplied search term into lowercase word tokens, dropping all query syntax."""
+    return TOKEN_PATTERN.findall((term or '').lower())
+
+
+def index_offers(offer_ids):
+    """
+    Rebuilds the stored search document and the full-text index entries of the given offers.
+
+    Offers that no longer exist are removed from the index.
+
+    Args:
+        offer_ids: Iterable of offer primary keys.
+    """
+    offer_ids = {offer_id for offer_id in offer_ids if offer_id is not None}
+    if not offer_ids:
+        return
+    offers = list(Offer.objects.filter(pk__in=offer_ids).prefetch_related('details'))
+    changed = []
+    for offer in offers:
+        document = build_search_document(offer, offer.details.all())
+        if document != offer.search_document:
+            offer.search_document = document
+            changed.append(offer)
+    if changed:
+        Offer.objects.bulk_update(changed, ['search_document'])
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            _delete_fts_rows(cursor, offer_ids)
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, document) VALUES (%s, %s)',
+                [(offer.pk, offer.search_document) for offer in offers],
+            )
+
+
+def remove_offers(offer_ids):
+    """Removes the given offers from the full-text index."""
+    offer_ids = {offer_id for offer_id in offer_ids if offer_id is not None}
+    if offer_ids and connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            _delete_fts_rows(cursor, offer_ids)
+
+
+def clear_index():
+    """Empties the full-text index; used before a complete reindex."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+
+def _delete_fts_rows(cursor, offer_ids):
+    placeholders = ', '.join(['%s'] * len(offer_ids))
+    cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', list(offer_ids))
+
+
+def search_offers(queryset, term):
+    """
+    Restricts an offer queryset to the offers matching `term` and orders them by relevance.
+
+    - SQLite: filters on a rowid subquery against the FTS5 table and orders by its bm25 `rank`.
+    - PostgreSQL: matches the GIN indexed tsvector of `search_document` and orders by `ts_rank`.
+    - Other databases: falls back to `icontains` on the stored search document.
+
+    On SQLite and PostgreSQL every token is matched as a word prefix and all tokens must match,
+    so `log` finds "Logo Design" but `ogo` does not.
+    The relevance is exposed as the `search_rank` annotation (lower is better on SQLite,
+    higher is better on PostgreSQL).
+    """
+    tokens = search_tokens(term)
+    if not tokens:
+        return queryset
+    table = Offer._meta.db_table
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]),
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+                [match],
+                output_field=FloatField(),
+            ),
+        ).order_by('search_rank')
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        # Must stay identical to the expression of the GIN index created in migration 0006.
+        vector = f"to_tsvector('simple', {table}.search_document)"
+        return queryset.filter(
+            RawSQL(f"{vector} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField()),
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({vector}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField(),
+            ),
+        ).order_by('-search_rank')
+    for token in tokens:
+        queryset = queryset.filter(search_document__icontains=token)
+    return queryset
@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import Min, OuterRef, Subquery
+from django.dispatch import Signal
+from core.images import schedule_image_processing
+from offers_app.models import Offer, OfferDetail
+from offers_app.search import index_offers
+
+# Sent after `create_offers` inserted offers without per-row signals; receives `offer_ids` and `user_ids`.
+offers_created = Signal()
+
+
+def _min_detail_value(field):
+    """Returns a correlated subquery selecting the smallest detail value of `field` for the outer offer."""
+    return Subquery(
+        OfferDetail.objects.filter(offer=OuterRef('pk'))
+        .order_by()
+        .values('offer')
+        .annotate(value=Min(field))
+        .values('value')[:1]
+    )
+
+
+def refresh_offer_summaries(offer_ids):
+    """
+    Recomputes the denormalized `min_price` and `min_delivery_time` columns for the given offers.
+
+    Runs a single UPDATE with correlated subqueries, so the cost depends only on the number of
+    affected offers and their details, never on the size of the catalog.
+    Uses a queryset update on purpose, so `updated_at` is not touched and no signals are sent.
+
+    Args:
+        offer_ids: Iterable of offer primary keys.
+
+    Returns:
+        int: The number of updated offers.
+    """
+    offer_ids = {offer_id for offer_id in offer_ids if offer_id is not None}
+    if not offer_ids:
+        return 0
+    return Offer.objects.filter(pk__in=offer_ids).update(
+        min_price=_min_detail_value('price'),
+        min_delivery_time=_min_detail_value('delivery_time_in_days'),
+    )
+
+
+def create_offers(offers_data):
+    """
+    Creates offers together with their details using one INSERT per table.
+
+    Everything runs in a single transaction, so a failing batch leaves no half-written offers.
+    `bulk_create` sends no `post_save` signals, so the work of the per-row receivers is done
+    here once for the whole batch: the stored min values and the search index are refreshed,
+    uploaded images are queued for processing and `offers_created` is sent for everything
+    else that depends on new offers.
+
+    Args:
+        offers_data: List of validated offer dicts (model fields including `user`),
+            each with a `details` list of validated detail dicts.
+
+    Returns:
+        list[Offer]: The created offers in input order.
+    """
+    offers_data = [dict(data) for data in offers_data]
+    details_data = [data.pop('details', []) for data in offers_data]
+    with transaction.atomic():
+        offers = Offer.objects.bulk_create([Offer(**data) for data in offers_data])
+        OfferDetail.objects.bulk_create([
+            OfferDetail(offer=offer, **detail)
+            for offer, details in zip(offers, details_data)
+            for detail in details
+        ])
+        offer_ids = [offer.pk for offer in offers]
+        refresh_offer_summaries(offer_ids)
+        index_offers(offer_ids)
+        schedule_image_processing(offers, 'image')
+        offers_created.send(sender=Offer, offer_ids=offer_ids, user_ids={offer.user_id for offer in offers})
+    return offers
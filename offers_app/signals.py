@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.images import image_processed, schedule_image_processing
+from offers_app.cache import invalidate_offer_cache
+from offers_app.models import Offer, OfferDetail
+from offers_app.search import index_offers, remove_offers
+from offers_app.services import offers_created, refresh_offer_summaries
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def update_offer_summary(sender, instance, **kwargs):
+    """Keeps the stored min values and the search index of the parent offer in sync with its details."""
+    refresh_offer_summaries([instance.offer_id])
+    index_offers([instance.offer_id])
+
+
+@receiver(post_save, sender=Offer)
+def update_offer_search_index(sender, instance, **kwargs):
+    """Re-indexes an offer whenever its title or description may have changed."""
+    index_offers([instance.pk])
+
+
+@receiver(post_save, sender=Offer)
+def process_offer_image(sender, instance, **kwargs):
+    """Generates the variants of a newly uploaded offer image after the commit."""
+    schedule_image_processing([instance], 'image')
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_from_search_index(sender, instance, **kwargs):
+    """Drops a deleted offer from the full-text index."""
+    remove_offers([instance.pk])
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_cached_offer(sender, instance, **kwargs):
+    """Invalidates the cached responses showing a changed or deleted offer."""
+    invalidate_offer_cache(offer_ids=[instance.pk], user_ids=[instance.user_id])
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_cached_offer_detail(sender, instance, **kwargs):
+    """Invalidates the cached detail and, since the min values may change, its offer and the lists."""
+    if OfferDetail.offer.is_cached(instance):
+        user_ids = [instance.offer.user_id]
+    else:
+        user_ids = Offer.objects.filter(pk=instance.offer_id).values_list('user_id', flat=True)
+    invalidate_offer_cache(offer_ids=[instance.offer_id], user_ids=list(user_ids), detail_ids=[instance.pk])
+
+
+@receiver(offers_created, sender=Offer)
+def invalidate_cached_lists_on_bulk_offers(sender, offer_ids, user_ids, **kwargs):
+    """Offers inserted with `bulk_create` send no `post_save`, see `offers_app.services.create_offers`."""
+    invalidate_offer_cache(offer_ids=offer_ids, user_ids=user_ids)
+
+
+@receiver(image_processed, sender=Offer)
+def invalidate_cached_offer_on_processed_image(sender, pk, **kwargs):
+    """The image of an offer is switched to its processed version with a queryset update."""
+    invalidate_offer_cache(offer_ids=[pk], user_ids=Offer.objects.filter(pk=pk).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_offers_of_renamed_user(sender, instance, created, update_fields=None, **kwargs):
+    """Offer lists show the name of each creator; login only updates `last_login` and is ignored."""
+    if created or (update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields)):
+        return
+    invalidate_offer_cache(user_ids=[instance.pk])
@@ -1,3 +1,293 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from auth_app.models import UserProfile
+from offers_app.models import Offer
+from offers_app.api.pagination import OfferCursorPagination
+from core.testing import QueryPlanMixin
 
-# Create your tests here.
+
+def offer_payload(title='Website', prices=(100, 200, 300), delivery_times=(7, 5, 3)):
+    return {
+        'title': title,
+        'description': 'A complete website.',
+        'details': [
+            {
+                'title': f'{offer_type.capitalize()} {title}',
+                'revisions': index + 1,
+                'delivery_time_in_days': delivery_times[index],
+                'price': prices[index],
+                'features': ['Design'],
+                'offer_type': offer_type,
+            }
+            for index, offer_type in enumerate(['basic', 'standard', 'premium'])
+        ],
+    }
+
+
+class OfferSummaryTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+
+    def test_create_stores_min_values(self):
+        response = self.client.post('/api/offers/', offer_payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        offer = Offer.objects.get(pk=response.data['id'])
+        self.assertEqual(offer.min_price, 100)
+        self.assertEqual(offer.min_delivery_time, 3)
+
+    def test_patch_updates_min_values(self):
+        offer_id = self.client.post('/api/offers/', offer_payload(), format='json').data['id']
+        response = self.client.patch(
+            f'/api/offers/{offer_id}/',
+            {'details': [{'offer_type': 'basic', 'price': 50, 'delivery_time_in_days': 1}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        offer = Offer.objects.get(pk=offer_id)
+        self.assertEqual(offer.min_price, 50)
+        self.assertEqual(offer.min_delivery_time, 1)
+
+    def test_patch_writes_all_details_with_one_update(self):
+        offer_id = self.client.post('/api/offers/', offer_payload(), format='json').data['id']
+        details = [
+            {'offer_type': offer_type, 'price': price}
+            for offer_type, price in [('basic', 150), ('standard', 250), ('premium', 350)]
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(f'/api/offers/{offer_id}/', {'details': details}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statements = [query['sql'] for query in context.captured_queries]
+        self.assertEqual(len([sql for sql in statements if sql.startswith('UPDATE "offers_app_offerdetail"')]), 1)
+        self.assertFalse([sql for sql in statements if 'WHERE "offers_app_offerdetail"."offer_type"' in sql])
+        self.assertEqual(Offer.objects.get(pk=offer_id).min_price, 150)
+
+    def test_patch_with_unknown_offer_type_changes_nothing(self):
+        offer_id = self.client.post('/api/offers/', offer_payload(), format='json').data['id']
+        response = self.client.patch(
+            f'/api/offers/{offer_id}/',
+            {'title': 'Renamed', 'details': [{'offer_type': 'basic', 'price': 1}, {'offer_type': 'gold', 'price': 1}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        offer = Offer.objects.get(pk=offer_id)
+        self.assertEqual((offer.title, offer.min_price), ('Website', 100))
+
+    def test_list_filters_and_orders_by_stored_columns(self):
+        self.client.post('/api/offers/', offer_payload('Cheap', prices=(10, 20, 30)), format='json')
+        self.client.post('/api/offers/', offer_payload('Expensive', prices=(500, 600, 700)), format='json')
+        response = self.client.get('/api/offers/', {'min_price': 100, 'ordering': 'min_price'})
+        self.assertEqual([offer['title'] for offer in response.data['results']], ['Expensive'])
+        response = self.client.get('/api/offers/', {'ordering': '-min_price'})
+        self.assertEqual([offer['title'] for offer in response.data['results']], ['Expensive', 'Cheap'])
+
+
+class OfferSearchTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+
+    def search(self, term):
+        response = self.client.get('/api/offers/', {'search': term})
+        return [offer['title'] for offer in response.data['results']]
+
+    def test_search_matches_titles_descriptions_and_features(self):
+        self.client.post('/api/offers/', offer_payload('Logo Design'), format='json')
+        payload = offer_payload('Django Backend')
+        payload['details'][2]['features'] = ['Kubernetes']
+        self.client.post('/api/offers/', payload, format='json')
+        self.assertEqual(self.search('logo'), ['Logo Design'])
+        self.assertEqual(self.search('kube'), ['Django Backend'])
+        self.assertCountEqual(self.search('complete website'), ['Logo Design', 'Django Backend'])
+        self.assertEqual(self.search('nothing-matches'), [])
+
+    def test_search_matches_word_prefixes_not_substrings(self):
+        self.client.post('/api/offers/', offer_payload('Logo Design'), format='json')
+        self.assertEqual(self.search('log'), ['Logo Design'])
+        self.assertEqual(self.search('ogo'), [])
+        self.assertEqual(self.search('esign'), [])
+
+    def test_search_ranks_by_relevance(self):
+        self.client.post('/api/offers/', offer_payload('Python Scripts'), format='json')
+        payload = offer_payload('Python Python Python')
+        self.client.post('/api/offers/', payload, format='json')
+        self.assertEqual(self.search('python')[0], 'Python Python Python')
+
+    def test_edited_and_deleted_offers_update_the_index(self):
+        offer_id = self.client.post('/api/offers/', offer_payload('Logo Design'), format='json').data['id']
+        self.client.patch(f'/api/offers/{offer_id}/', {'description': 'Corporate branding.'}, format='json')
+        self.assertEqual(self.search('website'), [])
+        self.assertEqual(self.search('branding'), ['Logo Design'])
+        Offer.objects.get(pk=offer_id).delete()
+        self.assertEqual(self.search('branding'), [])
+
+
+class OfferCursorPaginationTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+        for index, price in enumerate([30, 10, 20, 10, 30, 10, 20]):
+            self.client.post('/api/offers/', offer_payload(f'Offer {index}', prices=(price, 100, 200)), format='json')
+
+    def collect(self, params):
+        titles, url, pages = [], '/api/offers/', 0
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            titles.extend(offer['title'] for offer in response.data['results'])
+            url, params, pages = response.data['next'], None, pages + 1
+        return titles, pages
+
+    def test_pages_follow_ordering_with_id_tiebreaker(self):
+        titles, pages = self.collect({'pagination': 'cursor', 'ordering': 'min_price', 'page_size': 2})
+        expected = [offer.title for offer in Offer.objects.order_by('min_price', 'id')]
+        self.assertEqual(titles, expected)
+        self.assertEqual(pages, 4)
+
+    def test_descending_default_ordering(self):
+        titles, _ = self.collect({'pagination': 'cursor', 'page_size': 3})
+        self.assertEqual(titles, [offer.title for offer in Offer.objects.order_by('-updated_at', '-id')])
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(OfferCursorPagination, 'max_page_size', 4):
+            response = self.client.get('/api/offers/', {'pagination': 'cursor', 'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/offers/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class OfferQueryPlanTest(QueryPlanMixin, APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+        self.offer_id = self.client.post('/api/offers/', offer_payload(), format='json').data['id']
+
+    def test_ordered_offer_lists_use_indexes(self):
+        for ordering in ['updated_at', '-updated_at', 'min_price', '-min_price']:
+            self.assertUsesIndexes('/api/offers/', ['offers_app_offer'], {'ordering': ordering}, ordered=True)
+        self.assertUsesIndexes('/api/offers/', ['offers_app_offer'], {'creator_id': self.user.pk, 'ordering': '-updated_at'}, ordered=True)
+
+    def test_filtered_offer_lists_use_indexes(self):
+        self.assertUsesIndexes('/api/offers/', ['offers_app_offer'], {'min_price': 100})
+        self.assertUsesIndexes('/api/offers/', ['offers_app_offer'], {'max_delivery_time': 5})
+        self.assertUsesIndexes('/api/offers/', ['offers_app_offer'], {'pagination': 'cursor', 'ordering': '-updated_at'}, ordered=True)
+
+    def test_offer_details_use_indexes(self):
+        self.assertUsesIndexes(f'/api/offers/{self.offer_id}/', ['offers_app_offer', 'offers_app_offerdetail'])
+        detail_id = Offer.objects.get(pk=self.offer_id).details.first().pk
+        self.assertUsesIndexes(f'/api/offerdetails/{detail_id}/', ['offers_app_offerdetail'])
+
+
+class OfferBulkCreateTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.user, type='business')
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_stores_offers_details_and_summaries(self):
+        payload = [offer_payload(title=f'Offer {index}', prices=(10 + index, 200, 300)) for index in range(5)]
+        with mock.patch('offers_app.api.serializers.OfferBulkSerializer.chunk_size', 2):
+            response = self.client.post('/api/offers/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 5)
+        offers = Offer.objects.filter(pk__in=response.data['ids']).order_by('pk')
+        self.assertEqual([offer.min_price for offer in offers], [10, 11, 12, 13, 14])
+        self.assertTrue(all(offer.user == self.user and offer.details.count() == 3 for offer in offers))
+        search = self.client.get('/api/offers/', {'search': 'Offer 3'})
+        self.assertIn(response.data['ids'][3], [offer['id'] for offer in search.data['results']])
+
+    def test_invalid_offer_rejects_the_whole_batch(self):
+        invalid = offer_payload()
+        invalid['details'] = invalid['details'][:2]
+        response = self.client.post('/api/offers/bulk/', [offer_payload(), invalid], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Offer.objects.exists())
+
+    def test_single_create_uses_one_insert_for_all_details(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/offers/', offer_payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        inserts = [query for query in context.captured_queries if query['sql'].startswith('INSERT INTO "offers_app_offerdetail"')]
+        self.assertEqual(len(inserts), 1)
+
+
+class OfferResponseCacheTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='business', password='secure123', first_name='Ada')
+        self.other = User.objects.create_user(username='other', password='secure123')
+        for user in [self.user, self.other]:
+            UserProfile.objects.create(user=user, type='business')
+            self.client.force_authenticate(user)
+            self.client.post('/api/offers/', offer_payload(title=user.username), format='json')
+        self.client.force_authenticate(self.user)
+        self.offer = Offer.objects.get(user=self.user)
+
+    def test_lists_are_cached_until_an_offer_changes(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/offers/?ordering=min_price&page=1')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/offers/?page=1&ordering=min_price')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(f'/api/offers/?creator_id={self.other.pk}')['X-Cache'], 'MISS')
+
+        self.client.force_authenticate(self.user)
+        self.client.patch(f'/api/offers/{self.offer.pk}/', {'title': 'Renamed'}, format='json')
+        response = self.client.get('/api/offers/?page=1&ordering=min_price')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Renamed', [offer['title'] for offer in response.data['results']])
+        # Lists of other creators are unaffected.
+        self.assertEqual(self.client.get(f'/api/offers/?creator_id={self.other.pk}')['X-Cache'], 'HIT')
+
+    def test_detail_changes_invalidate_offer_and_detail_responses(self):
+        detail = self.offer.details.get(offer_type='basic')
+        self.client.get(f'/api/offers/{self.offer.pk}/')
+        self.client.get(f'/api/offerdetails/{detail.pk}/')
+        self.client.patch(f'/api/offers/{self.offer.pk}/', {'details': [{'offer_type': 'basic', 'price': 42}]}, format='json')
+        self.assertEqual(self.client.get(f'/api/offers/{self.offer.pk}/').data['min_price'], 42)
+        response = self.client.get(f'/api/offerdetails/{detail.pk}/')
+        self.assertEqual((response['X-Cache'], response.data['price']), ('MISS', '42.00'))
+
+    def test_renaming_the_creator_invalidates_the_lists(self):
+        self.client.get('/api/offers/')
+        self.user.first_name = 'Grace'
+        self.user.save()
+        response = self.client.get('/api/offers/')
+        self.assertIn('Grace', [offer['user_details']['first_name'] for offer in response.data['results']])
+
+    def test_conditional_get_returns_not_modified(self):
+        etag = self.client.get(f'/api/offers/{self.offer.pk}/')['ETag']
+        response = self.client.get(f'/api/offers/{self.offer.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.offer.save()
+        response = self.client.get(f'/api/offers/{self.offer.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }):
+            self.assertEqual(self.client.get(f'/api/offers/{self.offer.pk}/')['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(f'/api/offers/{self.offer.pk}/')['X-Cache'], 'HIT')
+            self.client.patch(f'/api/offers/{self.offer.pk}/', {'title': 'Renamed'}, format='json')
+            response = self.client.get(f'/api/offers/{self.offer.pk}/')
+            self.assertEqual((response['X-Cache'], response.data['title']), ('MISS', 'Renamed'))
@@ -1,4 +1,20 @@
 from django.contrib import admin
-from .models import Order
+from core.admin import StreamingExportMixin
+from .models import ArchivedOrder, Order
 
-admin.site.register(Order)
+@admin.register(Order)
+class OrderAdmin(StreamingExportMixin, admin.ModelAdmin):
+    export_dataset = 'orders'
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    """Read-only view of archived orders; they are only written by `archive_orders`."""
+    list_display = ['id', 'business_user', 'customer_user', 'title', 'price', 'status', 'created_at', 'archived_at']
+    list_filter = ['status']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
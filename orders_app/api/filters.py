@@ -0,0 +1,15 @@
+import django_filters
+from orders_app.models import Order, STATUS_CHOICES
+
+class OrderFilter(django_filters.FilterSet):
+    """
+    A filter set for filtering orders by their status.
+
+    Attributes:
+        status (ChoiceFilter): Filters orders by `status` ('in_progress', 'completed' or 'cancelled').
+    """
+    status = django_filters.ChoiceFilter(field_name='status', choices=STATUS_CHOICES)
+
+    class Meta:
+        model = Order
+        fields = ['status']
@@ -0,0 +1,13 @@
+from core.pagination import KeysetPagination
+
+class OrderPagination(KeysetPagination):
+    """
+    Keyset pagination for the order list, newest orders first.
+
+    Pages are ordered by `created_at` with the order id as tiebreaker, so listing the orders of
+    a high-volume business costs the same on every page and never runs a count query.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering_fields = ['created_at']
+    default_ordering = '-created_at'
@@ -1,5 +1,9 @@
 from rest_framework import serializers
-from orders_app.models import Order
+from orders_app.models import STATUS_CHOICES, ArchivedOrder, Order
+from orders_app.services import orderable_details, place_orders
+
+# Orders placed at most by one batch request.
+MAX_BATCH_SIZE = 50
 
 class OrderListSerializer(serializers.ModelSerializer):
     """
@@ -29,15 +33,44 @@ class OrderListSerializer(serializers.ModelSerializer):
         return representation
 
 
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    """
+    Serializer for archived orders; same fields as `OrderListSerializer`, read from the stored copy of the offer detail.
+    """
+
+    class Meta:
+        model = ArchivedOrder
+        fields = OrderListSerializer.Meta.fields
+
+
+class OrderDetailSerializer(OrderListSerializer):
+    """
+    Serializer for a single order; adds the `version` clients send back with status changes.
+    """
+
+    class Meta(OrderListSerializer.Meta):
+        fields = OrderListSerializer.Meta.fields + ['version']
+
+
+class OrderStatusUpdateSerializer(serializers.Serializer):
+    """
+    Input of a status change: the new `status` and optionally the `version` the client has seen.
+    """
+    status = serializers.ChoiceField(choices=[choice for choice, _ in STATUS_CHOICES])
+    version = serializers.IntegerField(min_value=1, required=False)
+
+
 class OrderCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating an order.
 
-    Exposes 'offer_detail_id' for write-only input. The response uses the OrderListSerializer.
+    Exposes 'offer_detail_id' for write-only input. The detail is loaded together with its offer
+    owner in one query, and the order is placed with `orders_app.services.place_orders`.
+    The response uses the OrderListSerializer.
     """
 
     offer_detail_id = serializers.PrimaryKeyRelatedField(
-        queryset=Order.objects.model.offer_detail.field.related_model.objects.all(),
+        queryset=orderable_details(),
         source='offer_detail',
         write_only=True
     )
@@ -47,12 +80,14 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         fields = ['offer_detail_id']
 
     def create(self, validated_data):
-        """Creates a new instance while automatically setting customer, business user, and price from the related offer detail."""
-        offer_detail = validated_data['offer_detail']
-        validated_data['customer_user'] = self.context['request'].user
-        validated_data['business_user'] = offer_detail.offer.user
-        validated_data['price'] = offer_detail.price
-        return super().create(validated_data)
+        """
+        Places the order for the requesting customer; business user and price come from the offer detail.
+        A retried request with the same `idempotency_key` (passed to `save`) returns the stored order.
+        """
+        orders, self.created = place_orders(
+            self.context['request'].user, [validated_data['offer_detail']], validated_data.get('idempotency_key'),
+        )
+        return orders[0]
 
     def to_representation(self, instance):
         """
@@ -61,6 +96,47 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         return OrderListSerializer(instance, context=self.context).data
 
 
+class OrderBatchCreateSerializer(serializers.Serializer):
+    """
+    Serializer for placing several orders in one request.
+
+    Expects `{"orders": [{"offer_detail_id": 1}, ...]}`. All offer details are loaded with one
+    query and all orders are placed in one transaction: either every order is placed or none.
+    """
+
+    orders = serializers.ListField(
+        child=serializers.DictField(), min_length=1, max_length=MAX_BATCH_SIZE, write_only=True,
+    )
+
+    def validate_orders(self, items):
+        """Resolves the `offer_detail_id` of every item to its offer detail with a single query."""
+        ids, errors = [], []
+        for item in items:
+            field = serializers.IntegerField(min_value=1)
+            try:
+                ids.append(field.run_validation(item.get('offer_detail_id', serializers.empty)))
+                errors.append({})
+            except serializers.ValidationError as error:
+                ids.append(None)
+                errors.append({'offer_detail_id': error.detail})
+        details = orderable_details().in_bulk([pk for pk in ids if pk is not None])
+        for pk, item_errors in zip(ids, errors):
+            if pk is not None and pk not in details:
+                item_errors['offer_detail_id'] = [f'Invalid pk "{pk}" - object does not exist.']
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return [details[pk] for pk in ids]
+
+    def create(self, validated_data):
+        orders, self.created = place_orders(
+            self.context['request'].user, validated_data['orders'], validated_data.get('idempotency_key'), batch=True,
+        )
+        return orders
+
+    def to_representation(self, instance):
+        return {'orders': OrderListSerializer(instance, many=True, context=self.context).data}
+
+
 class OrderCountSerializer(serializers.Serializer):
     order_count = serializers.IntegerField()
 
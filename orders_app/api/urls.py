@@ -1,10 +1,13 @@
 from django.urls import path
-from .views import OrderListCreateView, OrderDetailView, OrderCountView, OrderCompletedCountView
+from .views import OrderListCreateView, OrderBatchCreateView, OrderDetailView, OrderCountView, OrderCompletedCountView
 
 urlpatterns = [
     # Route: /orders/ (GET for listing, POST for creating an order)
     path('orders/', OrderListCreateView.as_view()),
 
+    # Route: /orders/batch/ (POST to place several orders in one transaction)
+    path('orders/batch/', OrderBatchCreateView.as_view()),
+
     # Route: /orders/<int:pk>/ (GET, PATCH, DELETE for a specific order by ID)
     path('orders/<int:pk>/', OrderDetailView.as_view()),
 
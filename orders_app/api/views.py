@@ -1,20 +1,65 @@
+import heapq
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
-from django.contrib.auth import get_user_model
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from orders_app.models import Order
+from orders_app.models import ArchivedOrder, Order
+from orders_app.services import MAX_IDEMPOTENCY_KEY_LENGTH, IdempotencyKeyReused, OrderConflict, change_order_status
+from stats_app.models import BusinessStats
+from core.streaming import streaming_export_response
+from .filters import OrderFilter
+from .pagination import OrderPagination
 from .permissions import IsCustomerUser, IsBusinessUser
-from .serializers import OrderListSerializer, OrderCreateSerializer, OrderCountSerializer, OrderCompletedCountSerializer
+from .serializers import (
+    OrderListSerializer, ArchivedOrderSerializer, OrderDetailSerializer, OrderCreateSerializer, OrderBatchCreateSerializer, OrderStatusUpdateSerializer,
+    OrderCountSerializer, OrderCompletedCountSerializer,
+)
 
-class OrderListCreateView(generics.ListCreateAPIView):
+class IdempotentCreateMixin:
+    """
+    Creates through a serializer whose `create` places orders with `orders_app.services.place_orders`.
+
+    An `Idempotency-Key` header is passed on, so a retried request returns the orders of the
+    first one (marked with `Idempotent-Replayed: true`) instead of placing them twice.
+    Reusing a key for a different request is answered with 409 Conflict.
+    """
+    idempotency_header = 'Idempotency-Key'
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+        if key is not None and not 0 < len(key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+            return Response(
+                {'detail': f'{self.idempotency_header} must have 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.save(idempotency_key=key)
+        except IdempotencyKeyReused as error:
+            return Response({'detail': str(error)}, status=status.HTTP_409_CONFLICT)
+        response = Response(serializer.data, status=status.HTTP_201_CREATED)
+        if not serializer.created:
+            response['Idempotent-Replayed'] = 'true'
+        return response
+
+
+class OrderListCreateView(IdempotentCreateMixin, generics.ListCreateAPIView):
     """
     A view for listing and creating orders.
-    - `GET`: Lists orders based on the user's profile (business or customer).
-    - `POST`: Creates new orders for the authenticated user (customer or business).
+    - `GET`: Lists orders based on the user's profile (business or customer), keyset paginated
+      by `created_at` and filterable by `status`. With `?export=ndjson` or `?export=csv` all
+      matching orders are streamed instead of paginated. Archived orders are only included
+      with `?include_archived=true`.
+    - `POST`: Places an order for the authenticated customer with one joined read of the offer
+      detail and one INSERT. Honors the `Idempotency-Key` header (see `IdempotentCreateMixin`).
     """
     permission_classes = [IsAuthenticated, IsCustomerUser]
-    pagination_class = None
+    pagination_class = OrderPagination
+    filterset_class = OrderFilter
+    export_formats = ['ndjson', 'csv']
+    export_chunk_size = 2000
 
     def get_queryset(self):
         """
@@ -27,6 +72,23 @@ class OrderListCreateView(generics.ListCreateAPIView):
             return Order.objects.filter(business_user=user).select_related('offer_detail')
         return Order.objects.filter(customer_user=user).select_related('offer_detail')
 
+    def get_archived_queryset(self):
+        """
+        Returns the archived orders of the authenticated user, scoped like `get_queryset`.
+        """
+        user = self.request.user
+        if user.userprofile.type == 'business':
+            return ArchivedOrder.objects.filter(business_user=user)
+        return ArchivedOrder.objects.filter(customer_user=user)
+
+    def include_archived(self):
+        """Returns True if the request explicitly asks for archived orders (`?include_archived=true`)."""
+        return self.request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+    def filter_archived_queryset(self, queryset):
+        # DjangoFilterBackend insists on the model of the filterset, so the archive is filtered directly.
+        return OrderFilter(self.request.query_params, queryset=queryset, request=self.request).qs
+
     def get_serializer_class(self):
         """
         Returns the appropriate serializer class:
@@ -37,42 +99,124 @@ class OrderListCreateView(generics.ListCreateAPIView):
             return OrderCreateSerializer
         return OrderListSerializer
 
-    def perform_create(self, serializer):
+    def list(self, request, *args, **kwargs):
         """
-        Saves the new order and prepares the response serializer for listing.
+        Returns one page of orders, or streams all matching orders when an export format is requested.
+        Only active orders are read unless `?include_archived=true` merges the archive in.
         """
-        order = serializer.save()
-        self._response_serializer = OrderCreateSerializer(order, context=self.get_serializer_context())
+        export_format = request.query_params.get('export')
+        if export_format is not None and export_format not in self.export_formats:
+            return Response(
+                {'export': f"Unsupported export format, choose one of: {', '.join(self.export_formats)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if export_format is None and not self.include_archived():
+            return super().list(request, *args, **kwargs)
 
-    def create(self, request, *args, **kwargs):
+        querysets = [self.filter_queryset(self.get_queryset())]
+        if self.include_archived():
+            querysets.append(self.filter_archived_queryset(self.get_archived_queryset()))
+        if export_format is None:
+            rows = self.paginator.paginate_querysets(querysets, request, view=self)
+            return self.get_paginated_response(list(self.serialize_rows(rows)))
+        return streaming_export_response(
+            self.serialize_rows(self.export_rows(querysets)),
+            export_format,
+            fieldnames=OrderListSerializer.Meta.fields,
+            filename='orders',
+        )
+
+    def export_rows(self, querysets):
         """
-        Handles order creation and returns the new order's details in the response.
+        Yields the orders of all querysets newest first, reading them from the database in chunks.
+        Each queryset is read in order and merged lazily, so memory usage stays constant.
         """
-        response = super().create(request, *args, **kwargs)
-        if hasattr(self, '_response_serializer'):
-            response.data = self._response_serializer.data
-        return response
+        iterators = [
+            queryset.order_by('-created_at', '-id').iterator(chunk_size=self.export_chunk_size)
+            for queryset in querysets
+        ]
+        return heapq.merge(*iterators, key=lambda order: (order.created_at, order.id), reverse=True)
+
+    def serialize_rows(self, rows):
+        """
+        Serializes active and archived orders one by one with a reused serializer per model.
+        """
+        context = self.get_serializer_context()
+        serializers = {Order: OrderListSerializer(context=context), ArchivedOrder: ArchivedOrderSerializer(context=context)}
+        for row in rows:
+            yield serializers[type(row)].to_representation(row)
+
+
+class OrderBatchCreateView(IdempotentCreateMixin, generics.CreateAPIView):
+    """
+    A view for placing several orders in one request and one transaction.
+    - `POST`: Expects `{"orders": [{"offer_detail_id": 1}, ...]}` (at most `MAX_BATCH_SIZE` items)
+      and returns the placed orders in the same order. Honors the `Idempotency-Key` header.
+    """
+    permission_classes = [IsAuthenticated, IsCustomerUser]
+    serializer_class = OrderBatchCreateSerializer
 
 
 class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
-    A view for retrieving, updating, or deleting a specific order.
+    A view for retrieving, changing the status of, or deleting a specific order.
+    - `GET`: Returns the order (with its `version`) to its customer or business user.
+    - `PATCH`: Lets the business user of the order change its status along `STATUS_TRANSITIONS`
+      with one conditional UPDATE (`change_order_status`). A `version` in the body makes the
+      change apply only to that version. Conflicting changes are answered with 409.
+    - `DELETE`: Deletes the order (admin users only).
     """
-    queryset = Order.objects.filter()
-    serializer_class = OrderListSerializer
+    serializer_class = OrderDetailSerializer
+    http_method_names = ['get', 'patch', 'delete', 'head', 'options']
+
+    def get_queryset(self):
+        """
+        Returns the orders the request may act on, joined with their offer detail:
+        - `PATCH`: The orders of the requesting business user.
+        - `DELETE`: All orders.
+        - Other methods: The orders the requesting user placed or received.
+        """
+        queryset = Order.objects.select_related('offer_detail')
+        user = self.request.user
+        if self.request.method == 'PATCH':
+            return queryset.filter(business_user=user)
+        if self.request.method == 'DELETE':
+            return queryset
+        return queryset.filter(Q(customer_user=user) | Q(business_user=user))
+
+    def get_serializer_class(self):
+        if self.request.method == 'PATCH':
+            return OrderStatusUpdateSerializer
+        return OrderDetailSerializer
 
     def get_permissions(self):
         """
         Returns the appropriate permissions:
         - `PATCH` requires business user permissions.
         - `DELETE` requires admin user permissions.
+        - Other methods require an authenticated user.
         """
         if self.request.method == 'PATCH':
             permission_classes = [IsAuthenticated, IsBusinessUser]
         elif self.request.method == 'DELETE':
             permission_classes = [IsAuthenticated, IsAdminUser]
+        else:
+            permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    def partial_update(self, request, *args, **kwargs):
+        """
+        Applies a status change and returns the updated order.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = self.get_object()
+        try:
+            change_order_status(order, **serializer.validated_data)
+        except OrderConflict as error:
+            return Response({'detail': str(error)}, status=status.HTTP_409_CONFLICT)
+        return Response(OrderDetailSerializer(order, context=self.get_serializer_context()).data)
+
 
 class OrderCountView(generics.GenericAPIView):
     """
@@ -84,10 +228,10 @@ class OrderCountView(generics.GenericAPIView):
     def get(self, request, business_user_id, *args, **kwargs):
         """
         Retrieves the order count for a business user by ID.
-        Returns the count of orders in 'in_progress' status.
+        Returns the count of orders in 'in_progress' status, read from the business rollup row.
         """
-        business_user = get_object_or_404(get_user_model(), id=business_user_id, userprofile__type='business')
-        order_count = Order.objects.filter(business_user=business_user, status='in_progress').count()
+        stats = get_object_or_404(BusinessStats.objects.only('in_progress_count'), pk=business_user_id)
+        order_count = stats.in_progress_count
         serializer = self.get_serializer({'order_count': order_count})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -102,10 +246,10 @@ class OrderCompletedCountView(generics.GenericAPIView):
     def get(self, request, business_user_id, *args, **kwargs):
         """
         Retrieves the count of completed orders for a business user by ID.
-        Returns the count of orders in 'completed' status.
+        Returns the count of orders in 'completed' status, read from the business rollup row.
         """
-        business_user = get_object_or_404(get_user_model(), id=business_user_id, userprofile__type='business')
-        completed_order_count = Order.objects.filter(business_user=business_user, status='completed').count()
+        stats = get_object_or_404(BusinessStats.objects.only('completed_count'), pk=business_user_id)
+        completed_order_count = stats.completed_count
         serializer = self.get_serializer({'completed_order_count': completed_order_count})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
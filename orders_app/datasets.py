@@ -0,0 +1,21 @@
+from django.db.models import F
+from core.bulk_io import Dataset, register_dataset
+from orders_app.models import Order
+from stats_app.services import apply_rollup_changes, order_contribution
+
+
+def _after_orders_import(orders, previous):
+    # Updated orders count as changed for clients holding an older version (see change_order_status).
+    Order.objects.filter(pk__in=list(previous)).update(version=F('version') + 1)
+    apply_rollup_changes(
+        [order_contribution(values['business_user_id'], values['status'], values['price']) for values in previous.values()],
+        [order_contribution(order.business_user_id, order.status, order.price) for order in orders],
+    )
+
+
+register_dataset('orders', Dataset(
+    Order,
+    fields=['id', 'customer_user_id', 'business_user_id', 'offer_detail_id', 'price', 'status', 'created_at', 'updated_at'],
+    import_fields=['id', 'customer_user_id', 'business_user_id', 'offer_detail_id', 'price', 'status'],
+    after_import=_after_orders_import,
+))
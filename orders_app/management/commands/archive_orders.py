@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from orders_app.services import archive_orders
+
+
+class Command(BaseCommand):
+    """
+    Moves finished orders into the archive table, keeping the `Order` table small.
+
+    Completed and cancelled orders that did not change for `--days` days are copied to
+    `ArchivedOrder` and deleted from `Order` in batches of `--batch-size`, each in its own
+    transaction. Archived orders stay readable through `GET /api/orders/?include_archived=true`
+    and keep counting in the business stats. Meant to run regularly, e.g. nightly from cron.
+    """
+    help = 'Archives completed and cancelled orders older than the configured age.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS, help='Minimum age in days since the last change.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Orders moved per transaction.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--days must not be negative and --batch-size must be positive.')
+        started = time.perf_counter()
+        archived = archive_orders(
+            timezone.now() - timedelta(days=options['days']), batch_size=options['batch_size'],
+            progress=self.report_progress if options['verbosity'] > 1 else None,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} orders in {elapsed:.1f}s.'))
+
+    def report_progress(self, archived):
+        self.stdout.write(f'{archived} orders archived')
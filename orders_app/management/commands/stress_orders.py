@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import Counter
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from rest_framework.test import APIClient
+from auth_app.models import UserProfile
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+
+USER_PREFIX = 'stress-'
+
+
+class Command(BaseCommand):
+    """
+    Local concurrency test: places orders in parallel through the order API.
+
+    Every thread uses its own database connection and its own customer and posts to
+    `/api/orders/` through the full request stack (serializers, order placement, business rollups),
+    so lock contention behaves like concurrent production traffic on the configured database.
+    Reports throughput, status codes and "database is locked" errors; exits with an error if
+    any order failed.
+    """
+    help = 'Creates orders concurrently through the API and reports errors such as "database is locked".'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Number of concurrent clients.')
+        parser.add_argument('--orders', type=int, default=50, help='Orders created per client.')
+        parser.add_argument('--cleanup', action='store_true', help='Delete the generated users, offers and orders afterwards.')
+
+    def handle(self, *args, **options):
+        threads, orders_per_thread = options['threads'], options['orders']
+        detail, customers = self.create_fixtures(threads)
+        statuses, errors, lock = Counter(), Counter(), threading.Lock()
+
+        def place_orders(customer):
+            client = APIClient(SERVER_NAME='localhost')
+            client.force_authenticate(customer)
+            try:
+                for _ in range(orders_per_thread):
+                    try:
+                        response = client.post('/api/orders/', {'offer_detail_id': detail.pk}, format='json')
+                    except OperationalError as error:
+                        with lock:
+                            errors[str(error)] += 1
+                        continue
+                    with lock:
+                        statuses[response.status_code] += 1
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=place_orders, args=(customer,)) for customer in customers]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        total = threads * orders_per_thread
+        created = Order.objects.filter(offer_detail=detail).count()
+        self.stdout.write(f'Database: {connections["default"].vendor} ({connections["default"].settings_dict["NAME"]})')
+        self.stdout.write(f'{threads} clients x {orders_per_thread} orders in {elapsed:.2f}s ({total / elapsed:.1f} orders/s)')
+        self.stdout.write(f'Status codes: {dict(statuses)}')
+        self.stdout.write(f'Orders stored: {created}/{total}')
+        for message, count in errors.items():
+            self.stdout.write(self.style.ERROR(f'{count}x {message}'))
+
+        if options['cleanup']:
+            self.delete_fixtures()
+
+        if errors or created != total:
+            raise SystemExit(1)
+        self.stdout.write(self.style.SUCCESS('All orders were created without errors.'))
+
+    def create_fixtures(self, threads):
+        """Creates (or reuses) a business user with one offer detail and one customer per thread."""
+        business, _ = User.objects.get_or_create(username=f'{USER_PREFIX}business')
+        UserProfile.objects.get_or_create(user=business, defaults={'type': 'business'})
+        offer, _ = Offer.objects.get_or_create(
+            user=business, title='Stress test offer', defaults={'description': 'Generated by stress_orders.'},
+        )
+        detail, _ = OfferDetail.objects.get_or_create(
+            offer=offer, offer_type='basic',
+            defaults={'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': 1, 'price': 10, 'features': []},
+        )
+        Order.objects.filter(offer_detail=detail).delete()
+        customers = []
+        for index in range(threads):
+            customer, _ = User.objects.get_or_create(username=f'{USER_PREFIX}customer-{index}')
+            UserProfile.objects.get_or_create(user=customer, defaults={'type': 'customer'})
+            customers.append(customer)
+        return detail, customers
+
+    def delete_fixtures(self):
+        Order.objects.filter(business_user__username=f'{USER_PREFIX}business').delete()
+        User.objects.filter(username__startswith=USER_PREFIX).delete()
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from offers_app.models import OfferDetail
 
@@ -9,6 +9,8 @@ STATUS_CHOICES = [
     ("completed", "Completed"),
     ("cancelled", "Cancelled"),
 ]
+# Final statuses; orders in them are moved to `ArchivedOrder` once they are old enough.
+FINISHED_STATUSES = ["completed", "cancelled"]
 
 class Order(models.Model):
     """
@@ -23,6 +25,11 @@ class Order(models.Model):
         status (CharField): The status of the order, selected from predefined choices (in_progress, completed, cancelled).
         created_at (DateTimeField): The timestamp when the order was created.
         updated_at (DateTimeField): The timestamp when the order was last updated.
+        version (PositiveIntegerField): Incremented with every change; status changes only apply to
+            the version the client has seen (optimistic concurrency, see `change_order_status`).
+        idempotency_key (CharField): Optional client-chosen key of the request that placed the order,
+            unique per customer, so a retried request returns the order instead of placing it again.
+            Stored as `order:<key>` or, for batch items, `batch:<key>:<position>` (see `orders_app.services`).
     """
     customer_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="customer_orders")
     business_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="business_orders")
@@ -31,6 +38,103 @@ class Order(models.Model):
     status = models.CharField(max_length=25, choices=STATUS_CHOICES, default="in_progress")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    idempotency_key = models.CharField(max_length=128, null=True, blank=True, editable=False)
+
+    class Meta:
+        # Order lists are always scoped to one business or customer, optionally filtered by status,
+        # and paginated newest first. The indexes are ascending on purpose: scanned backwards they
+        # yield (created_at DESC, id DESC), because SQLite appends the rowid to every index entry.
+        indexes = [
+            models.Index(fields=['business_user', 'created_at'], name='order_business_created_idx'),
+            models.Index(fields=['business_user', 'status', 'created_at'], name='order_business_status_idx'),
+            models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+            models.Index(fields=['customer_user', 'status', 'created_at'], name='order_customer_status_idx'),
+            # Finds the finished orders due for archiving.
+            models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['customer_user', 'idempotency_key'],
+                condition=models.Q(idempotency_key__isnull=False),
+                name='order_idempotency_key_unique',
+            ),
+        ]
 
     def __str__(self):
         return f"Order #{self.id}: {self.customer_user} → {self.business_user} | {self.offer_detail} | {self.status} | ${self.price}"
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the order in a transaction, so rollups written by signal handlers commit or roll back with it.
+        Saving a stored order counts as a change and increments its version; if the save fails, the
+        instance keeps the version that is still stored.
+        """
+        version = self.version
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except Exception:
+            self.version = version
+            raise
+
+
+class ArchivedOrder(models.Model):
+    """
+    A finished order moved out of the `Order` table by `archive_orders` (cold storage).
+
+    Keeps the id, users, price, status and timestamps of the order together with a copy of the
+    offer detail it was placed for, so archived orders stay readable after the offer changed and
+    never block deleting offer details. Archived orders still count in the business rollups.
+
+    Attributes:
+        id (BigIntegerField): The id the order had in the `Order` table.
+        customer_user (ForeignKey): The user who placed the order.
+        business_user (ForeignKey): The business user who handled the order.
+        offer_detail_id (BigIntegerField): Id of the offer detail at the time of archiving (no constraint).
+        title, revisions, delivery_time_in_days, features, offer_type: Copy of the offer detail.
+        price (DecimalField): The price of the order.
+        status (CharField): The final status of the order.
+        created_at (DateTimeField): When the order was placed.
+        updated_at (DateTimeField): When the order was last changed.
+        archived_at (DateTimeField): When the order was archived.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_customer_orders")
+    business_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_business_orders")
+    offer_detail_id = models.BigIntegerField(null=True)
+    title = models.CharField(max_length=50)
+    revisions = models.PositiveIntegerField()
+    delivery_time_in_days = models.PositiveIntegerField()
+    features = models.JSONField(default=list)
+    offer_type = models.CharField(max_length=25)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=25, choices=STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Archived orders are only read per business or customer, newest first (`?include_archived=true`).
+        indexes = [
+            models.Index(fields=['business_user', 'created_at'], name='archived_business_created_idx'),
+            models.Index(fields=['customer_user', 'created_at'], name='archived_customer_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived order #{self.id}: {self.customer_user} → {self.business_user} | {self.title} | {self.status} | ${self.price}"
+
+    @classmethod
+    def from_order(cls, order):
+        """Builds the archive row of an order whose `offer_detail` is loaded."""
+        detail = order.offer_detail
+        return cls(
+            id=order.pk, customer_user_id=order.customer_user_id, business_user_id=order.business_user_id,
+            offer_detail_id=order.offer_detail_id, title=detail.title, revisions=detail.revisions,
+            delivery_time_in_days=detail.delivery_time_in_days, features=detail.features, offer_type=detail.offer_type,
+            price=order.price, status=order.status, created_at=order.created_at, updated_at=order.updated_at,
+        )
@@ -0,0 +1,168 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from core.bulk_io import delete_rows
+from offers_app.models import OfferDetail
+from orders_app.models import FINISHED_STATUSES, ArchivedOrder, Order
+from stats_app.services import apply_rollup_changes, order_contribution
+
+# Columns of an offer detail needed to place and return an order, loaded together with the offer owner.
+ORDER_DETAIL_FIELDS = ['id', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'offer__user_id']
+# Longest key a client may send; the stored key adds its namespace and the batch position.
+MAX_IDEMPOTENCY_KEY_LENGTH = 100
+# Allowed status changes: an order in progress is completed or cancelled once; both are final.
+STATUS_TRANSITIONS = {
+    'in_progress': {'completed', 'cancelled'},
+    'completed': set(),
+    'cancelled': set(),
+}
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when an idempotency key is sent again with a different request."""
+
+
+class OrderConflict(Exception):
+    """Raised when a status change does not apply to the current state of the order."""
+
+
+def orderable_details():
+    """Returns the offer details joined with their offer, limited to what placing an order reads."""
+    return OfferDetail.objects.select_related('offer').only(*ORDER_DETAIL_FIELDS)
+
+
+def _item_keys(idempotency_key, count, batch):
+    # Single orders and batch items live in separate namespaces, so no client key of one kind
+    # can match a key of the other (the single key "k:0" is not item 0 of the batch "k").
+    if idempotency_key is None:
+        return [None] * count
+    if not batch:
+        return [f'order:{idempotency_key}']
+    return [f'batch:{idempotency_key}:{index}' for index in range(count)]
+
+
+def place_orders(customer, offer_details, idempotency_key=None, batch=False):
+    """
+    Places one order per offer detail for `customer` in one transaction.
+
+    The orders are written with a single INSERT and their business rollups with one UPDATE per
+    business. `bulk_create` sends no `post_save`, so the rollups are applied here instead of by
+    the stats receivers. Offer details should come from `orderable_details`, so the owner and
+    price are read without further queries.
+
+    With an `idempotency_key`, a retry of an already placed request returns the stored orders
+    instead of placing them again. Single orders store the key as `order:<key>`, batches per
+    order as `batch:<key>:<position>`.
+
+    Returns:
+        tuple: (orders, created), where `created` is False for a replayed request.
+
+    Raises:
+        IdempotencyKeyReused: The key was already used for other offer details.
+    """
+    keys = _item_keys(idempotency_key, len(offer_details), batch)
+    orders = [
+        Order(
+            customer_user=customer, business_user_id=detail.offer.user_id, offer_detail=detail,
+            price=detail.price, idempotency_key=key,
+        )
+        for detail, key in zip(offer_details, keys)
+    ]
+    try:
+        with transaction.atomic():
+            Order.objects.bulk_create(orders)
+            apply_rollup_changes([], [order_contribution(order.business_user_id, order.status, order.price) for order in orders])
+    except IntegrityError:
+        if idempotency_key is None:
+            raise
+        stored = _stored_orders(customer, keys)
+        # Backends name the violated constraint differently; a stored key tells that it was the idempotency key.
+        if not stored:
+            raise
+        return _replayed_orders(stored, keys, offer_details), False
+    return orders, True
+
+
+def _stored_orders(customer, keys):
+    return {
+        order.idempotency_key: order
+        for order in Order.objects.filter(customer_user=customer, idempotency_key__in=keys).select_related('offer_detail')
+    }
+
+
+def _replayed_orders(stored, keys, offer_details):
+    orders = [stored.get(key) for key in keys]
+    if any(order is None for order in orders) or [order.offer_detail_id for order in orders] != [detail.pk for detail in offer_details]:
+        raise IdempotencyKeyReused('The idempotency key was already used for a different request.')
+    return orders
+
+
+def change_order_status(order, status, version=None):
+    """
+    Moves a loaded order to `status` if `STATUS_TRANSITIONS` allows it.
+
+    The change is a single conditional `UPDATE ... WHERE id = ? AND status = ? AND version = ?`
+    that also increments the version, so it only applies if nobody changed the order since it
+    was read (or since the client read `version`). No row or table is locked in advance; a lost
+    race shows up as an UPDATE that matched no row. The business rollup is adjusted in the same
+    transaction. The instance is updated in place.
+
+    Raises:
+        OrderConflict: The transition is not allowed, `version` is outdated or the order was
+            changed concurrently.
+    """
+    if version is not None and version != order.version:
+        raise OrderConflict(f'The order was changed in the meantime (version {order.version}, not {version}).')
+    if status not in STATUS_TRANSITIONS.get(order.status, ()):
+        raise OrderConflict(f'An order in status "{order.status}" cannot change to "{status}".')
+
+    now = timezone.now()
+    old = order_contribution(order.business_user_id, order.status, order.price)
+    new = order_contribution(order.business_user_id, status, order.price)
+    with transaction.atomic():
+        updated = Order.objects.filter(pk=order.pk, status=order.status, version=order.version).update(
+            status=status, version=F('version') + 1, updated_at=now,
+        )
+        if not updated:
+            raise OrderConflict('The order was changed in the meantime.')
+        apply_rollup_changes([old], [new])
+    order.status, order.version, order.updated_at = status, order.version + 1, now
+    # Keeps the snapshot of the stats receivers in line with the stored row (see stats_app.signals).
+    order._stats_snapshot = new
+    return order
+
+
+def archive_orders(older_than, batch_size=1000, progress=None):
+    """
+    Moves finished orders last changed before `older_than` (a datetime) into `ArchivedOrder`.
+
+    Every batch is copied and deleted in its own short transaction, so writers are only
+    blocked for one batch at a time and an interrupted run keeps what it archived. The rows
+    are deleted with a plain DELETE (`core.bulk_io.delete_rows`) on purpose, so no `post_delete`
+    signals are sent: archived orders still count in the business rollups (see
+    `stats_app.services.rebuild_business_stats`), which therefore stay unchanged.
+
+    Args:
+        older_than: Orders whose `updated_at` is older are archived.
+        batch_size: Orders moved per transaction.
+        progress: Optional callable receiving the number of orders archived so far.
+
+    Returns:
+        int: The number of archived orders.
+    """
+    archived = 0
+    while True:
+        with transaction.atomic():
+            orders = list(
+                Order.objects.select_for_update(skip_locked=True, of=('self',))
+                .filter(status__in=FINISHED_STATUSES, updated_at__lt=older_than)
+                .select_related('offer_detail')
+                .order_by()[:batch_size]
+            )
+            if not orders:
+                return archived
+            ArchivedOrder.objects.bulk_create([ArchivedOrder.from_order(order) for order in orders])
+            delete_rows(Order, [order.pk for order in orders])
+        archived += len(orders)
+        if progress:
+            progress(archived)
@@ -1,3 +1,343 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from auth_app.models import UserProfile
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import ArchivedOrder, Order
+from orders_app.services import OrderConflict, change_order_status
+from stats_app.models import BusinessStats
+from stats_app.services import rebuild_business_stats
+from core.testing import QueryPlanMixin
 
-# Create your tests here.
+
+def create_user(username, user_type):
+    user = User.objects.create_user(username=username, password='secure123')
+    UserProfile.objects.create(user=user, type=user_type)
+    return user
+
+
+def create_offer_detail(business_user, price=100):
+    offer = Offer.objects.create(user=business_user, title='Website', description='A complete website.')
+    return OfferDetail.objects.create(
+        offer=offer, title='Basic Website', revisions=1, delivery_time_in_days=5,
+        price=price, features=['Design'], offer_type='basic',
+    )
+
+
+class OrderListTest(APITestCase):
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.customer = create_user('customer', 'customer')
+        detail = create_offer_detail(self.business)
+        statuses = ['in_progress', 'completed', 'cancelled', 'in_progress', 'completed']
+        for order_status in statuses:
+            Order.objects.create(
+                customer_user=self.customer, business_user=self.business,
+                offer_detail=detail, price=detail.price, status=order_status,
+            )
+        self.client.force_authenticate(self.business)
+
+    def test_list_is_keyset_paginated_newest_first(self):
+        ids, url, params = [], '/api/orders/', {'page_size': 2}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(order['id'] for order in response.data['results'])
+            url, params = response.data['next'], None
+        self.assertEqual(ids, list(Order.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    def test_list_filters_by_status(self):
+        response = self.client.get('/api/orders/', {'status': 'completed'})
+        self.assertEqual([order['status'] for order in response.data['results']], ['completed', 'completed'])
+
+    def test_export_ndjson_streams_all_rows(self):
+        response = self.client.get('/api/orders/', {'export': 'ndjson', 'status': 'in_progress'})
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['title'], 'Basic Website')
+        self.assertEqual(rows[0]['features'], ['Design'])
+
+    def test_export_csv_has_header_and_rows(self):
+        response = self.client.get('/api/orders/', {'export': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(json.loads(rows[0]['features']), ['Design'])
+
+    def test_export_rejects_unknown_format(self):
+        response = self.client.get('/api/orders/', {'export': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrderQueryPlanTest(QueryPlanMixin, APITestCase):
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.customer = create_user('customer', 'customer')
+        detail = create_offer_detail(self.business)
+        Order.objects.create(customer_user=self.customer, business_user=self.business, offer_detail=detail, price=100)
+
+    def test_business_order_list_uses_indexes(self):
+        self.client.force_authenticate(self.business)
+        self.assertUsesIndexes('/api/orders/', ['orders_app_order'], ordered=True)
+        self.assertUsesIndexes('/api/orders/', ['orders_app_order'], {'status': 'completed'}, ordered=True)
+
+    def test_customer_order_list_uses_indexes(self):
+        self.client.force_authenticate(self.customer)
+        self.assertUsesIndexes('/api/orders/', ['orders_app_order'], ordered=True)
+        self.assertUsesIndexes('/api/orders/', ['orders_app_order'], {'status': 'in_progress'}, ordered=True)
+
+    def test_archived_orders_use_indexes(self):
+        self.client.force_authenticate(self.business)
+        tables = ['orders_app_order', 'orders_app_archivedorder']
+        self.assertUsesIndexes('/api/orders/', tables, {'include_archived': 'true'}, ordered=True)
+
+
+class OrderPlacementTest(APITestCase):
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.other_business = create_user('other', 'business')
+        self.customer = create_user('customer', 'customer')
+        self.detail = create_offer_detail(self.business, price=100)
+        self.other_detail = create_offer_detail(self.other_business, price=40)
+        self.client.force_authenticate(self.customer)
+
+    def stats(self, business):
+        return BusinessStats.objects.get(pk=business.pk)
+
+    def test_order_is_placed_with_one_read_and_one_insert(self):
+        # Detail with offer owner, INSERT, rollup UPDATE (plus the savepoint statements).
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [query['sql'].split()[0] for query in queries.captured_queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(statements, ['SELECT', 'INSERT', 'UPDATE'])
+        self.assertEqual(response.data['business_user'], self.business.pk)
+        self.assertEqual(response.data['title'], 'Basic Website')
+        self.assertEqual(response.data['price'], '100.00')
+        self.assertEqual(self.stats(self.business).in_progress_count, 1)
+
+    def test_unknown_offer_detail_is_rejected(self):
+        response = self.client.post('/api/orders/', {'offer_detail_id': 999}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retry_with_idempotency_key_returns_the_first_order(self):
+        first = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        retry = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertNotIn('Idempotent-Replayed', first)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(self.stats(self.business).in_progress_count, 1)
+
+    def test_idempotency_keys_are_scoped_per_customer(self):
+        self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        self.client.force_authenticate(create_user('customer2', 'customer'))
+        response = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_reused_idempotency_key_for_another_request_conflicts(self):
+        self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        response = self.client.post('/api/orders/', {'offer_detail_id': self.other_detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k' * 101)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_single_and_batch_keys_do_not_collide(self):
+        single = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k:0')
+        batch = self.client.post(
+            '/api/orders/batch/', {'orders': [{'offer_detail_id': self.other_detail.pk}]}, format='json', HTTP_IDEMPOTENCY_KEY='k',
+        )
+        self.assertEqual(batch.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', batch)
+        self.assertNotEqual(batch.data['orders'][0]['id'], single.data['id'])
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_other_integrity_errors_are_not_taken_for_a_replay(self):
+        with mock.patch('orders_app.services.apply_rollup_changes', side_effect=IntegrityError('CHECK constraint failed')):
+            with self.assertRaises(IntegrityError):
+                self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', HTTP_IDEMPOTENCY_KEY='k1')
+        self.assertFalse(Order.objects.exists())
+
+    def test_batch_places_all_orders_in_one_transaction(self):
+        payload = {'orders': [{'offer_detail_id': self.detail.pk}, {'offer_detail_id': self.other_detail.pk}, {'offer_detail_id': self.detail.pk}]}
+        with self.assertNumQueries(6):
+            response = self.client.post('/api/orders/batch/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([order['business_user'] for order in response.data['orders']], [self.business.pk, self.other_business.pk, self.business.pk])
+        self.assertEqual(self.stats(self.business).in_progress_count, 2)
+        self.assertEqual(self.stats(self.other_business).in_progress_count, 1)
+
+        retry = self.client.post('/api/orders/batch/', payload, format='json', HTTP_IDEMPOTENCY_KEY='b1')
+        replay = self.client.post('/api/orders/batch/', payload, format='json', HTTP_IDEMPOTENCY_KEY='b1')
+        self.assertEqual([order['id'] for order in replay.data['orders']], [order['id'] for order in retry.data['orders']])
+        self.assertEqual(Order.objects.count(), 6)
+
+    def test_invalid_batch_places_nothing(self):
+        payload = {'orders': [{'offer_detail_id': self.detail.pk}, {'offer_detail_id': 999}, {}]}
+        response = self.client.post('/api/orders/batch/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['orders'][0], {})
+        self.assertIn('offer_detail_id', response.data['orders'][1])
+        self.assertIn('offer_detail_id', response.data['orders'][2])
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self.client.post('/api/orders/batch/', {'orders': []}, format='json').status_code, 400)
+
+    def test_business_users_cannot_place_batches(self):
+        self.client.force_authenticate(self.business)
+        response = self.client.post('/api/orders/batch/', {'orders': [{'offer_detail_id': self.detail.pk}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class OrderStatusTest(APITestCase):
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.customer = create_user('customer', 'customer')
+        self.detail = create_offer_detail(self.business, price=100)
+        self.order = Order.objects.create(
+            customer_user=self.customer, business_user=self.business, offer_detail=self.detail, price=100,
+        )
+        self.url = f'/api/orders/{self.order.pk}/'
+        self.client.force_authenticate(self.business)
+
+    def stats(self):
+        return BusinessStats.objects.get(pk=self.business.pk)
+
+    def test_status_change_is_one_conditional_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'status': 'completed', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['status'], response.data['version'], response.data['title']), ('completed', 2, 'Basic Website'))
+        order_updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE "orders_app_order"')]
+        self.assertEqual(len(order_updates), 1)
+        self.assertIn('"version" =', order_updates[0].split('WHERE')[1])
+        stats = self.stats()
+        self.assertEqual((stats.in_progress_count, stats.completed_count, stats.total_revenue), (0, 1, 100))
+
+    def test_final_states_cannot_change(self):
+        self.client.patch(self.url, {'status': 'cancelled'}, format='json')
+        response = self.client.patch(self.url, {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.get(pk=self.order.pk).status, 'cancelled')
+        self.assertEqual((self.stats().cancelled_count, self.stats().completed_count), (1, 0))
+
+    def test_outdated_version_conflicts(self):
+        Order.objects.filter(pk=self.order.pk).update(version=2)
+        response = self.client.patch(self.url, {'status': 'completed', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.client.patch(self.url, {'status': 'completed', 'version': 2}, format='json').data['version'], 3)
+
+    def test_concurrent_change_wins_only_once(self):
+        first, second = Order.objects.get(pk=self.order.pk), Order.objects.get(pk=self.order.pk)
+        change_order_status(first, 'completed')
+        with self.assertRaises(OrderConflict):
+            change_order_status(second, 'cancelled')
+        stats = self.stats()
+        self.assertEqual((stats.in_progress_count, stats.completed_count, stats.cancelled_count), (0, 1, 0))
+
+    def test_save_increments_the_version(self):
+        order = Order.objects.get(pk=self.order.pk)
+        order.price = 120
+        order.save(update_fields=['price'])
+        self.assertEqual(Order.objects.get(pk=self.order.pk).version, 2)
+
+    def test_failed_save_keeps_the_stored_version(self):
+        order = Order.objects.get(pk=self.order.pk)
+        with mock.patch('django.db.models.Model.save', side_effect=DatabaseError('disk I/O error')):
+            with self.assertRaises(DatabaseError):
+                order.save()
+        self.assertEqual(order.version, 1)
+        change_order_status(order, 'completed')
+        self.assertEqual(Order.objects.get(pk=self.order.pk).version, 2)
+
+    def test_only_the_orders_business_can_change_it(self):
+        self.client.force_authenticate(create_user('other', 'business'))
+        self.assertEqual(self.client.patch(self.url, {'status': 'completed'}, format='json').status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.patch(self.url, {'status': 'completed'}, format='json').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.url).data['version'], 1)
+
+    def test_invalid_status_and_put_are_rejected(self):
+        self.assertEqual(self.client.patch(self.url, {'status': 'shipped'}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.put(self.url, {'status': 'completed'}, format='json').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class OrderArchiveTest(APITestCase):
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.customer = create_user('customer', 'customer')
+        self.detail = create_offer_detail(self.business, price=100)
+        self.orders = []
+        for order_status in ['completed', 'cancelled', 'in_progress', 'completed', 'completed']:
+            self.orders.append(Order.objects.create(
+                customer_user=self.customer, business_user=self.business,
+                offer_detail=self.detail, price=self.detail.price, status=order_status,
+            ))
+        # The first three orders were last changed a year ago.
+        Order.objects.filter(pk__in=[order.pk for order in self.orders[:3]]).update(updated_at=timezone.now() - timedelta(days=365))
+        self.client.force_authenticate(self.business)
+
+    def stats(self):
+        stats = BusinessStats.objects.get(pk=self.business.pk)
+        return stats.in_progress_count, stats.completed_count, stats.cancelled_count, stats.total_revenue
+
+    def archive(self):
+        call_command('archive_orders', '--days', '180', '--batch-size', '1', stdout=io.StringIO())
+
+    def test_only_old_finished_orders_are_archived(self):
+        before = self.stats()
+        self.archive()
+        self.assertEqual(sorted(ArchivedOrder.objects.values_list('id', flat=True)), [self.orders[0].pk, self.orders[1].pk])
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertEqual(self.stats(), before)
+        rebuild_business_stats([self.business.pk])
+        self.assertEqual(self.stats(), before)
+
+    def test_archived_orders_keep_their_offer_detail(self):
+        self.archive()
+        self.detail.title = 'Renamed'
+        self.detail.save()
+        self.assertEqual(ArchivedOrder.objects.get(pk=self.orders[0].pk).title, 'Basic Website')
+
+    def test_lists_read_archived_orders_only_on_request(self):
+        self.archive()
+        response = self.client.get('/api/orders/')
+        self.assertEqual(len(response.data['results']), 3)
+
+        ids, url, params = [], '/api/orders/', {'include_archived': 'true', 'page_size': 2}
+        while url:
+            response = self.client.get(url, params)
+            ids.extend(order['id'] for order in response.data['results'])
+            url, params = response.data['next'], None
+        self.assertEqual(ids, [order.pk for order in reversed(self.orders)])
+
+        response = self.client.get('/api/orders/', {'include_archived': 'true', 'status': 'cancelled'})
+        self.assertEqual([order['id'] for order in response.data['results']], [self.orders[1].pk])
+        self.assertEqual(response.data['results'][0]['title'], 'Basic Website')
+
+    def test_export_merges_archived_orders(self):
+        self.archive()
+        response = self.client.get('/api/orders/', {'export': 'ndjson', 'include_archived': '1'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [order.pk for order in reversed(self.orders)])
+
+    def test_deleting_a_customer_removes_archived_orders_from_the_stats(self):
+        self.archive()
+        self.customer.delete()
+        self.assertEqual(self.stats(), (0, 0, 0, 0))
@@ -1,4 +1,7 @@
 from django.contrib import admin
+from core.admin import StreamingExportMixin
 from .models import Review
 
-admin.site.register(Review)
+@admin.register(Review)
+class ReviewAdmin(StreamingExportMixin, admin.ModelAdmin):
+    export_dataset = 'reviews'
@@ -0,0 +1,14 @@
+from core.pagination import KeysetPagination
+
+class ReviewPagination(KeysetPagination):
+    """
+    Keyset pagination for the review list, most recently updated reviews first.
+
+    Pages are ordered by `rating` or `updated_at` with the review id as tiebreaker, which the
+    per-business and per-reviewer indexes serve directly, so a page costs the same no matter
+    how many reviews a business has.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering_fields = ['rating', 'updated_at']
+    default_ordering = '-updated_at'
@@ -29,4 +29,6 @@ class ReviewUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ['id', 'business_user', 'reviewer', 'rating', 'description', 'created_at', 'updated_at']
+        # The reviewed pair is fixed, so an update never needs the uniqueness check of (reviewer, business_user).
+        read_only_fields = ['business_user', 'reviewer', 'created_at', 'updated_at']
 
@@ -1,50 +1,89 @@
-from rest_framework import generics
+from django.db import IntegrityError
+from rest_framework import generics, status
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters
+from core.cache import CachedResponseMixin
+from reviews_app.cache import ALL_VERSION, business_version
 from reviews_app.models import Review
+from reviews_app.services import upsert_review
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .filters import ReviewFilter
+from .pagination import ReviewPagination
 from .serializers import ReviewSerializer, ReviewUpdateSerializer
 from .permissons import IsCreator, IsCustomer
 
-class ReviewsView(generics.ListCreateAPIView):
+class ReviewsView(CachedResponseMixin, generics.ListCreateAPIView):
     """
     A view for listing and creating reviews.
 
-    - Supports GET requests to list all reviews with optional filtering and ordering.
-    - Supports POST requests to create a new review for a business user by an authenticated customer.
+    - Supports GET requests to list reviews with optional filtering, keyset paginated by `rating` or
+      `updated_at` (`?ordering=`). The first page of a business's reviews (`?business_user_id=`) is
+      cached until one of its reviews is written.
+    - Supports POST requests to create a new review for a business user by an authenticated customer,
+      or with `?upsert=true` to create or replace it in one statement.
 
     Attributes:
         queryset (QuerySet): The set of all reviews to be listed.
         serializer_class (ReviewSerializer): The serializer used for serializing review data.
-        pagination_class (None): Disables pagination for the review list.
-        filter_backends (list): The filters applied to the reviews, including DjangoFilterBackend for filtering and OrderingFilter for ordering.
+        pagination_class (ReviewPagination): Keyset pagination, which also applies the ordering (rating or updated_at).
+        filter_backends (list): The filters applied to the reviews (DjangoFilterBackend).
         filterset_class (ReviewFilter): The filter set class that defines how reviews can be filtered.
-        ordering_fields (list): The fields available for ordering the reviews (rating and updated_at).
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
-    pagination_class = None
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    pagination_class = ReviewPagination
+    filter_backends = [DjangoFilterBackend]
     filterset_class = ReviewFilter
-    ordering_fields = ['rating', 'updated_at']
+
+    def get_business_user_id(self, request):
+        """Returns the business user the list is filtered by, or None."""
+        try:
+            return int(request.query_params['business_user_id'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def is_cacheable(self, request):
+        """Only first pages of one business's reviews are cached; other lists and deeper pages are rarely repeated."""
+        return self.get_business_user_id(request) is not None and not request.query_params.get(ReviewPagination.cursor_query_param)
+
+    def get_cache_versions(self):
+        return [ALL_VERSION, business_version(self.get_business_user_id(self.request))]
+
+    def create(self, request, *args, **kwargs):
+        """
+        Creates a review, or with `?upsert=true` creates or replaces the reviewer's review of the business user.
+
+        Returns:
+            Response: 201 with a new review, or 200 with the replaced review in upsert mode.
+        """
+        if request.query_params.get('upsert', '').lower() not in ('1', 'true', 'yes'):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        review, created = upsert_review(request.user, **serializer.validated_data)
+        return Response(self.get_serializer(review).data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
     def perform_create(self, serializer):
         """
-        Custom logic to prevent a user from writing multiple reviews for the same business user.
-        
+        Creates the review with a single INSERT; the unique constraint on (reviewer, business_user)
+        rejects a second review of the same business user, also under concurrent requests.
+
         Args:
             serializer: The serializer instance that is saving the review.
 
         Raises:
             PermissionDenied: If the reviewer has already written a review for the same business user.
+            IntegrityError: For any other violated constraint.
         """
-        reviewer = self.request.user
-        business_user = serializer.validated_data.get('business_user')
-        if Review.objects.filter(reviewer=reviewer, business_user=business_user).exists():
-            raise PermissionDenied(detail='You have already written a review for this business user.')
-        serializer.save(reviewer=self.request.user)
+        try:
+            serializer.save(reviewer=self.request.user)
+        except IntegrityError:
+            # Backends name the violated constraint differently; the stored pair tells whether it was this one.
+            business_user = serializer.validated_data['business_user']
+            if Review.objects.filter(reviewer=self.request.user, business_user=business_user).exists():
+                raise PermissionDenied(detail='You have already written a review for this business user.')
+            raise
 
     def get_permissions(self):
         """
@@ -0,0 +1,19 @@
+from core.cache import bump_versions
+
+# Version keys of the cached review pages (see core.cache.CachedResponseMixin):
+# every entry depends on ALL_VERSION plus the version of the reviewed business.
+ALL_VERSION = 'reviews:version:all'
+
+
+def business_version(business_user_id):
+    return f'reviews:version:business:{business_user_id}'
+
+
+def invalidate_review_cache(business_user_ids):
+    """Invalidates the cached review pages of the given business users."""
+    bump_versions([business_version(business_user_id) for business_user_id in set(business_user_ids)])
+
+
+def invalidate_all_review_caches():
+    """Invalidates every cached review page, e.g. after mass changes of generated data."""
+    bump_versions([ALL_VERSION])
@@ -0,0 +1,24 @@
+from django.db import transaction
+from core.bulk_io import Dataset, register_dataset
+from reviews_app.cache import invalidate_review_cache
+from reviews_app.models import Review
+from stats_app.services import apply_rollup_changes, invalidate_base_info, review_contribution
+
+
+def _after_reviews_import(reviews, previous):
+    apply_rollup_changes(
+        [review_contribution(values['business_user_id'], values['rating']) for values in previous.values()],
+        [review_contribution(review.business_user_id, review.rating) for review in reviews],
+    )
+    invalidate_review_cache(
+        [values['business_user_id'] for values in previous.values()] + [review.business_user_id for review in reviews]
+    )
+    transaction.on_commit(invalidate_base_info)
+
+
+register_dataset('reviews', Dataset(
+    Review,
+    fields=['id', 'business_user_id', 'reviewer_id', 'rating', 'description', 'created_at', 'updated_at'],
+    import_fields=['id', 'business_user_id', 'reviewer_id', 'rating', 'description'],
+    after_import=_after_reviews_import,
+))
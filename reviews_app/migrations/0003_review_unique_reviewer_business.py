@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:31
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+
+
+def delete_duplicate_reviews(apps, schema_editor):
+    """
+    Keeps only the most recently updated review of every (reviewer, business_user) pair.
+
+    Historical models send no signals, so the business rollups are corrected here by the
+    count and rating sum of the deleted reviews.
+    """
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessStats = apps.get_model('stats_app', 'BusinessStats')
+
+    duplicates = (
+        Review.objects.values('reviewer_id', 'business_user_id')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    # Materialised up front: deleting rows while a server-side cursor is still reading the
+    # grouped query is not safe on every backend.
+    for pair in list(duplicates):
+        reviews = Review.objects.filter(reviewer_id=pair['reviewer_id'], business_user_id=pair['business_user_id'])
+        keep = reviews.order_by('-updated_at', '-id').values_list('id', flat=True)[0]
+        removed = reviews.exclude(id=keep)
+        totals = removed.aggregate(count=Count('id'), rating_sum=Sum('rating'))
+        removed.delete()
+        BusinessStats.objects.filter(user_id=pair['business_user_id']).update(
+            review_count=F('review_count') - totals['count'],
+            rating_sum=F('rating_sum') - (totals['rating_sum'] or 0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0002_review_review_business_updated_idx_and_more'),
+        ('stats_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('reviewer', 'business_user'), name='review_unique_reviewer_business'),
+        ),
+    ]
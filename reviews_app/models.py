@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -24,6 +24,26 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Reviews are listed per business or per reviewer and ordered by rating or updated_at.
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating'], name='review_business_rating_idx'),
+            models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated_idx'),
+            models.Index(fields=['reviewer', 'rating'], name='review_reviewer_rating_idx'),
+            models.Index(fields=['updated_at'], name='review_updated_idx'),
+            models.Index(fields=['rating'], name='review_rating_idx'),
+        ]
+        # A reviewer rates a business once; the constraint (not a pre-check) settles concurrent creates.
+        constraints = [
+            models.UniqueConstraint(fields=['reviewer', 'business_user'], name='review_unique_reviewer_business'),
+        ]
+
     def __str__(self):
         short_desc = (self.description[:50] + '...') if len(self.description) > 50 else self.description
-        return f"Review by {self.reviewer} for {self.business_user} – Rating: {self.rating}/5 – {short_desc}"
\ No newline at end of file
+        return f"Review by {self.reviewer} for {self.business_user} – Rating: {self.rating}/5 – {short_desc}"
+
+    def save(self, *args, **kwargs):
+        """Saves the review in a transaction, so rollups written by signal handlers commit or roll back with it."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -0,0 +1,30 @@
+from django.db import transaction
+from reviews_app.cache import invalidate_review_cache
+from reviews_app.models import Review
+from stats_app.services import invalidate_base_info, refresh_review_stats
+
+
+def upsert_review(reviewer, business_user, rating, description):
+    """
+    Creates the review of `reviewer` for `business_user` or replaces its rating and description.
+
+    The write is one `INSERT ... ON CONFLICT (reviewer_id, business_user_id) DO UPDATE`, so
+    concurrent re-ratings never fail and never create a second review. `bulk_create` sends no
+    `post_save`, so the review figures of the business rollup are recomputed here and the
+    cached platform statistics and review pages of the business are invalidated.
+
+    Returns:
+        tuple: (review, created); the review is read back by the unique pair for its timestamps.
+            `created` is False if an existing review was replaced, which keeps its `created_at`.
+    """
+    review = Review(reviewer=reviewer, business_user=business_user, rating=rating, description=description)
+    with transaction.atomic():
+        Review.objects.bulk_create(
+            [review], update_conflicts=True, unique_fields=['reviewer', 'business_user'],
+            update_fields=['rating', 'description', 'updated_at'],
+        )
+        refresh_review_stats([business_user.pk])
+        stored = Review.objects.get(reviewer=reviewer, business_user=business_user)
+        invalidate_review_cache([business_user.pk])
+    transaction.on_commit(invalidate_base_info)
+    return stored, stored.created_at == review.created_at
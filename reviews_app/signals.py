@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from reviews_app.cache import invalidate_review_cache
+from reviews_app.models import Review
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_cached_review_pages(sender, instance, **kwargs):
+    """Invalidates the cached review pages of the business a review was written, changed or deleted for."""
+    invalidate_review_cache([instance.business_user_id])
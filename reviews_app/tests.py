@@ -1,3 +1,181 @@
-from django.test import TestCase
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import UserProfile
+from core.testing import QueryPlanMixin
+from reviews_app.models import Review
+from stats_app.models import BusinessStats
 
-# Create your tests here.
+
+class ReviewQueryPlanTest(QueryPlanMixin, APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='customer', password='secure123')
+        UserProfile.objects.create(user=self.customer, type='customer')
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description='Good')
+        self.client.force_authenticate(self.customer)
+
+    def test_filtered_and_ordered_review_lists_use_indexes(self):
+        filters = [{}, {'business_user_id': self.business.pk}, {'reviewer_id': self.customer.pk}]
+        for params in filters:
+            for ordering in ['rating', '-rating', 'updated_at', '-updated_at']:
+                self.assertUsesIndexes('/api/reviews/', ['reviews_app_review'], {**params, 'ordering': ordering}, ordered=True)
+
+    def test_filtered_review_lists_use_indexes(self):
+        self.assertUsesIndexes('/api/reviews/', ['reviews_app_review'], {'business_user_id': self.business.pk})
+        self.assertUsesIndexes('/api/reviews/', ['reviews_app_review'], {'reviewer_id': self.customer.pk})
+
+
+class ReviewListTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create_user(username='business', password='secure123')
+        self.other = User.objects.create_user(username='other', password='secure123')
+        for business in [self.business, self.other]:
+            UserProfile.objects.create(user=business, type='business')
+        self.customers = []
+        for index in range(5):
+            customer = User.objects.create_user(username=f'customer{index}', password='secure123')
+            UserProfile.objects.create(user=customer, type='customer')
+            Review.objects.create(business_user=self.business, reviewer=customer, rating=index % 3 + 1, description='Good')
+            self.customers.append(customer)
+        self.client.force_authenticate(self.customers[0])
+
+    def collect(self, url):
+        results = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            results += [review['id'] for review in response.data['results']]
+            url = response.data['next']
+        return results
+
+    def test_pages_follow_the_requested_ordering(self):
+        reviews = Review.objects.filter(business_user=self.business)
+        for ordering in ['rating', '-rating', 'updated_at', '-updated_at']:
+            expected = list(reviews.order_by(ordering, ordering.replace(ordering.lstrip('-'), 'id')).values_list('id', flat=True))
+            url = f'/api/reviews/?business_user_id={self.business.pk}&ordering={ordering}&page_size=2'
+            self.assertEqual(self.collect(url), expected)
+
+    def test_reviewer_filter(self):
+        response = self.client.get(f'/api/reviews/?reviewer_id={self.customers[1].pk}')
+        self.assertEqual([review['reviewer'] for review in response.data['results']], [self.customers[1].pk])
+
+    def test_first_page_per_business_is_cached_until_a_review_is_written(self):
+        url = f'/api/reviews/?business_user_id={self.business.pk}'
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        other_url = f'/api/reviews/?business_user_id={self.other.pk}'
+        self.client.get(other_url)
+
+        review = Review.objects.get(business_user=self.business, reviewer=self.customers[0])
+        self.client.patch(f'/api/reviews/{review.pk}/', {'rating': 5}, format='json')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['rating'], 5)
+        # Pages of other businesses are unaffected.
+        self.assertEqual(self.client.get(other_url)['X-Cache'], 'HIT')
+
+        self.client.post('/api/reviews/?upsert=true', {'business_user': self.business.pk, 'rating': 2, 'description': 'Again'}, format='json')
+        self.assertEqual(self.client.get(url).data['results'][0]['rating'], 2)
+        self.client.delete(f'/api/reviews/{review.pk}/')
+        self.assertNotIn(review.pk, [item['id'] for item in self.client.get(url).data['results']])
+
+    def test_other_lists_and_later_pages_are_not_cached(self):
+        response = self.client.get(f'/api/reviews/?business_user_id={self.business.pk}&page_size=2')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertNotIn('X-Cache', self.client.get(response.data['next']))
+        self.assertNotIn('X-Cache', self.client.get('/api/reviews/'))
+
+
+class ReviewCreateTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='customer', password='secure123')
+        UserProfile.objects.create(user=self.customer, type='customer')
+        self.client.force_authenticate(self.customer)
+
+    def post(self, rating, url='/api/reviews/'):
+        return self.client.post(url, {'business_user': self.business.pk, 'rating': rating, 'description': 'Good'}, format='json')
+
+    def stats(self):
+        stats = BusinessStats.objects.get(pk=self.business.pk)
+        return stats.review_count, stats.rating_sum
+
+    def test_second_review_is_rejected_by_the_constraint(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.post(4).status_code, status.HTTP_201_CREATED)
+        self.assertFalse(any('EXISTS' in query['sql'] or 'LIMIT 1' in query['sql'] for query in queries.captured_queries))
+        response = self.post(2)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['detail'], 'You have already written a review for this business user.')
+        self.assertEqual(Review.objects.count(), 1)
+        self.assertEqual(self.stats(), (1, 4))
+
+    def test_database_rejects_duplicate_reviews(self):
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description='Good')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5, description='Again')
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        with mock.patch.object(Review, 'save', side_effect=IntegrityError('NOT NULL constraint failed')):
+            with self.assertRaises(IntegrityError):
+                self.post(4)
+
+    def test_upsert_creates_and_then_replaces_the_review(self):
+        response = self.post(4, '/api/reviews/?upsert=true')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        review_id, created_at = response.data['id'], response.data['created_at']
+        self.assertEqual(self.stats(), (1, 4))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(2, '/api/reviews/?upsert=true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['id'], response.data['rating'], response.data['created_at']), (review_id, 2, created_at))
+        writes = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('INSERT INTO "reviews_app_review"')]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('ON CONFLICT', writes[0])
+        self.assertEqual(Review.objects.count(), 1)
+        self.assertEqual(self.stats(), (1, 2))
+
+    def test_upsert_validates_the_rating(self):
+        self.assertEqual(self.post(6, '/api/reviews/?upsert=true').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Review.objects.exists())
+
+
+class DuplicateReviewMigrationTest(TransactionTestCase):
+    migrate_from = [('reviews_app', '0002_review_review_business_updated_idx_and_more'), ('stats_app', '0001_initial')]
+    migrate_to = [('reviews_app', '0003_review_unique_reviewer_business')]
+
+    def tearDown(self):
+        MigrationExecutor(connection).migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_migration_keeps_the_latest_review_and_fixes_the_rollup(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+        User, Review, BusinessStats = (apps.get_model(*name) for name in [('auth', 'User'), ('reviews_app', 'Review'), ('stats_app', 'BusinessStats')])
+        business = User.objects.create(username='business')
+        customer = User.objects.create(username='customer')
+        for rating in [2, 3, 5]:
+            Review.objects.create(business_user=business, reviewer=customer, rating=rating, description='Review')
+        BusinessStats.objects.create(user=business, review_count=3, rating_sum=10)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        apps = executor.loader.project_state(self.migrate_to).apps
+        reviews = apps.get_model('reviews_app', 'Review').objects.all()
+        self.assertEqual([review.rating for review in reviews], [5])
+        stats = apps.get_model('stats_app', 'BusinessStats').objects.get(pk=business.pk)
+        self.assertEqual((stats.review_count, stats.rating_sum), (1, 5))
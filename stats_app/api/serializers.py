@@ -0,0 +1,17 @@
+from rest_framework import serializers
+from stats_app.models import BusinessStats
+
+class BusinessStatsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the order and review rollup of a business user.
+    Exposes the average rating computed from the stored rating sum and review count.
+    """
+    business_user = serializers.IntegerField(source='user_id', read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = BusinessStats
+        fields = [
+            'business_user', 'in_progress_count', 'completed_count', 'cancelled_count',
+            'total_revenue', 'review_count', 'average_rating', 'updated_at'
+        ]
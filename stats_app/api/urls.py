@@ -1,9 +1,12 @@
 from django.urls import path, include
-from .views import BaseInfoView
+from .views import BaseInfoView, BusinessStatsView
 
     # URL pattern for the BaseInfoView.
 urlpatterns = [
     # This view returns basic system statistics such as the total number of reviews, 
     # average rating, number of business profiles, and the number of offers in the system.
     path('base-info/', BaseInfoView.as_view(), name='base-info'),
+
+    # This view returns the order counts, revenue, review count and average rating of a single business user.
+    path('business-stats/<int:business_user_id>/', BusinessStatsView.as_view(), name='business-stats'),
 ]
\ No newline at end of file
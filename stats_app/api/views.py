@@ -1,18 +1,23 @@
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from django.db.models import Avg
+from rest_framework.permissions import AllowAny, IsAuthenticated
 
-from reviews_app.models import Review
-from offers_app.models import Offer
-from auth_app.models import UserProfile
+from stats_app.models import BusinessStats
+from stats_app.services import get_base_info
+from .serializers import BusinessStatsSerializer
 
 class BaseInfoView(APIView):
     """
     A view that provides basic statistics about the system.
-    
+
     - Returns the total number of reviews, average rating, count of business profiles,
     and the total number of offers in the system.
+    - The statistics are served from the cache, which is invalidated whenever reviews,
+    offers or profiles change, and carry `ETag`/`Last-Modified` headers for conditional requests.
 
     Attributes:
         permission_classes (list): Specifies that the view is accessible to any user, regardless of authentication.
@@ -33,12 +38,34 @@ class BaseInfoView(APIView):
             *args, **kwargs: Additional arguments that may be passed (not used in this method).
 
         Returns:
-            Response: A response containing the requested data in a dictionary format.
+            Response: A response containing the requested data in a dictionary format,
+            or an empty 304 response if the client's copy is still current.
         """
-        data = {
-            "review_count": Review.objects.count(),
-            "average_rating": round(Review.objects.aggregate(avg=Avg("rating"))["avg"] or 0, 1),
-            "business_profile_count": UserProfile.objects.filter(type="business").count(),
-            "offer_count": Offer.objects.count(),
-        }
-        return Response(data)
+        stats = get_base_info()
+        etag = quote_etag(stats['etag'])
+        last_modified = stats['last_modified']
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(stats['data'])
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=settings.BASE_INFO_HTTP_MAX_AGE)
+        return response
+
+
+class BusinessStatsView(generics.RetrieveAPIView):
+    """
+    A view that returns the order and review rollup of a single business user.
+
+    Reads one `BusinessStats` row by primary key; only business users have a row,
+    so other user IDs result in a 404.
+
+    Attributes:
+        queryset (QuerySet): All business rollup rows.
+        serializer_class (BusinessStatsSerializer): The serializer for the rollup.
+        permission_classes (list): Requires an authenticated user.
+    """
+    queryset = BusinessStats.objects.all()
+    serializer_class = BusinessStatsSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_url_kwarg = 'business_user_id'
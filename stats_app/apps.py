@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StatsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stats_app'
+
+    def ready(self):
+        from stats_app import signals  # noqa: F401
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from stats_app.services import rebuild_business_stats
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the `BusinessStats` rollup rows from the Order and Review tables.
+
+    Normally the rows are maintained incrementally; this command repairs them after
+    raw SQL changes or data imports that bypassed the model signals.
+    """
+    help = 'Rebuilds the per-business order and review rollups.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('user_ids', nargs='*', type=int, help='Business user IDs to rebuild (default: all).')
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of business users per batch.')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_business_stats(options['user_ids'] or None, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {rebuilt} business users.'))
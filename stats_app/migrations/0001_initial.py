@@ -0,0 +1,78 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_business_stats(apps, schema_editor):
+    UserProfile = apps.get_model('auth_app', 'UserProfile')
+    Order = apps.get_model('orders_app', 'Order')
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessStats = apps.get_model('stats_app', 'BusinessStats')
+
+    stats = {
+        user_id: BusinessStats(user_id=user_id)
+        for user_id in UserProfile.objects.filter(type='business').values_list('user_id', flat=True)
+    }
+    orders = (
+        Order.objects.filter(business_user_id__in=stats.keys())
+        .values('business_user_id')
+        .annotate(
+            in_progress_count=Count('id', filter=Q(status='in_progress')),
+            completed_count=Count('id', filter=Q(status='completed')),
+            cancelled_count=Count('id', filter=Q(status='cancelled')),
+            total_revenue=Sum('price', filter=Q(status='completed')),
+        )
+        .order_by()
+    )
+    for row in orders:
+        row_stats = stats[row['business_user_id']]
+        row_stats.in_progress_count = row['in_progress_count']
+        row_stats.completed_count = row['completed_count']
+        row_stats.cancelled_count = row['cancelled_count']
+        row_stats.total_revenue = row['total_revenue'] or 0
+    reviews = (
+        Review.objects.filter(business_user_id__in=stats.keys())
+        .values('business_user_id')
+        .annotate(review_count=Count('id'), rating_sum=Sum('rating'))
+        .order_by()
+    )
+    for row in reviews:
+        row_stats = stats[row['business_user_id']]
+        row_stats.review_count = row['review_count']
+        row_stats.rating_sum = row['rating_sum'] or 0
+    BusinessStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth_app', '0010_remove_userprofile_id_alter_userprofile_user'),
+        ('orders_app', '0005_alter_order_status'),
+        ('reviews_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='business_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('cancelled_count', models.IntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'business stats',
+            },
+        ),
+        migrations.RunPython(populate_business_stats, migrations.RunPython.noop),
+    ]
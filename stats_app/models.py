@@ -1,3 +1,43 @@
 from django.db import models
+from django.contrib.auth import get_user_model
 
-# Create your models here.
+User = get_user_model()
+
+class BusinessStats(models.Model):
+    """
+    Rollup of the order and review figures of one business user.
+
+    The row is updated incrementally in the same transaction as every Order and Review write,
+    so dashboards read a single primary key row instead of counting orders and reviews.
+
+    Attributes:
+        user (OneToOneField): The business user the figures belong to (primary key).
+        in_progress_count (IntegerField): Number of orders in progress.
+        completed_count (IntegerField): Number of completed orders.
+        cancelled_count (IntegerField): Number of cancelled orders.
+        total_revenue (DecimalField): Sum of the prices of all completed orders.
+        review_count (IntegerField): Number of reviews about the business.
+        rating_sum (IntegerField): Sum of all review ratings, used for the average rating.
+        updated_at (DateTimeField): The timestamp of the last change.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='business_stats')
+    in_progress_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'business stats'
+
+    def __str__(self):
+        return f"Stats of {self.user}: {self.in_progress_count} in progress, {self.completed_count} completed, {self.review_count} reviews"
+
+    @property
+    def average_rating(self):
+        """The average review rating, rounded to one decimal place (0 without reviews)."""
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
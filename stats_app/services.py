@@ -0,0 +1,196 @@
+import hashlib
+import json
+import time
+from collections import defaultdict
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews_app.models import Review
+from offers_app.models import Offer
+from orders_app.models import ArchivedOrder, Order
+from auth_app.models import UserProfile
+from stats_app.models import BusinessStats
+
+BASE_INFO_CACHE_KEY = 'stats:base-info'
+BASE_INFO_CHANGED_KEY = 'stats:base-info:changed'
+
+
+def compute_base_info():
+    """
+    Runs the aggregate queries behind /base-info/.
+
+    - `review_count`: The total number of reviews in the system.
+    - `average_rating`: The average rating of all reviews, rounded to one decimal place.
+    - `business_profile_count`: The total number of business user profiles.
+    - `offer_count`: The total number of offers in the system.
+    """
+    return {
+        "review_count": Review.objects.count(),
+        "average_rating": round(Review.objects.aggregate(avg=Avg("rating"))["avg"] or 0, 1),
+        "business_profile_count": UserProfile.objects.filter(type="business").count(),
+        "offer_count": Offer.objects.count(),
+    }
+
+
+def get_base_info():
+    """
+    Returns the cached platform statistics, computing and caching them on a miss.
+
+    Returns:
+        dict: `data` (the statistics), `etag` (hash of the data) and `last_modified`
+        (Unix timestamp of the last change that invalidated the statistics).
+    """
+    stats = cache.get(BASE_INFO_CACHE_KEY)
+    if stats is None:
+        data = compute_base_info()
+        stats = {
+            'data': data,
+            'etag': hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest(),
+            'last_modified': cache.get(BASE_INFO_CHANGED_KEY) or int(time.time()),
+        }
+        cache.set(BASE_INFO_CACHE_KEY, stats, settings.BASE_INFO_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_base_info():
+    """Drops the cached statistics and records the time of the change for `Last-Modified`."""
+    cache.set(BASE_INFO_CHANGED_KEY, int(time.time()), None)
+    cache.delete(BASE_INFO_CACHE_KEY)
+
+
+STATUS_COUNT_FIELDS = {
+    'in_progress': 'in_progress_count',
+    'completed': 'completed_count',
+    'cancelled': 'cancelled_count',
+}
+ROLLUP_FIELDS = ['in_progress_count', 'completed_count', 'cancelled_count', 'total_revenue', 'review_count', 'rating_sum']
+
+
+def order_contribution(business_user_id, status, price):
+    """Returns what a single order adds to the rollup of its business user."""
+    contribution = {STATUS_COUNT_FIELDS[status]: 1} if status in STATUS_COUNT_FIELDS else {}
+    if status == 'completed':
+        contribution['total_revenue'] = Decimal(price)
+    return business_user_id, contribution
+
+
+def review_contribution(business_user_id, rating):
+    """Returns what a single review adds to the rollup of its business user."""
+    return business_user_id, {'review_count': 1, 'rating_sum': rating}
+
+
+def apply_rollup_change(old=None, new=None):
+    """
+    Applies the difference between an old and a new contribution to the affected rollup rows.
+
+    Contributions come from `order_contribution` / `review_contribution`; pass only `new` for
+    inserts and only `old` for deletes. Each affected row is changed with one relative
+    `UPDATE ... SET field = field + delta`, so concurrent writers never overwrite each other.
+    Missing rows are rebuilt from the source tables when something is added; removals from a
+    missing row (e.g. while its user is being deleted) are ignored.
+    """
+    apply_rollup_changes([old] if old is not None else [], [new] if new is not None else [])
+
+
+def apply_rollup_changes(old, new):
+    """
+    Like `apply_rollup_change` for many contributions at once (bulk writes).
+
+    The contributions are summed up per business user first, so every affected row gets
+    a single UPDATE, however many orders or reviews changed.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    added = set()
+    for contributions, sign in ((old, -1), (new, 1)):
+        for business_user_id, values in contributions:
+            if sign > 0:
+                added.add(business_user_id)
+            for field, value in values.items():
+                deltas[business_user_id][field] += sign * value
+
+    for business_user_id, changes in deltas.items():
+        changes = {field: F(field) + value for field, value in changes.items() if value}
+        if not changes or business_user_id is None:
+            continue
+        updated = BusinessStats.objects.filter(pk=business_user_id).update(updated_at=timezone.now(), **changes)
+        if not updated and business_user_id in added:
+            rebuild_business_stats([business_user_id])
+
+
+def refresh_review_stats(business_user_ids):
+    """
+    Recomputes the review figures (`review_count`, `rating_sum`) of the given business users.
+
+    Runs a single UPDATE with correlated subqueries over the (business_user, rating) index, for
+    writes whose effect on the rollup is not known up front (e.g. upserts). Missing rows are
+    rebuilt from scratch.
+    """
+    business_user_ids = set(business_user_ids)
+    reviews = Review.objects.filter(business_user=OuterRef('pk')).order_by().values('business_user')
+    updated = BusinessStats.objects.filter(pk__in=business_user_ids).update(
+        review_count=Coalesce(Subquery(reviews.annotate(value=Count('id')).values('value')), 0),
+        rating_sum=Coalesce(Subquery(reviews.annotate(value=Sum('rating')).values('value')), 0),
+        updated_at=timezone.now(),
+    )
+    if updated < len(business_user_ids):
+        rebuild_business_stats(business_user_ids)
+
+
+def rebuild_business_stats(user_ids=None, batch_size=500):
+    """
+    Recomputes the rollup rows of the given business users (or of all business users) from scratch.
+
+    Also creates missing rows, including rows for business users without any orders or reviews.
+
+    Returns:
+        int: The number of rebuilt rows.
+    """
+    business_ids = UserProfile.objects.filter(type='business').order_by('user_id').values_list('user_id', flat=True)
+    if user_ids is not None:
+        business_ids = business_ids.filter(user_id__in=list(user_ids))
+    business_ids = list(business_ids)
+
+    rebuilt = 0
+    for start in range(0, len(business_ids), batch_size):
+        batch = business_ids[start:start + batch_size]
+        stats = {user_id: BusinessStats(user_id=user_id, updated_at=timezone.now()) for user_id in batch}
+        # Archived orders keep counting: archiving moves finished orders without changing the rollups.
+        for model in (Order, ArchivedOrder):
+            orders = (
+                model.objects.filter(business_user_id__in=batch)
+                .values('business_user_id')
+                .annotate(
+                    in_progress_count=Count('id', filter=Q(status='in_progress')),
+                    completed_count=Count('id', filter=Q(status='completed')),
+                    cancelled_count=Count('id', filter=Q(status='cancelled')),
+                    total_revenue=Sum('price', filter=Q(status='completed')),
+                )
+                .order_by()
+            )
+            for row in orders:
+                row_stats = stats[row.pop('business_user_id')]
+                row['total_revenue'] = row['total_revenue'] or 0
+                for field, value in row.items():
+                    setattr(row_stats, field, getattr(row_stats, field) + value)
+        reviews = (
+            Review.objects.filter(business_user_id__in=batch)
+            .values('business_user_id')
+            .annotate(review_count=Count('id'), rating_sum=Sum('rating'))
+            .order_by()
+        )
+        for row in reviews:
+            row_stats = stats[row['business_user_id']]
+            row_stats.review_count = row['review_count']
+            row_stats.rating_sum = row['rating_sum'] or 0
+        BusinessStats.objects.bulk_create(
+            stats.values(),
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=ROLLUP_FIELDS + ['updated_at'],
+        )
+        rebuilt += len(stats)
+    return rebuilt
@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from reviews_app.models import Review
+from offers_app.models import Offer
+from offers_app.services import offers_created
+from orders_app.models import ArchivedOrder, Order
+from auth_app.models import UserProfile
+from stats_app.models import BusinessStats
+from stats_app.services import (
+    apply_rollup_change, invalidate_base_info, order_contribution, rebuild_business_stats, review_contribution,
+)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_delete, sender=Offer)
+def invalidate_base_info_on_change(sender, **kwargs):
+    """
+    Invalidates the platform statistics once the surrounding transaction commits.
+
+    Reviews can change the average rating and profiles can change their type,
+    so every save of those models counts as a change.
+    """
+    transaction.on_commit(invalidate_base_info)
+
+
+@receiver(post_save, sender=Offer)
+def invalidate_base_info_on_new_offer(sender, created, **kwargs):
+    """Editing an offer does not change the offer count, only creating one does."""
+    if created:
+        transaction.on_commit(invalidate_base_info)
+
+
+@receiver(offers_created, sender=Offer)
+def invalidate_base_info_on_bulk_offers(sender, **kwargs):
+    """Offers inserted with `bulk_create` send no `post_save`, see `offers_app.services.create_offers`."""
+    transaction.on_commit(invalidate_base_info)
+
+
+def _order_contribution(order):
+    """Reads the rollup relevant values without triggering loads of deferred fields."""
+    values = order.__dict__
+    if 'business_user_id' not in values or 'status' not in values or 'price' not in values:
+        return None
+    return order_contribution(values['business_user_id'], values['status'], values['price'])
+
+
+def _review_contribution(review):
+    values = review.__dict__
+    if 'business_user_id' not in values or 'rating' not in values:
+        return None
+    return review_contribution(values['business_user_id'], values['rating'])
+
+
+@receiver(post_init, sender=Order)
+def remember_order_state(sender, instance, **kwargs):
+    """Remembers the stored state of a loaded order, so a later save can apply only the difference."""
+    instance._stats_snapshot = _order_contribution(instance) if instance.pk else None
+
+
+@receiver(post_init, sender=Review)
+def remember_review_state(sender, instance, **kwargs):
+    """Remembers the stored state of a loaded review, so a later save can apply only the difference."""
+    instance._stats_snapshot = _review_contribution(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_save, sender=Review)
+def update_business_stats_on_save(sender, instance, created, **kwargs):
+    """Applies the change of an order or review to the business rollup inside the saving transaction."""
+    contribution = _order_contribution(instance) if sender is Order else _review_contribution(instance)
+    if created:
+        apply_rollup_change(new=contribution)
+    elif instance._stats_snapshot is None or contribution is None:
+        rebuild_business_stats([instance.business_user_id])
+    else:
+        apply_rollup_change(old=instance._stats_snapshot, new=contribution)
+    instance._stats_snapshot = contribution
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=Review)
+def update_business_stats_on_delete(sender, instance, **kwargs):
+    """Removes a deleted order or review from the business rollup."""
+    if instance._stats_snapshot is not None:
+        apply_rollup_change(old=instance._stats_snapshot)
+    elif BusinessStats.objects.filter(pk=instance.business_user_id).exists():
+        rebuild_business_stats([instance.business_user_id])
+    instance._stats_snapshot = None
+
+
+@receiver(post_delete, sender=ArchivedOrder)
+def update_business_stats_on_archived_delete(sender, instance, **kwargs):
+    """Removes a deleted archived order (e.g. of a deleted customer) from the business rollup."""
+    apply_rollup_change(old=order_contribution(instance.business_user_id, instance.status, instance.price))
+
+
+@receiver(post_save, sender=UserProfile)
+def sync_business_stats_row(sender, instance, **kwargs):
+    """Creates the rollup row of new business users and drops it when a profile stops being a business."""
+    if instance.type == 'business':
+        if not BusinessStats.objects.filter(pk=instance.user_id).exists():
+            rebuild_business_stats([instance.user_id])
+    else:
+        BusinessStats.objects.filter(pk=instance.user_id).delete()
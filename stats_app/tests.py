@@ -1,3 +1,101 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework import status
+from auth_app.models import UserProfile
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from reviews_app.models import Review
+from stats_app.models import BusinessStats
+from stats_app.services import ROLLUP_FIELDS, rebuild_business_stats
 
-# Create your tests here.
+
+class BaseInfoTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.business = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='customer', password='secure123')
+        UserProfile.objects.create(user=self.customer, type='customer')
+
+    def test_statistics_are_cached(self):
+        first = self.client.get('/api/base-info/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/base-info/')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first.data['business_profile_count'], 1)
+
+    def test_review_invalidates_statistics(self):
+        self.client.get('/api/base-info/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description='Good')
+        response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data['review_count'], 1)
+        self.assertEqual(response.data['average_rating'], 4.0)
+
+    def test_conditional_request_returns_not_modified(self):
+        response = self.client.get('/api/base-info/')
+        self.assertIn('Last-Modified', response)
+        response = self.client.get('/api/base-info/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class BusinessStatsTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create_user(username='business', password='secure123')
+        UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='customer', password='secure123')
+        UserProfile.objects.create(user=self.customer, type='customer')
+        offer = Offer.objects.create(user=self.business, title='Website', description='A complete website.')
+        self.detail = OfferDetail.objects.create(
+            offer=offer, title='Basic Website', revisions=1, delivery_time_in_days=5,
+            price=150, features=[], offer_type='basic',
+        )
+        self.client.force_authenticate(self.customer)
+
+    def create_order(self):
+        return Order.objects.create(
+            customer_user=self.customer, business_user=self.business,
+            offer_detail=self.detail, price=self.detail.price,
+        )
+
+    def test_orders_and_reviews_update_the_rollup(self):
+        first, second, third = self.create_order(), self.create_order(), self.create_order()
+        first.status = 'completed'
+        first.save()
+        Order.objects.get(pk=second.pk).delete()
+        third.status = 'cancelled'
+        third.save()
+        review = Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5, description='Great')
+        review.rating = 3
+        review.save()
+
+        stats = BusinessStats.objects.get(pk=self.business.pk)
+        self.assertEqual((stats.in_progress_count, stats.completed_count, stats.cancelled_count), (0, 1, 1))
+        self.assertEqual(stats.total_revenue, 150)
+        self.assertEqual((stats.review_count, stats.average_rating), (1, 3.0))
+
+        rollup = {field: getattr(stats, field) for field in ROLLUP_FIELDS}
+        rebuild_business_stats([self.business.pk])
+        stats.refresh_from_db()
+        self.assertEqual(rollup, {field: getattr(stats, field) for field in ROLLUP_FIELDS})
+
+    def test_count_endpoints_read_a_single_row(self):
+        self.create_order()
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/order-count/{self.business.pk}/')
+        self.assertEqual(response.data, {'order_count': 1})
+        response = self.client.get(f'/api/completed-order-count/{self.business.pk}/')
+        self.assertEqual(response.data, {'completed_order_count': 0})
+        response = self.client.get(f'/api/order-count/{self.customer.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_business_stats_endpoint(self):
+        self.create_order()
+        response = self.client.get(f'/api/business-stats/{self.business.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['business_user'], self.business.pk)
+        self.assertEqual(response.data['in_progress_count'], 1)
+        self.assertEqual(response.data['average_rating'], 0)
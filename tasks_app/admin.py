@@ -0,0 +1,15 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'priority', 'attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'idempotency_key']
+    actions = ['retry_tasks']
+
+    @admin.action(description='Retry selected tasks')
+    def retry_tasks(self, request, queryset):
+        queryset.exclude(status=Task.RUNNING).update(status=Task.PENDING, attempts=0, run_at=timezone.now(), finished_at=None)
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import signal
+import socket
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connections
+from tasks_app.services import purge_tasks, run_worker
+
+
+class Command(BaseCommand):
+    """
+    Starts worker processes that execute the queued background tasks.
+
+    Every process claims due tasks in priority order and runs them one by one. SIGTERM and
+    SIGINT stop the workers after their current task; unfinished claimed tasks go back to
+    the queue. Finished tasks are deleted after `--keep-days`.
+    """
+    help = 'Runs background task workers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes.')
+        parser.add_argument('--batch-size', type=int, default=10, help='Tasks claimed at a time.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--lease', type=int, default=300, help='Seconds after which the tasks of an unresponsive worker are taken over.')
+        parser.add_argument('--keep-days', type=int, default=7, help='Days finished tasks are kept.')
+        parser.add_argument('--once', action='store_true', help='Exit as soon as no task is due.')
+
+    def handle(self, *args, **options):
+        purged = purge_tasks(timedelta(days=options['keep_days']))
+        if purged:
+            self.stdout.write(f'Deleted {purged} finished tasks.')
+        if options['processes'] <= 1:
+            self.work(options)
+            return
+
+        # Forked children must not share the parent's database connection.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=self.work, args=(options,), daemon=False) for _ in range(options['processes'])]
+        for process in processes:
+            process.start()
+
+        def forward(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    os.kill(process.pid, signum)
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for process in processes:
+            process.join()
+
+    def work(self, options):
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Worker {worker} started.')
+
+        def report(task, succeeded):
+            if not succeeded:
+                self.stderr.write(f'Task {task.pk} ({task.name}) failed in attempt {task.attempts}/{task.max_attempts}.')
+
+        run_worker(
+            worker, batch_size=options['batch_size'], poll_interval=options['poll_interval'], lease=options['lease'],
+            stop=lambda: bool(stopping), once=options['once'], on_task=report,
+        )
+        self.stdout.write(f'Worker {worker} stopped.')
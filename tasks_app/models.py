@@ -0,0 +1,63 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    A queued background task, executed by the `run_tasks` worker processes.
+
+    Tasks are inserted in the same transaction as the write that caused them, so a task
+    exists exactly when its write was committed. Workers claim due tasks in priority order
+    and lease them for a limited time; the lease of a crashed worker expires and the task
+    is picked up again.
+
+    Fields:
+        name: Registered name of the task function (see `tasks_app.services.task`).
+        args: Positional arguments (JSON).
+        kwargs: Keyword arguments (JSON).
+        priority: Tasks with a higher priority run first.
+        status: 'pending', 'running', 'done' or 'failed'.
+        attempts: Number of times the task was started.
+        max_attempts: Attempts before the task is marked as failed.
+        run_at: Earliest time to run (delayed tasks and retry backoff).
+        locked_until: End of the lease of the worker running the task.
+        worker: Identifier of the worker that claimed the task last.
+        idempotency_key: Optional unique key; enqueuing a task with a known key returns the existing task.
+        last_error: Traceback of the last failed attempt.
+        created_at: Timestamp when the task was enqueued.
+        finished_at: Timestamp when the task succeeded or finally failed.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    idempotency_key = models.CharField(max_length=200, null=True, blank=True, unique=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Workers claim the due tasks of a status by priority and due time.
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_at'], name='task_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()}, attempt {self.attempts}/{self.max_attempts})"
@@ -0,0 +1,179 @@
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from tasks_app.models import Task
+
+
+@dataclass
+class TaskSpec:
+    """A registered task function with its defaults."""
+    func: object
+    max_attempts: int
+    retry_delay: float
+    priority: int
+
+
+_registry = {}
+
+
+def task(name, max_attempts=3, retry_delay=10, priority=0):
+    """
+    Registers a function as a background task under `name`.
+
+    Task functions live in the `tasks.py` module of an app, which is imported at startup.
+    Their arguments must be JSON-serializable and they must be safe to run more than once,
+    since a task whose worker died is started again.
+
+    Args:
+        name: Unique name stored in the queue.
+        max_attempts: Attempts before the task is marked as failed.
+        retry_delay: Seconds before the first retry; doubled for every further attempt.
+        priority: Default priority; higher runs first.
+    """
+    def decorator(func):
+        _registry[name] = TaskSpec(func, max_attempts, retry_delay, priority)
+        func.task_name = name
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'No task is registered as "{name}".')
+
+
+def enqueue(name, args=(), kwargs=None, priority=None, idempotency_key=None, delay=None):
+    """
+    Queues the task `name` for a worker.
+
+    The task row is written in the current transaction, so it is only visible to workers
+    (and only exists at all) if the surrounding write commits. With an `idempotency_key`
+    that was already used, the existing task is returned instead of queuing a second one.
+    With `TASKS_MODE = 'inline'` the task runs right after the commit in the current thread
+    instead, and errors are raised (meant for tests and development).
+
+    Returns:
+        Task | None: The queued (or existing) task; None in inline mode.
+    """
+    spec = get_task(name)
+    args, kwargs = list(args), kwargs or {}
+    if settings.TASKS_MODE == 'inline':
+        transaction.on_commit(lambda: spec.func(*args, **kwargs))
+        return None
+
+    values = {
+        'name': name, 'args': args, 'kwargs': kwargs,
+        'priority': spec.priority if priority is None else priority,
+        'max_attempts': spec.max_attempts,
+        'run_at': timezone.now() + timedelta(seconds=delay or 0),
+    }
+    if idempotency_key is None:
+        return Task.objects.create(**values)
+    try:
+        with transaction.atomic():
+            return Task.objects.create(idempotency_key=idempotency_key, **values)
+    except IntegrityError:
+        return Task.objects.get(idempotency_key=idempotency_key)
+
+
+def claim_tasks(worker, limit=10, lease=300):
+    """
+    Marks up to `limit` due tasks as running for `worker` and returns them.
+
+    Due are pending tasks whose `run_at` has passed and running tasks whose lease expired
+    (their worker died). PostgreSQL skips rows other workers are claiming at the same time
+    (`SKIP LOCKED`); SQLite serializes the claims through its write lock.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=Task.PENDING, run_at__lte=now) | Q(status=Task.RUNNING, locked_until__lt=now))
+            .order_by('-priority', 'run_at', 'pk')
+            .values_list('pk', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Task.objects.filter(pk__in=ids).update(
+            status=Task.RUNNING, worker=worker, locked_until=now + timedelta(seconds=lease), attempts=F('attempts') + 1,
+        )
+        return list(Task.objects.filter(pk__in=ids).order_by('-priority', 'run_at', 'pk'))
+
+
+def execute_task(claimed):
+    """
+    Runs a claimed task and records the outcome.
+
+    A failing task is retried with exponential backoff until `max_attempts` is reached and
+    is marked as failed afterwards. The outcome is only written while the task is still
+    leased by the same worker, so a task that was taken over after an expired lease is
+    not overwritten.
+
+    Returns:
+        bool: True if the task succeeded.
+    """
+    now = timezone.now()
+    try:
+        spec = get_task(claimed.name)
+        if claimed.attempts > claimed.max_attempts:
+            raise RuntimeError(f'Gave up after {claimed.max_attempts} attempts whose workers did not finish.')
+        spec.func(*claimed.args, **claimed.kwargs)
+    except Exception:
+        retry = claimed.attempts < claimed.max_attempts and claimed.name in _registry
+        changes = {'last_error': traceback.format_exc(), 'locked_until': None}
+        if retry:
+            delay = _registry[claimed.name].retry_delay * 2 ** (claimed.attempts - 1)
+            changes.update(status=Task.PENDING, run_at=timezone.now() + timedelta(seconds=delay))
+        else:
+            changes.update(status=Task.FAILED, finished_at=timezone.now())
+        succeeded = False
+    else:
+        changes = {'status': Task.DONE, 'locked_until': None, 'finished_at': timezone.now()}
+        succeeded = True
+    Task.objects.filter(pk=claimed.pk, status=Task.RUNNING, worker=claimed.worker, locked_until__gte=now).update(**changes)
+    return succeeded
+
+
+def purge_tasks(older_than):
+    """Deletes finished (done or failed) tasks that finished before `older_than` (a timedelta) and returns their number."""
+    deleted, _ = Task.objects.filter(status__in=[Task.DONE, Task.FAILED], finished_at__lt=timezone.now() - older_than).delete()
+    return deleted
+
+
+def run_worker(worker, batch_size=10, poll_interval=1.0, lease=300, stop=lambda: False, once=False, on_task=None):
+    """
+    Claims and executes tasks until `stop()` returns True (or, with `once`, the queue is empty).
+
+    Args:
+        worker: Identifier stored on claimed tasks.
+        batch_size: Tasks claimed at a time.
+        poll_interval: Seconds to wait when no task is due.
+        lease: Seconds a worker may take for a batch before its tasks are handed to another worker.
+        stop: Callable checked between tasks.
+        once: Return as soon as no task is due.
+        on_task: Optional callable receiving every executed task and whether it succeeded.
+    """
+    while not stop():
+        tasks = claim_tasks(worker, batch_size, lease)
+        if not tasks:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+        for index, claimed in enumerate(tasks):
+            succeeded = execute_task(claimed)
+            if on_task:
+                on_task(claimed, succeeded)
+            if stop():
+                # Hand the claimed tasks that did not run back right away instead of waiting for the lease.
+                Task.objects.filter(pk__in=[t.pk for t in tasks[index + 1:]], status=Task.RUNNING, worker=worker).update(
+                    status=Task.PENDING, locked_until=None, attempts=F('attempts') - 1,
+                )
+                return
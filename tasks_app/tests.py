@@ -0,0 +1,72 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tasks_app.models import Task
+from tasks_app.services import claim_tasks, enqueue, execute_task, run_worker, task
+
+calls = []
+
+
+@task('tests.record', max_attempts=2, retry_delay=60)
+def record(value, fail=False):
+    calls.append(value)
+    if fail:
+        raise ValueError('failed on purpose')
+
+
+class TaskQueueTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_worker_runs_due_tasks_by_priority(self):
+        enqueue('tests.record', args=['low'])
+        enqueue('tests.record', args=['high'], priority=5)
+        enqueue('tests.record', args=['later'], delay=60)
+        run_worker('test', once=True)
+        self.assertEqual(calls, ['high', 'low'])
+        self.assertEqual(Task.objects.filter(status=Task.DONE).count(), 2)
+        self.assertEqual(Task.objects.get(status=Task.PENDING).args, ['later'])
+
+    def test_failing_task_is_retried_with_backoff_and_then_fails(self):
+        queued = enqueue('tests.record', args=['boom'], kwargs={'fail': True})
+        run_worker('test', once=True)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.PENDING, 1))
+        self.assertGreater(queued.run_at, timezone.now() + timedelta(seconds=50))
+        self.assertIn('failed on purpose', queued.last_error)
+
+        Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        run_worker('test', once=True)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.FAILED, 2))
+        self.assertEqual(calls, ['boom', 'boom'])
+
+    def test_idempotency_key_queues_a_task_once(self):
+        first = enqueue('tests.record', args=['once'], idempotency_key='record:once')
+        second = enqueue('tests.record', args=['once'], idempotency_key='record:once')
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_expired_lease_is_taken_over(self):
+        enqueue('tests.record', args=['crashed'])
+        claimed, = claim_tasks('dead-worker', lease=60)
+        self.assertEqual(claim_tasks('other-worker'), [])
+
+        Task.objects.filter(pk=claimed.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        taken_over, = claim_tasks('other-worker')
+        self.assertEqual(taken_over.attempts, 2)
+        self.assertTrue(execute_task(taken_over))
+        # The late result of the first worker does not overwrite the outcome.
+        claimed.status = Task.RUNNING
+        execute_task(claimed)
+        self.assertEqual(Task.objects.get(pk=claimed.pk).worker, 'other-worker')
+        self.assertEqual(Task.objects.get(pk=claimed.pk).status, Task.DONE)
+
+    @override_settings(TASKS_MODE='inline')
+    def test_inline_mode_runs_after_the_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(enqueue('tests.record', args=['inline']))
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ['inline'])
+        self.assertFalse(Task.objects.exists())